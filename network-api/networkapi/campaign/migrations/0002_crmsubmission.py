@@ -0,0 +1,47 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:08
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaign", "0001_squashed_0005_auto_20180626_1435"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CRMSubmission",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("basket", "Basket subscription"), ("sqs", "SQS message")], max_length=16
+                    ),
+                ),
+                ("payload", models.JSONField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("sent", "Sent"), ("failed", "Failed")],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("next_attempt_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ["next_attempt_at", "pk"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="crmsubmission",
+            index=models.Index(fields=["status", "next_attempt_at"], name="crm_submission_due"),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.16 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaign", "0002_crmsubmission"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="crmsubmission",
+            name="dedup_key",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name="crmsubmission",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status", "pending"), models.Q(("dedup_key", ""), _negated=True)),
+                fields=("dedup_key",),
+                name="unique_pending_crm_submission",
+            ),
+        ),
+    ]
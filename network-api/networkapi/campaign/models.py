@@ -0,0 +1,55 @@
+from django.db import models
+from django.utils import timezone
+
+
+class CRMSubmission(models.Model):
+    """
+    A newsletter subscription or petition signature waiting to be delivered
+    to Basket or the CRM's SQS queue.
+
+    See `networkapi.campaign.outbox` for how they are delivered.
+    """
+
+    BASKET_SUBSCRIPTION = "basket"
+    SQS_MESSAGE = "sqs"
+    KIND_CHOICES = (
+        (BASKET_SUBSCRIPTION, "Basket subscription"),
+        (SQS_MESSAGE, "SQS message"),
+    )
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    )
+
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    payload = models.JSONField()
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # A hash of the payload, for submissions that should not be queued twice
+    # while one is still pending. Empty for those that may be.
+    dedup_key = models.CharField(max_length=64, blank=True)
+
+    class Meta:
+        ordering = ["next_attempt_at", "pk"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="crm_submission_due"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedup_key"],
+                condition=models.Q(status="pending") & ~models.Q(dedup_key=""),
+                name="unique_pending_crm_submission",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.pk} ({self.status})"
@@ -0,0 +1,272 @@
+"""
+Outbox for CRM submissions.
+
+Petition signatures and newsletter signups used to be sent to SQS and Basket
+from within the request, which held a worker and a database transaction for
+as long as either took to respond. They are now saved as `CRMSubmission`s,
+in the request's transaction, and delivered by the `deliver_crm_submissions`
+management command.
+
+Workers claim due submissions in a short transaction, by pushing their next
+attempt past a lease, deliver them without holding a transaction or any row
+locks, and record the results in a second short transaction. Submissions of
+a worker that dies while delivering them become due again when the lease
+runs out, so they are delivered at least once.
+
+SQS messages are sent in batches of up to 10, and Basket subscriptions over
+one pooled HTTP session. Failed deliveries are retried with exponential
+backoff, and submissions that keep failing, or that are rejected outright,
+are marked as failed and left in the table to be looked at and requeued.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+import boto3
+import requests
+from basket import base as basket_base
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from networkapi.campaign.models import CRMSubmission
+
+logger = logging.getLogger(__name__)
+
+# The most messages SQS accepts in one SendMessageBatch call.
+SQS_BATCH_SIZE = 10
+
+MAX_ATTEMPTS = 10
+RETRY_BASE_DELAY = timedelta(seconds=30)
+RETRY_MAX_DELAY = timedelta(hours=1)
+
+# How long a worker has to deliver the submissions it claimed,
+# before other workers may claim them again.
+DELIVERY_LEASE = timedelta(minutes=15)
+
+
+class SQSProxy:
+    """
+    We use a proxy class to make sure that code that
+    relies on SQS posting still works, even when there
+    is no "real" sqs client available to work with.
+    """
+
+    def send_message(self, QueueUrl, MessageBody):
+        """
+        As a proxy function, the only thing we report
+        is that "things succeeded!" even though nothing
+        actually happened.
+        """
+
+        return {"MessageId": True}
+
+    def send_message_batch(self, QueueUrl, Entries):
+        return {"Successful": [{"Id": entry["Id"], "MessageId": True} for entry in Entries], "Failed": []}
+
+
+# Basket/Salesforce SQS client
+crm_sqs = {"client": SQSProxy()}
+
+if settings.CRM_AWS_SQS_ACCESS_KEY_ID:
+    crm_sqs["client"] = boto3.client(
+        "sqs",
+        region_name=settings.CRM_AWS_SQS_REGION,
+        aws_access_key_id=settings.CRM_AWS_SQS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.CRM_AWS_SQS_SECRET_ACCESS_KEY,
+    )
+
+
+class DeliveryError(Exception):
+    """
+    A delivery failed, and is worth retrying if `retry` is set.
+    """
+
+    def __init__(self, message, retry=True):
+        super().__init__(message)
+        self.retry = retry
+
+
+def enqueue_basket_subscription(email, newsletters, **kwargs):
+    """
+    Queue subscribing `email` to `newsletters` through Basket. Keyword
+    arguments are passed to Basket, as for `basket.subscribe`.
+
+    If the same subscription is still waiting to be delivered, as happens
+    when Tito replays its webhooks, that one is returned instead. Pending
+    subscriptions are looked up by a hash of their payload, which a unique
+    index keeps from being queued twice even by concurrent requests.
+    """
+    if not isinstance(newsletters, str):
+        newsletters = ",".join(newsletters)
+    payload = {**kwargs, "email": email, "newsletters": newsletters}
+    submission, _ = CRMSubmission.objects.get_or_create(
+        status=CRMSubmission.PENDING,
+        dedup_key=get_dedup_key(payload),
+        defaults={"kind": CRMSubmission.BASKET_SUBSCRIPTION, "payload": payload},
+    )
+    return submission
+
+
+def get_dedup_key(payload):
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def enqueue_sqs_message(queue_url, message):
+    return CRMSubmission.objects.create(
+        kind=CRMSubmission.SQS_MESSAGE,
+        payload={"queue_url": queue_url, "message": message},
+    )
+
+
+def get_retry_delay(attempts):
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+
+def record_result(submission, error=None, now=None):
+    now = now or timezone.now()
+    submission.attempts += 1
+    if error is None:
+        submission.status = CRMSubmission.SENT
+        submission.sent_at = now
+        submission.last_error = ""
+        return
+
+    submission.last_error = str(error)
+    if not getattr(error, "retry", True) or submission.attempts >= MAX_ATTEMPTS:
+        submission.status = CRMSubmission.FAILED
+        logger.error(f"Giving up on delivering CRM submission {submission.pk}: {error}")
+    else:
+        submission.next_attempt_at = now + get_retry_delay(submission.attempts)
+        logger.warning(f"Failed to deliver CRM submission {submission.pk}, will retry: {error}")
+
+
+def deliver_sqs_messages(sqs, submissions):
+    """
+    Send the messages of SQS submissions in batches, and
+    return the error of each submission that was not sent.
+    """
+    errors = {}
+    batches = {}
+    for submission in submissions:
+        try:
+            entry = {"Id": str(submission.pk), "MessageBody": submission.payload["message"]}
+            batches.setdefault(submission.payload["queue_url"], []).append((submission, entry))
+        except Exception as error:
+            logger.exception(f"Unexpected error delivering CRM submission {submission.pk}")
+            errors[submission.pk] = DeliveryError(repr(error))
+
+    for queue_url, queue_entries in batches.items():
+        for start in range(0, len(queue_entries), SQS_BATCH_SIZE):
+            batch = queue_entries[start : start + SQS_BATCH_SIZE]
+            try:
+                response = sqs.send_message_batch(QueueUrl=queue_url, Entries=[entry for _, entry in batch])
+            except Exception as error:
+                errors.update((submission.pk, DeliveryError(error)) for submission, _ in batch)
+                continue
+
+            for failure in response.get("Failed", []):
+                errors[int(failure["Id"])] = DeliveryError(
+                    f"{failure.get('Code')}: {failure.get('Message', '')}",
+                    retry=not failure.get("SenderFault", False),
+                )
+    return errors
+
+
+def deliver_basket_subscription(session, submission):
+    try:
+        response = session.post(
+            basket_base.basket_url("subscribe"),
+            data=submission.payload,
+            timeout=basket_base.BASKET_TIMEOUT,
+        )
+    except requests.exceptions.RequestException as error:
+        raise DeliveryError(f"Could not connect to Basket: {error}")
+
+    try:
+        basket_base.parse_response(response)
+    except basket_base.BasketException as error:
+        # Basket rejected the subscription, which it will do again,
+        # unless it is down or asked us to slow down.
+        raise DeliveryError(error.desc, retry=error.status_code >= 500 or error.status_code == 429)
+
+
+def claim_due_submissions(batch_size, now=None):
+    """
+    Claim up to `batch_size` submissions that are due, so that other workers
+    skip them until the delivery lease runs out, and return them.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        submissions = list(
+            CRMSubmission.objects.select_for_update(skip_locked=True).filter(
+                status=CRMSubmission.PENDING, next_attempt_at__lte=now
+            )[:batch_size]
+        )
+        CRMSubmission.objects.filter(pk__in=[submission.pk for submission in submissions]).update(
+            next_attempt_at=now + DELIVERY_LEASE
+        )
+    return submissions
+
+
+def deliver_due_submissions(batch_size=100, sqs=None, session=None):
+    """
+    Deliver up to `batch_size` submissions that are due, and return how many
+    were attempted. Submissions being delivered by another worker are skipped.
+    """
+    sqs = sqs or crm_sqs["client"]
+    session = session or requests.Session()
+    submissions = claim_due_submissions(batch_size)
+
+    sqs_submissions = [submission for submission in submissions if submission.kind == CRMSubmission.SQS_MESSAGE]
+    errors = deliver_sqs_messages(sqs, sqs_submissions)
+    for submission in submissions:
+        if submission.kind == CRMSubmission.BASKET_SUBSCRIPTION:
+            try:
+                deliver_basket_subscription(session, submission)
+            except DeliveryError as error:
+                errors[submission.pk] = error
+            except Exception as error:
+                # Anything unexpected, like a response that isn't JSON, only fails
+                # this submission, so that the results of the others are recorded.
+                logger.exception(f"Unexpected error delivering CRM submission {submission.pk}")
+                errors[submission.pk] = DeliveryError(repr(error))
+
+    now = timezone.now()
+    for submission in submissions:
+        record_result(submission, errors.get(submission.pk), now)
+    with transaction.atomic():
+        CRMSubmission.objects.bulk_update(
+            submissions, ["status", "attempts", "next_attempt_at", "last_error", "sent_at"]
+        )
+    return len(submissions)
+
+
+def requeue_failed_submissions():
+    """
+    Queue failed submissions to be delivered again. Of failed subscriptions
+    that are the same, only the latest is requeued, and none of them if the
+    same subscription is already pending.
+    """
+    failed = CRMSubmission.objects.filter(status=CRMSubmission.FAILED)
+    pending_keys = CRMSubmission.objects.filter(status=CRMSubmission.PENDING).values("dedup_key")
+    latest = (
+        failed.exclude(dedup_key="")
+        .exclude(dedup_key__in=pending_keys)
+        .values("dedup_key")
+        .annotate(latest_pk=Max("pk"))
+        .values("latest_pk")
+    )
+    return failed.filter(Q(dedup_key="") | Q(pk__in=latest)).update(
+        status=CRMSubmission.PENDING, attempts=0, next_attempt_at=timezone.now()
+    )
+
+
+def delete_sent_submissions(older_than=timedelta(days=7)):
+    """
+    Delete submissions that were delivered more than `older_than` ago,
+    so that the outbox doesn't keep people's details around.
+    """
+    return CRMSubmission.objects.filter(status=CRMSubmission.SENT, sent_at__lt=timezone.now() - older_than).delete()[0]
@@ -0,0 +1,293 @@
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from networkapi.campaign import outbox
+from networkapi.campaign.models import CRMSubmission
+from networkapi.campaign.views import submission_rate_limiter
+from networkapi.wagtailpages.factory.petition import PetitionFactory
+from networkapi.wagtailpages.factory.signup import SignupFactory
+
+
+class RecordingSQS(outbox.SQSProxy):
+    def __init__(self, failed_ids=(), sender_fault=False):
+        self.batches = []
+        self.savepoints = []
+        self.failed_ids = failed_ids
+        self.sender_fault = sender_fault
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.batches.append(Entries)
+        self.savepoints.append(len(connection.savepoint_ids))
+        response = super().send_message_batch(QueueUrl, Entries)
+        response["Successful"] = [entry for entry in response["Successful"] if entry["Id"] not in self.failed_ids]
+        response["Failed"] = [
+            {"Id": id, "SenderFault": self.sender_fault, "Code": "Error", "Message": "Failed"}
+            for id in self.failed_ids
+        ]
+        return response
+
+
+class BasketResponse:
+    def __init__(self, status_code, result):
+        self.status_code = status_code
+        self.content = json.dumps(result).encode()
+
+
+class RecordingBasketSession:
+    def __init__(self, status_code=200, result=None):
+        self.posts = []
+        self.status_code = status_code
+        self.result = result or {"status": "ok"}
+
+    def post(self, url, data, timeout):
+        self.posts.append(data)
+        return BasketResponse(self.status_code, self.result)
+
+
+@override_settings(CRM_PETITION_SQS_QUEUE_URL="https://sqs.example.com/petitions")
+class CampaignSubmissionTest(TestCase):
+    def setUp(self):
+        submission_rate_limiter.clear()
+        self.petition = PetitionFactory(campaign_id="test-campaign")
+
+    def post_petition(self, headers=None, **data):
+        body = {
+            "givenNames": "Test",
+            "surname": "Person",
+            "email": "test@example.com",
+            "newsletterSignup": False,
+            "source": "https://foundation.mozilla.org/",
+            "lang": "pt-BR",
+            **data,
+        }
+        url = reverse("petition-submission", kwargs={"pk": self.petition.pk})
+        return self.client.post(url, json.dumps(body), content_type="application/json", **(headers or {}))
+
+    def test_petition_is_queued(self):
+        response = self.post_petition()
+
+        self.assertEqual(response.status_code, 201)
+        submission = CRMSubmission.objects.get()
+        self.assertEqual(submission.kind, CRMSubmission.SQS_MESSAGE)
+        self.assertEqual(submission.payload["queue_url"], "https://sqs.example.com/petitions")
+        message = json.loads(submission.payload["message"])
+        self.assertEqual(message["data"]["form"]["campaign_id"], "test-campaign")
+        self.assertEqual(message["data"]["form"]["lang"], "pt")
+
+    def test_petition_newsletter_signup_is_queued(self):
+        self.post_petition(newsletterSignup=True)
+
+        submission = CRMSubmission.objects.get(kind=CRMSubmission.BASKET_SUBSCRIPTION)
+        self.assertEqual(
+            submission.payload, {"email": "test@example.com", "newsletters": "mozilla-foundation", "lang": "pt"}
+        )
+
+    def test_invalid_petition_is_not_queued(self):
+        self.petition.requires_postal_code = True
+        self.petition.save()
+
+        response = self.post_petition()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CRMSubmission.objects.exists())
+
+    @override_settings(CAMPAIGN_SUBMISSION_RATE_LIMIT="2/hour")
+    def test_petitions_are_rate_limited(self):
+        for _ in range(2):
+            self.assertEqual(self.post_petition().status_code, 201)
+
+        response = self.post_petition()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(CRMSubmission.objects.count(), 2)
+        # Submissions from other clients are counted separately.
+        self.assertEqual(self.post_petition({"REMOTE_ADDR": "10.0.0.2"}).status_code, 201)
+
+    @override_settings(CAMPAIGN_SUBMISSION_RATE_LIMIT="1/hour", RATE_LIMIT_USE_X_FORWARDED_FOR=True)
+    def test_petitions_are_rate_limited_per_forwarded_client(self):
+        self.assertEqual(self.post_petition({"HTTP_X_FORWARDED_FOR": "10.0.0.2"}).status_code, 201)
+        self.assertEqual(self.post_petition({"HTTP_X_FORWARDED_FOR": "10.0.0.2"}).status_code, 429)
+        self.assertEqual(self.post_petition({"HTTP_X_FORWARDED_FOR": "10.0.0.3"}).status_code, 201)
+
+    def test_signup_is_queued(self):
+        url = reverse("signup-submission", kwargs={"pk": 0})
+        body = {"email": "test@example.com", "source": "https://foundation.mozilla.org/"}
+
+        response = self.client.post(url, json.dumps(body), content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        submission = CRMSubmission.objects.get()
+        self.assertEqual(submission.kind, CRMSubmission.BASKET_SUBSCRIPTION)
+        self.assertEqual(submission.payload["email"], "test@example.com")
+
+    def test_invalid_signup_is_not_queued(self):
+        url = reverse("signup-submission", kwargs={"pk": 0})
+        body = {"email": "not an email", "source": "https://foundation.mozilla.org/"}
+
+        response = self.client.post(url, json.dumps(body), content_type="application/json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CRMSubmission.objects.exists())
+
+    def test_signup_for_invalid_newsletter_is_not_queued(self):
+        signup = SignupFactory(newsletter="not a newsletter")
+        url = reverse("signup-submission", kwargs={"pk": signup.pk})
+        body = {"email": "test@example.com", "source": "https://foundation.mozilla.org/"}
+
+        response = self.client.post(url, json.dumps(body), content_type="application/json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CRMSubmission.objects.exists())
+
+
+class CRMOutboxTest(TestCase):
+    def queue_messages(self, count):
+        return [outbox.enqueue_sqs_message("https://sqs.example.com/petitions", f"message {i}") for i in range(count)]
+
+    def test_sqs_messages_are_sent_in_batches(self):
+        self.queue_messages(23)
+        sqs = RecordingSQS()
+
+        self.assertEqual(outbox.deliver_due_submissions(sqs=sqs, session=RecordingBasketSession()), 23)
+
+        self.assertEqual([len(batch) for batch in sqs.batches], [10, 10, 3])
+        self.assertEqual(CRMSubmission.objects.filter(status=CRMSubmission.SENT).count(), 23)
+        self.assertEqual(outbox.deliver_due_submissions(sqs=sqs, session=RecordingBasketSession()), 0)
+
+    def test_failed_messages_are_retried_with_backoff(self):
+        submission = self.queue_messages(1)[0]
+        sqs = RecordingSQS(failed_ids=[str(submission.pk)])
+
+        outbox.deliver_due_submissions(sqs=sqs, session=RecordingBasketSession())
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, CRMSubmission.PENDING)
+        self.assertEqual(submission.attempts, 1)
+        self.assertGreater(submission.next_attempt_at, timezone.now() + timedelta(seconds=20))
+        # It isn't due again yet.
+        self.assertEqual(outbox.deliver_due_submissions(sqs=sqs, session=RecordingBasketSession()), 0)
+
+    def test_messages_are_given_up_on(self):
+        submission = self.queue_messages(1)[0]
+        CRMSubmission.objects.filter(pk=submission.pk).update(attempts=outbox.MAX_ATTEMPTS - 1)
+
+        outbox.deliver_due_submissions(sqs=RecordingSQS(failed_ids=[str(submission.pk)]))
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, CRMSubmission.FAILED)
+        self.assertEqual(submission.last_error, "Error: Failed")
+
+        outbox.requeue_failed_submissions()
+        outbox.deliver_due_submissions(sqs=RecordingSQS())
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, CRMSubmission.SENT)
+
+    def test_rejected_messages_are_not_retried(self):
+        submission = self.queue_messages(1)[0]
+
+        outbox.deliver_due_submissions(sqs=RecordingSQS(failed_ids=[str(submission.pk)], sender_fault=True))
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, CRMSubmission.FAILED)
+
+    def test_basket_subscriptions(self):
+        outbox.enqueue_basket_subscription("one@example.com", ["mozilla-foundation", "mozilla-festival"], lang="en")
+        outbox.enqueue_basket_subscription("two@example.com", "mozilla-foundation")
+        session = RecordingBasketSession()
+
+        outbox.deliver_due_submissions(sqs=RecordingSQS(), session=session)
+
+        self.assertEqual(
+            session.posts,
+            [
+                {"email": "one@example.com", "newsletters": "mozilla-foundation,mozilla-festival", "lang": "en"},
+                {"email": "two@example.com", "newsletters": "mozilla-foundation"},
+            ],
+        )
+        self.assertEqual(CRMSubmission.objects.filter(status=CRMSubmission.SENT).count(), 2)
+
+    def test_pending_basket_subscriptions_are_queued_once(self):
+        first = outbox.enqueue_basket_subscription("test@example.com", "mozilla-foundation", lang="en")
+        self.assertEqual(
+            outbox.enqueue_basket_subscription("test@example.com", "mozilla-foundation", lang="en"), first
+        )
+        self.assertNotEqual(outbox.enqueue_basket_subscription("test@example.com", "mozilla-foundation"), first)
+
+        outbox.deliver_due_submissions(session=RecordingBasketSession())
+        second = outbox.enqueue_basket_subscription("test@example.com", "mozilla-foundation", lang="en")
+
+        self.assertNotEqual(second, first)
+        self.assertEqual(second.status, CRMSubmission.PENDING)
+
+    def test_requeueing_keeps_basket_subscriptions_unique(self):
+        first = outbox.enqueue_basket_subscription("test@example.com", "mozilla-foundation")
+        CRMSubmission.objects.filter(pk=first.pk).update(status=CRMSubmission.FAILED)
+        second = outbox.enqueue_basket_subscription("test@example.com", "mozilla-foundation")
+        CRMSubmission.objects.filter(pk=second.pk).update(status=CRMSubmission.FAILED)
+        outbox.enqueue_basket_subscription("other@example.com", "mozilla-foundation")
+        CRMSubmission.objects.update(status=CRMSubmission.FAILED)
+        outbox.enqueue_basket_subscription("other@example.com", "mozilla-foundation")
+
+        self.assertEqual(outbox.requeue_failed_submissions(), 1)
+        self.assertEqual(CRMSubmission.objects.get(pk=second.pk).status, CRMSubmission.PENDING)
+        self.assertEqual(CRMSubmission.objects.filter(status=CRMSubmission.FAILED).count(), 2)
+
+    def test_basket_errors(self):
+        submission = outbox.enqueue_basket_subscription("test@example.com", "mozilla-foundation")
+
+        outbox.deliver_due_submissions(session=RecordingBasketSession(503, {"status": "error", "desc": "Down"}))
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, CRMSubmission.PENDING)
+
+        CRMSubmission.objects.filter(pk=submission.pk).update(next_attempt_at=timezone.now())
+        outbox.deliver_due_submissions(session=RecordingBasketSession(400, {"status": "error", "desc": "Invalid"}))
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, CRMSubmission.FAILED)
+        self.assertEqual(submission.last_error, "Invalid")
+
+    def test_unexpected_basket_errors_are_retried(self):
+        submission = outbox.enqueue_basket_subscription("test@example.com", "mozilla-foundation")
+        self.queue_messages(1)
+
+        class BrokenBasketSession(RecordingBasketSession):
+            def post(self, url, data, timeout):
+                raise ValueError("Not JSON")
+
+        self.assertEqual(outbox.deliver_due_submissions(sqs=RecordingSQS(), session=BrokenBasketSession()), 2)
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, CRMSubmission.PENDING)
+        self.assertEqual(submission.attempts, 1)
+        self.assertIn("Not JSON", submission.last_error)
+        self.assertEqual(CRMSubmission.objects.filter(status=CRMSubmission.SENT).count(), 1)
+
+    def test_messages_are_sent_outside_a_transaction(self):
+        self.queue_messages(1)
+        sqs = RecordingSQS()
+
+        outbox.deliver_due_submissions(sqs=sqs)
+
+        # The test's own transactions are the only ones open while sending.
+        self.assertEqual(sqs.savepoints, [len(connection.savepoint_ids)])
+
+    def test_claimed_submissions_are_skipped_until_their_lease_runs_out(self):
+        submission = self.queue_messages(1)[0]
+        self.assertEqual(outbox.claim_due_submissions(10), [submission])
+
+        self.assertEqual(outbox.deliver_due_submissions(sqs=RecordingSQS()), 0)
+
+        CRMSubmission.objects.filter(pk=submission.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(outbox.deliver_due_submissions(sqs=RecordingSQS()), 1)
+
+    def test_sent_submissions_are_deleted(self):
+        old, recent = self.queue_messages(2)
+        outbox.deliver_due_submissions(sqs=RecordingSQS())
+        CRMSubmission.objects.filter(pk=old.pk).update(sent_at=timezone.now() - timedelta(days=8))
+
+        self.assertEqual(outbox.delete_sent_submissions(), 1)
+        self.assertQuerysetEqual(CRMSubmission.objects.all(), [recent])
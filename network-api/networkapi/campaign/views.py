@@ -2,15 +2,16 @@ import json
 import logging
 from datetime import datetime
 
-import basket
-import boto3
 from django.conf import settings
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.validators import RegexValidator, validate_email
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from rest_framework import status
 
+from networkapi.campaign.outbox import enqueue_basket_subscription, enqueue_sqs_message
+from networkapi.utility.rate_limits import RateLimiter, rate_limited
 from networkapi.wagtailpages.models import Petition, Signup
 
 
@@ -22,43 +23,37 @@ def process_lang_code(lang):
     return lang
 
 
-class SQSProxy:
-    """
-    We use a proxy class to make sure that code that
-    relies on SQS posting still works, even when there
-    is no "real" sqs client available to work with.
-    """
-
-    def send_message(self, QueueUrl, MessageBody):
-        """
-        As a proxy function, the only thing we report
-        is that "things succeeded!" even though nothing
-        actually happened.
-        """
-
-        return {"MessageId": True}
+logger = logging.getLogger(__name__)
 
+# Comma separated Basket newsletter ids, like "mozilla-foundation".
+validate_newsletters = RegexValidator(r"^[\w-]+(,[\w-]+)*\Z")
 
-# Basket/Salesforce SQS client
-crm_sqs = {"client": SQSProxy()}
+# Submissions per client IP and petition or signup.
+submission_rate_limiter = RateLimiter("campaign-submission", "CAMPAIGN_SUBMISSION_RATE_LIMIT")
 
-if settings.CRM_AWS_SQS_ACCESS_KEY_ID:
-    crm_sqs["client"] = boto3.client(
-        "sqs",
-        region_name=settings.CRM_AWS_SQS_REGION,
-        aws_access_key_id=settings.CRM_AWS_SQS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.CRM_AWS_SQS_SECRET_ACCESS_KEY,
-    )
 
+def get_subscription_error(email, newsletters):
+    """
+    Return why Basket would reject subscribing `email` to `newsletters`, if it
+    would. Subscriptions are only sent to Basket after responding, by the CRM
+    outbox worker, so they need to be checked before they are queued.
+    """
+    try:
+        validate_email(email)
+    except (ValidationError, TypeError):
+        return "Signup requires a valid email address"
 
-# sqs destination for salesforce
-crm_queue_url = settings.CRM_PETITION_SQS_QUEUE_URL
+    try:
+        validate_newsletters(newsletters)
+    except (ValidationError, TypeError):
+        return "Signup is for an invalid newsletter"
 
-logger = logging.getLogger(__name__)
+    return None
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limited(submission_rate_limiter)
 def signup_submission_view(request, pk):
     # We need to re-write the data that's coming in from the network request.
     # Network request's send data through the request.body, not request.POST despite it being a POST method
@@ -88,6 +83,7 @@ def signup_submission_view(request, pk):
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limited(submission_rate_limiter)
 def petition_submission_view(request, pk):
     # We need to re-write the data that's coming in from the network request.
     # Network request's send data through the request.body, not request.POST despite it being a POST method
@@ -146,17 +142,18 @@ def signup_submission(request, signup):
         "last_name": rq.get("surname", ""),
     }
 
+    error = get_subscription_error(data["email"], data["newsletters"])
+    if error is not None:
+        return JsonResponse({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
     # add the campaign id to this payload, if there is one.
     cid = signup.campaign_id
     if cid is not None and cid != "":
         data["campaign_id"] = cid
 
-    # Subscribing to newsletter using basket.
-    response = basket.subscribe(data["email"], data["newsletters"], lang=data["lang"])
-    if response["status"] == "ok":
-        return JsonResponse(data, status=status.HTTP_201_CREATED)
-
-    return JsonResponse(data, status=status.HTTP_400_BAD_REQUEST)
+    # Subscribing to newsletter using basket, once the outbox worker gets to it.
+    enqueue_basket_subscription(data["email"], data["newsletters"], lang=data["lang"])
+    return JsonResponse(data, status=status.HTTP_201_CREATED)
 
 
 # handle Salesforce petition data
@@ -219,40 +216,26 @@ def petition_submission(request, petition):
     )
 
     if request.data["newsletterSignup"] is True:
+        error = get_subscription_error(data["email"], "mozilla-foundation")
+        if error is not None:
+            return JsonResponse({"error": error}, status=status.HTTP_400_BAD_REQUEST)
 
         # Use basket-clients subscribe method, then send the petition information to SQS
         # with "newsletterSignup" set to false, to avoid subscribing them twice.
-        basket.subscribe(data["email"], "mozilla-foundation", lang=data["lang"])
+        enqueue_basket_subscription(data["email"], "mozilla-foundation", lang=data["lang"])
         data["newsletterSignup"] = False
 
-    return send_to_sqs(crm_sqs["client"], crm_queue_url, message, type="petition")
+    # sqs destination for salesforce
+    return queue_for_sqs(settings.CRM_PETITION_SQS_QUEUE_URL, message, type="petition")
 
 
-def send_to_sqs(sqs, queue_url, message, type="petition"):
+def queue_for_sqs(queue_url, message, type="petition"):
     if settings.DEBUG is True:
-        logger.info(f"Sending {type} message: {message}")
-        if not sqs:
-            # TODO: can this still kick in now that we have an SQS proxy object?
-            logger.info("Faking a success message (debug=true, sqs=nonexistent).")
-            return JsonResponse({"message": "success (faked)"}, 201)
+        logger.info(f"Queueing {type} message: {message}")
 
     if queue_url is None:
         logger.warning(f"{type} was not submitted: No {type} SQS url was specified")
         return JsonResponse({"message": "success", "details": "nq"}, status=201)
 
-    try:
-        response = sqs.send_message(QueueUrl=queue_url, MessageBody=message)
-    except Exception as error:
-        logger.error(f"Failed to send {type} with: {error}")
-        return JsonResponse(
-            {"error": f"Failed to queue up {type}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-
-    if "MessageId" in response and response["MessageId"]:
-        return JsonResponse({"message": "success", "details": response["MessageId"]}, status=201)
-    else:
-        return JsonResponse(
-            {"error": f"Something went wrong with {type}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
+    submission = enqueue_sqs_message(queue_url, message)
+    return JsonResponse({"message": "success", "details": submission.pk}, status=201)
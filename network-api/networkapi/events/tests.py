@@ -1,9 +1,12 @@
 import json
-from unittest import mock
 
+from django.db import connection
 from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from networkapi.campaign.models import CRMSubmission
+
 from .factory import TitoEventFactory
 from .utils import sign_tito_request
 from .views import tito_ticket_completed
@@ -50,9 +53,7 @@ class TitoTicketCompletedTest(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.content.decode(), "Payload verification failed")
 
-    @mock.patch("networkapi.events.views.basket")
-    def test_calls_basket_api(self, mock_basket):
-        secret = bytes(self.tito_event.security_token, "utf-8")
+    def _signed_request(self, data, email="rich@test.com"):
         data = {
             "answers": [
                 {
@@ -60,48 +61,73 @@ class TitoTicketCompletedTest(TestCase):
                     "response": ["yes"],
                 },
             ],
-            "email": "rich@test.com",
-        } | self._webhook_data()
-
+            "email": email,
+        } | data
         factory = RequestFactory()
         request = factory.post(
             self.url,
-            data=data,
+            data=json.dumps(data),
             content_type="application/json",
             HTTP_X_WEBHOOK_NAME="ticket.completed",
         )
+        secret = bytes(self.tito_event.security_token, "utf-8")
         request.META["HTTP_TITO_SIGNATURE"] = sign_tito_request(secret, request.body)
+        return request
+
+    def test_invalid_payload(self):
+        response = self.client.post(
+            self.url,
+            data="not json",
+            content_type="application/json",
+            HTTP_X_WEBHOOK_NAME="ticket.completed",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_event(self):
+        request = self._signed_request({"event": {"account_slug": "unknown", "slug": "event"}})
 
         response = tito_ticket_completed(request)
 
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.content.decode(), "Payload verification failed")
+
+    def test_queues_basket_subscription(self):
+        response = tito_ticket_completed(self._signed_request(self._webhook_data()))
+
         self.assertEqual(response.status_code, 202)
-        mock_basket.subscribe.assert_called_once_with("rich@test.com", "mozilla-festival")
+        submission = CRMSubmission.objects.get()
+        self.assertEqual(submission.kind, CRMSubmission.BASKET_SUBSCRIPTION)
+        self.assertEqual(submission.payload, {"email": "rich@test.com", "newsletters": "mozilla-festival"})
 
-    def test_logs_basket_exception(self):
-        # Using `failure@example.com` as the email causes an exception, see:
-        # https://github.com/mozilla/basket-example#tips
+    def test_no_newsletter_signup(self):
+        request = self._signed_request(self._webhook_data() | {"answers": []})
 
-        secret = bytes(self.tito_event.security_token, "utf-8")
-        data = {
-            "answers": [
-                {
-                    "question": {"id": self.tito_event.newsletter_question_id},
-                    "response": ["yes"],
-                },
-            ],
-            "email": "failure@example.com",
-        } | self._webhook_data()
+        response = tito_ticket_completed(request)
 
-        factory = RequestFactory()
-        request = factory.post(
-            self.url,
-            data=json.dumps(data),
-            content_type="application/json",
-            HTTP_X_WEBHOOK_NAME="ticket.completed",
-        )
-        request.META["HTTP_TITO_SIGNATURE"] = sign_tito_request(secret, request.body)
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(CRMSubmission.objects.exists())
+
+    def test_replayed_webhooks_are_queued_once(self):
+        for _ in range(3):
+            self.assertEqual(tito_ticket_completed(self._signed_request(self._webhook_data())).status_code, 202)
 
-        with self.assertLogs(logger="networkapi.events.views", level="ERROR") as cm:
+        self.assertEqual(CRMSubmission.objects.count(), 1)
+
+    def test_event_secrets_are_cached(self):
+        tito_ticket_completed(self._signed_request(self._webhook_data()))
+
+        request = self._signed_request(self._webhook_data(), email="other@test.com")
+        with CaptureQueriesContext(connection) as queries:
             response = tito_ticket_completed(request)
-            self.assertEqual(response.status_code, 202)
-            self.assertIn("Basket subscription from Tito webhook failed", cm.output[0])
+
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse([query for query in queries if "events_titoevent" in query["sql"]])
+
+    def test_changed_event_token_is_used(self):
+        tito_ticket_completed(self._signed_request(self._webhook_data()))
+
+        self.tito_event.security_token = "new-token"
+        self.tito_event.save()
+
+        response = tito_ticket_completed(self._signed_request(self._webhook_data()))
+        self.assertEqual(response.status_code, 202)
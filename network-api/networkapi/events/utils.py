@@ -1,33 +1,76 @@
+"""
+Verifying Tito webhooks.
+
+Tito signs webhooks with the security token of the event they are about,
+and can replay hundreds of them at once. So that verifying them doesn't
+query the database each time, every process keeps the tokens and newsletter
+question IDs of all Tito events in memory, and reloads them only when the
+version token in the shared cache changes. Saving or deleting a Tito event
+replaces that token.
+"""
 import base64
 import hashlib
 import hmac
-import json
+
+from networkapi.utility.cache_versions import bump_cache_version, get_cache_version
 
 from .models import TitoEvent
 
+TITO_EVENTS_VERSION_KEY = "tito_events_version"
+
+
+class TitoEventSecrets:
+    def __init__(self):
+        self._events = None
+        self._version = None
+
+    def get_version(self):
+        return get_cache_version(TITO_EVENTS_VERSION_KEY)
+
+    def load(self):
+        return {
+            event_id: {"security_token": security_token, "newsletter_question_id": newsletter_question_id}
+            for event_id, security_token, newsletter_question_id in TitoEvent.objects.values_list(
+                "event_id", "security_token", "newsletter_question_id"
+            )
+        }
+
+    def get(self, event_id):
+        version = self.get_version()
+        # Without a shared version, e.g. with a dummy cache, always reload.
+        if self._events is None or version is None or version != self._version:
+            self._events = self.load()
+            self._version = version
+        return self._events.get(event_id)
+
 
-def _tito_event_from_request_dict(request_dict):
+tito_event_secrets = TitoEventSecrets()
+
+
+def invalidate_tito_event_secrets():
+    bump_cache_version(TITO_EVENTS_VERSION_KEY)
+
+
+def get_tito_event_id(request_dict):
     """Given the decoded and parsed body of webhook request from Tito, return
-    the appropriate TitoEvent if it exists.
-    Return False if a matching TitoEvent does not exist."""
+    the ID of the event it is about, or None if it isn't about an event."""
 
-    event_details = request_dict["event"]
-    event_url = f"{event_details['account_slug']}/{event_details['slug']}"
-    try:
-        return TitoEvent.objects.get(event_id=event_url)
-    except TitoEvent.DoesNotExist:
-        return False
+    event_details = request_dict.get("event")
+    if not isinstance(event_details, dict):
+        return None
+    return f"{event_details.get('account_slug')}/{event_details.get('slug')}"
 
 
-def is_valid_tito_request(signature, request_body):
-    request_dict = json.loads(request_body.decode())
-    matching_event = _tito_event_from_request_dict(request_dict)
-    if matching_event:
-        secret = bytes(matching_event.security_token, "utf-8")
-        signed = sign_tito_request(secret, request_body)
-        return signature == signed
-    else:
-        return False
+def get_tito_event_secrets(request_dict):
+    """Return the security token and newsletter question ID of the TitoEvent
+    that a webhook request is about, or None if there is no such event."""
+
+    return tito_event_secrets.get(get_tito_event_id(request_dict))
+
+
+def is_valid_tito_signature(event_secrets, signature, request_body):
+    secret = bytes(event_secrets["security_token"], "utf-8")
+    return hmac.compare_digest(signature.encode(), sign_tito_request(secret, request_body).encode())
 
 
 def sign_tito_request(secret, content):
@@ -35,13 +78,10 @@ def sign_tito_request(secret, content):
     return base64.b64encode(hmac.new(secret, content, digestmod=hashlib.sha256).digest()).decode("utf-8")
 
 
-def has_signed_up_to_newsletter(request_dict):
-    matching_event = _tito_event_from_request_dict(request_dict)
-
-    if matching_event:
-        answers = request_dict.get("answers", [])
-        for answer in answers:
-            if str(answer["question"]["id"]) == matching_event.newsletter_question_id and len(answer["response"]):
-                return True
+def has_signed_up_to_newsletter(event_secrets, request_dict):
+    answers = request_dict.get("answers", [])
+    for answer in answers:
+        if str(answer["question"]["id"]) == event_secrets["newsletter_question_id"] and len(answer["response"]):
+            return True
 
     return False
@@ -1,12 +1,17 @@
 import json
 import logging
 
-import basket
 from django.http import HttpResponse, HttpResponseBadRequest
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
-from .utils import has_signed_up_to_newsletter, is_valid_tito_request
+from networkapi.campaign.outbox import enqueue_basket_subscription
+
+from .utils import (
+    get_tito_event_secrets,
+    has_signed_up_to_newsletter,
+    is_valid_tito_signature,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,19 +27,22 @@ def tito_ticket_completed(request):
     if not request.META.get("HTTP_X_WEBHOOK_NAME", "") == "ticket.completed":
         return HttpResponseBadRequest("Not a ticket completed request")
 
-    # does the payload hash signature match
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return HttpResponseBadRequest("Payload verification failed")
+
+    # does the payload hash signature match that of the event
+    event_secrets = get_tito_event_secrets(data) if isinstance(data, dict) else None
     tito_signature = request.META.get("HTTP_TITO_SIGNATURE", "")
-    if not is_valid_tito_request(tito_signature, request.body):
+    if event_secrets is None or not is_valid_tito_signature(event_secrets, tito_signature, request.body):
         return HttpResponseBadRequest("Payload verification failed")
 
-    # have they signed up to the newsletter?
-    data = json.loads(request.body.decode())
+    # have they signed up to the newsletter? Basket is only called
+    # later by the CRM outbox worker, so that replays of many webhooks
+    # at once don't keep web workers waiting on it.
     email = data.get("email")
-
-    if email and has_signed_up_to_newsletter(data):
-        try:
-            basket.subscribe(email, "mozilla-festival")
-        except Exception as error:
-            logger.exception(f"Basket subscription from Tito webhook failed: {str(error)}")
+    if email and has_signed_up_to_newsletter(event_secrets, data):
+        enqueue_basket_subscription(email, "mozilla-festival")
 
     return HttpResponse(status=202)
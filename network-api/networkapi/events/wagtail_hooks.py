@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from .models import TitoEvent
+from .utils import invalidate_tito_event_secrets
+
+
+def manage_tito_event_secrets(sender, **kwargs):
+    # Webhooks are verified with the tokens of cached Tito events.
+    invalidate_tito_event_secrets()
+
+
+post_save.connect(manage_tito_event_secrets, sender=TitoEvent)
+post_delete.connect(manage_tito_event_secrets, sender=TitoEvent)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from networkapi.wagtailpages.models import ProductPage
+
+
+class Command(BaseCommand):
+    help = """
+        Populates the denormalized `total_votes` and `average_creepiness`
+        fields on every product page from its creepiness value and vote bins,
+        so that PNI product listings can be sorted by the database.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of product pages to update per query",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        products = ProductPage.objects.select_related("votes").order_by("pk")
+        total_products = products.count()
+
+        print("Total number of products to update:", total_products)
+
+        batch = []
+        for product in products.iterator(chunk_size=batch_size):
+            product.update_vote_totals()
+            batch.append(product)
+            if len(batch) >= batch_size:
+                ProductPage.objects.bulk_update(batch, ["total_votes", "average_creepiness"])
+                batch = []
+
+        if batch:
+            ProductPage.objects.bulk_update(batch, ["total_votes", "average_creepiness"])
+
+        print("Done!")
@@ -0,0 +1,56 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from networkapi.wagtailpages.models import ArticlePage
+from networkapi.wagtailpages.utils import get_plaintext_titles
+
+
+class Command(BaseCommand):
+    help = """
+        Builds a long synthetic article, and times parsing the headings out of
+        its body, as every render used to, against reading the headings that
+        are derived when the article is saved. Nothing is written to the
+        database.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--blocks",
+            type=int,
+            default=200,
+            help="Number of rich text blocks in the article",
+        )
+        parser.add_argument(
+            "--renders",
+            type=int,
+            default=100,
+            help="Number of renders to time",
+        )
+
+    def handle(self, *args, **options):
+        block_count = options["blocks"]
+        render_count = options["renders"]
+
+        paragraphs = "".join(f"<p>Paragraph {index} with <a href='#'>a link</a>.</p>" for index in range(5))
+        body = [
+            {"type": "content", "value": f"<h2>Heading {index}</h2>{paragraphs}<h3>Subheading</h3>{paragraphs}"}
+            for index in range(block_count)
+        ]
+        page = ArticlePage(title="Benchmark article", body=json.dumps(body))
+
+        start = time.perf_counter()
+        for _ in range(render_count):
+            get_plaintext_titles(None, page.body, "content")
+        parse_duration = time.perf_counter() - start
+
+        page.page_titles = get_plaintext_titles(None, page.body, "content")
+        start = time.perf_counter()
+        for _ in range(render_count):
+            page.get_page_titles
+        stored_duration = time.perf_counter() - start
+
+        print(f"Headings of an article with {block_count} rich text blocks:")
+        print(f"  parsed per render: {parse_duration * 1000 / max(render_count, 1):.2f} ms per render")
+        print(f"  derived on save: {stored_duration * 1000 / max(render_count, 1):.4f} ms per render")
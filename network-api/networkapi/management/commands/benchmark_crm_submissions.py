@@ -0,0 +1,106 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+
+from networkapi.campaign.outbox import SQSProxy, deliver_due_submissions
+from networkapi.campaign.views import petition_submission_view
+from networkapi.wagtailpages.factory.petition import PetitionFactory
+
+
+class SlowSQSProxy(SQSProxy):
+    def __init__(self, delay):
+        self.delay = delay
+
+    def send_message_batch(self, QueueUrl, Entries):
+        time.sleep(self.delay)
+        return super().send_message_batch(QueueUrl, Entries)
+
+
+class SlowBasketResponse:
+    status_code = 200
+    content = b'{"status": "ok"}'
+
+
+class SlowBasketSession:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def post(self, url, **kwargs):
+        time.sleep(self.delay)
+        return SlowBasketResponse()
+
+
+class Command(BaseCommand):
+    help = """
+        Submits petitions with newsletter signups through the petition view,
+        and times the requests, then delivers them to stand-ins for SQS and
+        Basket that take --downstream-delay seconds to respond. Submission
+        latency should not depend on the delay. Nothing is left in the
+        database.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--submissions",
+            type=int,
+            default=200,
+            help="Number of petition submissions to time",
+        )
+        parser.add_argument(
+            "--downstream-delay",
+            type=float,
+            default=0.2,
+            help="Seconds the SQS and Basket stand-ins take to respond",
+        )
+
+    def handle(self, *args, **options):
+        submission_count = options["submissions"]
+
+        with transaction.atomic(), override_settings(DEBUG=False, CRM_PETITION_SQS_QUEUE_URL="benchmark"):
+            petition = PetitionFactory(campaign_id="benchmark")
+            for delay in (0, options["downstream_delay"]):
+                self.benchmark(petition, submission_count, delay)
+            transaction.set_rollback(True)
+
+    def benchmark(self, petition, submission_count, delay):
+        factory = RequestFactory()
+        durations = []
+        for index in range(submission_count):
+            body = {
+                "givenNames": "Benchmark",
+                "surname": "Submission",
+                "email": f"benchmark-{index}@example.com",
+                "newsletterSignup": True,
+                "source": "https://foundation.mozilla.org/",
+                "lang": "en",
+                "country": "NL",
+                "postalCode": "1000",
+                "comment": "Benchmark",
+            }
+            request = factory.post(
+                "/",
+                json.dumps(body),
+                content_type="application/json",
+                REMOTE_ADDR=f"10.1.{index // 256}.{index % 256}",
+            )
+            start = time.perf_counter()
+            petition_submission_view(request, pk=petition.pk)
+            durations.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        delivered = 0
+        while True:
+            batch = deliver_due_submissions(sqs=SlowSQSProxy(delay), session=SlowBasketSession(delay))
+            if not batch:
+                break
+            delivered += batch
+        delivery_duration = time.perf_counter() - start
+
+        percentiles = statistics.quantiles(durations, n=100)
+        print(f"Downstream delay of {delay * 1000:.0f} ms:")
+        print(f"  submit p50: {percentiles[49] * 1000:.2f} ms, p99: {percentiles[98] * 1000:.2f} ms")
+        print(f"  delivered {delivered} submissions in {delivery_duration:.2f} s")
@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from taggit.models import Tag
+
+from networkapi.wagtailpages.factory import blog as blog_factories
+from networkapi.wagtailpages.models import Homepage
+from networkapi.wagtailpages.pagemodels.index import filter_pages_by_tags
+
+
+class Command(BaseCommand):
+    help = """
+        Seeds a blog index with a large number of tagged blog posts, and
+        compares filtering them by tag in Python (loading every post and its
+        tags) with filtering them in the database. All seeded data is rolled
+        back afterwards.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=1000,
+            help="Number of blog posts to seed",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=12,
+            help="Number of entries to fetch from the filtered list",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.benchmark(options["posts"], options["page_size"])
+            transaction.set_rollback(True)
+
+    def benchmark(self, post_count, page_size):
+        homepage = Homepage.objects.first()
+        if homepage is None:
+            print("There is no homepage to add a blog index to.")
+            return
+
+        print(f"Seeding {post_count} blog posts...")
+        blog_index = blog_factories.BlogIndexPageFactory(parent=homepage, slug="benchmark-blog")
+        for index in range(post_count):
+            post = blog_factories.BlogPageFactory(parent=blog_index, title=f"Benchmark post {index}")
+            # Every tenth post gets the tag we filter on.
+            post.tags.add("benchmark-other" if index % 10 else "benchmark-match")
+            post.save()
+
+        terms = [Tag.objects.get(name="benchmark-match").slug]
+        entries = blog_index.get_entries_queryset()
+
+        def python_filter():
+            matches = [
+                entry
+                for entry in entries.specific()
+                if hasattr(entry, "tags") and not set([tag.slug for tag in entry.tags.all()]).isdisjoint(terms)
+            ]
+            return len(matches), matches[:page_size]
+
+        def database_filter():
+            filtered = filter_pages_by_tags(entries, terms)
+            return filtered.count(), list(filtered.specific()[:page_size])
+
+        for label, run in [("Python", python_filter), ("Database", database_filter)]:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                total, page = run()
+                duration = time.perf_counter() - start
+            print(f"{label} tag filter:")
+            print(f"  matching posts: {total} ({len(page)} fetched)")
+            print(f"  queries: {len(queries)}")
+            print(f"  time: {duration * 1000:.1f} ms")
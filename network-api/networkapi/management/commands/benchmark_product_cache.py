@@ -0,0 +1,66 @@
+import pickle
+import timeit
+import zlib
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from networkapi.wagtailpages.models import BuyersGuidePage, ProductPage
+from networkapi.wagtailpages.pagemodels.buyersguide.product_cache import (
+    serialize_product_cards,
+)
+from networkapi.wagtailpages.pagemodels.buyersguide.utils import sort_average
+
+
+class Command(BaseCommand):
+    help = """
+        Compares the cache payload of the PNI home page product listing when
+        stored as pickled product pages (the old format) and as product cards.
+        Payloads are pickled and zlib-compressed, the same way django_redis
+        stores them.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--language-code",
+            default="en",
+            help="Language code of the product listing to benchmark",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=100,
+            help="Number of times to serialize and deserialize each payload",
+        )
+
+    def handle(self, *args, **options):
+        language_code = options["language_code"]
+        iterations = options["iterations"]
+
+        buyersguide_page = BuyersGuidePage.objects.first()
+        if buyersguide_page is None:
+            print("There is no Buyers Guide page to benchmark.")
+            return
+
+        cards = buyersguide_page.get_products(language_code, False, "benchmark_product_cache")
+        cache.delete("benchmark_product_cache")
+        pages = list(sort_average(ProductPage.objects.filter(pk__in=[card.id for card in cards]).live()))
+
+        print(f"Number of products: {len(cards)}")
+        self.benchmark("Product pages", pages, iterations)
+        self.benchmark("Product cards", serialize_product_cards(cards), iterations)
+
+    def benchmark(self, label, payload, iterations):
+        pickled = pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+        data = zlib.compress(pickled)
+        dump_time = timeit.timeit(
+            lambda: zlib.compress(pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)),
+            number=iterations,
+        )
+        load_time = timeit.timeit(lambda: pickle.loads(zlib.decompress(data)), number=iterations)
+
+        print(f"{label}:")
+        print(f"  pickled size: {len(pickled)} bytes")
+        print(f"  compressed size: {len(data)} bytes")
+        print(f"  serialize: {dump_time / iterations * 1000:.3f} ms")
+        print(f"  deserialize: {load_time / iterations * 1000:.3f} ms")
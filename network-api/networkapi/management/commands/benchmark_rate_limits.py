@@ -0,0 +1,61 @@
+import time
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from networkapi.utility.rate_limits import (
+    LocalMemoryBackend,
+    RateLimiter,
+    get_redis_backend,
+)
+
+
+class Command(BaseCommand):
+    help = """
+        Times checking the Buyers Guide vote rate limit, with counts kept in
+        the memory of this process, and in Redis when it is the default cache.
+        Hits are spread over many client keys, as they are during a vote spike.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hits",
+            type=int,
+            default=10000,
+            help="Number of hits to time",
+        )
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=1000,
+            help="Number of client keys to spread the hits over",
+        )
+
+    def handle(self, *args, **options):
+        hit_count = options["hits"]
+        client_count = options["clients"]
+
+        limiter = RateLimiter("benchmark", "BUYERS_GUIDE_VOTE_RATE_LIMIT")
+        if limiter.rate is None:
+            print("BUYERS_GUIDE_VOTE_RATE_LIMIT is not set, so votes are not limited.")
+            return
+
+        limit, period = limiter.rate
+        print(f"Rate limit: {limit} votes per {period} seconds")
+        self.benchmark("Local memory", LocalMemoryBackend(), limiter, hit_count, client_count)
+
+        if limiter.get_backend() is not limiter.local_backend:
+            self.benchmark("Redis", get_redis_backend(), limiter, hit_count, client_count)
+        else:
+            print("Redis: not the default cache, skipped")
+
+    def benchmark(self, label, backend, limiter, hit_count, client_count):
+        limit, period = limiter.rate
+        keys = [limiter.get_key([f"10.0.{index // 256}.{index % 256}", 1]) for index in range(client_count)]
+        hits = iter(range(hit_count))
+
+        def hit():
+            backend.hit(keys[next(hits) % client_count], limit, period, time.time())
+
+        duration = timeit.timeit(hit, number=hit_count)
+        print(f"{label}: {duration * 1_000_000 / max(hit_count, 1):.1f} µs per hit")
@@ -0,0 +1,59 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from networkapi.wagtailpages.pagemodels.blog.related_content import RelatedContentIndex
+
+
+class Command(BaseCommand):
+    help = """
+        Builds a related content index for a large number of synthetic blog
+        posts, and times finding the related posts of every post with it.
+        Nothing is written to the database.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=10000,
+            help="Number of blog posts to index",
+        )
+        parser.add_argument(
+            "--tags",
+            type=int,
+            default=500,
+            help="Number of distinct tags",
+        )
+        parser.add_argument(
+            "--tags-per-post",
+            type=int,
+            default=4,
+            help="Number of tags on every post",
+        )
+
+    def handle(self, *args, **options):
+        post_count = options["posts"]
+        tag_count = options["tags"]
+        tags_per_post = min(options["tags_per_post"], tag_count)
+        rng = random.Random(0)
+
+        rows = [
+            (post_id, tag_id, float(post_id))
+            for post_id in range(post_count)
+            for tag_id in rng.sample(range(tag_count), tags_per_post)
+        ]
+
+        start = time.perf_counter()
+        index = RelatedContentIndex(rows)
+        build_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        related = index.get_all_related_ids()
+        lookup_duration = time.perf_counter() - start
+
+        print(f"Related content for {post_count} posts with {tag_count} tags ({tags_per_post} per post):")
+        print(f"  index build: {build_duration * 1000:.1f} ms")
+        print(f"  all related posts: {lookup_duration * 1000:.1f} ms")
+        print(f"  per post: {lookup_duration * 1000 * 1000 / max(len(related), 1):.1f} µs")
@@ -0,0 +1,90 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from networkapi.wagtailpages.pagemodels.research_hub.facets import (
+    FACETS,
+    ResearchFacetIndex,
+)
+
+
+class Command(BaseCommand):
+    help = """
+        Builds a research library facet index for a large number of synthetic
+        research pages, and times filtering it and counting the options of
+        every facet for random filter selections, and getting the stats of
+        every author. Nothing is written to the database.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=5000,
+            help="Number of research pages to index",
+        )
+        parser.add_argument(
+            "--options",
+            type=int,
+            default=200,
+            help="Number of options of every facet",
+        )
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=1000,
+            help="Number of random filter selections",
+        )
+
+    def handle(self, *args, **options):
+        page_count = options["pages"]
+        option_count = options["options"]
+        query_count = options["queries"]
+        rng = random.Random(0)
+
+        facet_options = {
+            facet: [(object_id, f"{facet} {object_id}", f"{facet}-{object_id}") for object_id in range(option_count)]
+            for facet in FACETS
+        }
+        option_keys = {facet: {object_id: key for object_id, _, key in facet_options[facet]} for facet in FACETS}
+        pages = [
+            (
+                page_id,
+                datetime.date(rng.randint(2010, 2022), 1, 1) + datetime.timedelta(days=rng.randrange(365)),
+                {
+                    facet: {f"{facet}-{rng.randrange(option_count)}" for _ in range(rng.randint(1, 3))}
+                    for facet in FACETS
+                },
+            )
+            for page_id in range(page_count)
+        ]
+
+        start = time.perf_counter()
+        index = ResearchFacetIndex(facet_options, option_keys)
+        for page_id, publication_date, keys in pages:
+            index.add_page(page_id, publication_date, keys)
+        build_duration = time.perf_counter() - start
+
+        selections = [
+            {facet: rng.sample(range(option_count), rng.randint(0, 1)) for facet in FACETS} for _ in range(query_count)
+        ]
+
+        start = time.perf_counter()
+        for selected in selections:
+            page_ids = index.filter(selected)
+            for facet in FACETS:
+                index.get_options(facet, page_ids)
+            index.get_year_options(page_ids)
+        query_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for object_id in option_keys["author"]:
+            index.get_author_stats(object_id)
+        author_duration = time.perf_counter() - start
+
+        print(f"Facet index for {page_count} pages with {option_count} options per facet:")
+        print(f"  index build: {build_duration * 1000:.1f} ms")
+        print(f"  filters and option counts: {query_duration * 1000 * 1000 / max(query_count, 1):.1f} µs per request")
+        print(f"  author stats: {author_duration * 1000 * 1000 / max(option_count, 1):.1f} µs per author")
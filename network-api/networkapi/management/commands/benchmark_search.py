@@ -0,0 +1,131 @@
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import translation
+from wagtail.core import rich_text
+from wagtail.search.backends import get_search_backend
+from wagtail.search.backends.database.postgres.postgres import PostgresSearchBackend
+
+from networkapi.utility.search import SearchResultsPaginator
+from networkapi.wagtailpages.factory import blog as blog_factories
+from networkapi.wagtailpages.models import BlogPage, Homepage
+
+
+class Command(BaseCommand):
+    help = """
+        Seeds a blog index with posts, some of which contain a made-up term
+        in their title, search description or body, and compares Wagtail's
+        Postgres search backend with ours: how often the title match ranks
+        first, how often title, description and body matches rank in that
+        order, how often the term is found by its first letters, and how long
+        fetching a page of results and counting them takes. All seeded data
+        is rolled back afterwards.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=300,
+            help="Number of blog posts to seed",
+        )
+        parser.add_argument(
+            "--terms",
+            type=int,
+            default=20,
+            help="Number of made-up terms to plant in posts and search for",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of times to time each search",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=12,
+            help="Number of results to fetch per search",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            print("Search can only be benchmarked on Postgres.")
+            return
+
+        with transaction.atomic(), translation.override("en"):
+            self.benchmark(options["posts"], options["terms"], options["repeat"], options["page_size"])
+            transaction.set_rollback(True)
+
+    def benchmark(self, post_count, term_count, repeat, page_size):
+        homepage = Homepage.objects.first()
+        if homepage is None:
+            print("There is no homepage to add a blog index to.")
+            return
+
+        print(f"Seeding {post_count} blog posts...")
+        blog_index = blog_factories.BlogIndexPageFactory(parent=homepage, slug="benchmark-blog")
+        rng = random.Random(0)
+        terms = ["".join(rng.choices(string.ascii_lowercase, k=10)) for _ in range(term_count)]
+        expected = {}
+        for term in terms:
+            title_post = blog_factories.BlogPageFactory(parent=blog_index, title=f"{term.title()} explained")
+            description_post = blog_factories.BlogPageFactory(
+                parent=blog_index, search_description=f"What you should know about {term}."
+            )
+            body_post = blog_factories.BlogPageFactory(parent=blog_index)
+            body_post.body.append(("paragraph", rich_text.RichText(f"<p>More about {term}.</p>")))
+            body_post.save()
+            expected[term] = [title_post.pk, description_post.pk, body_post.pk]
+        for _ in range(max(post_count - 3 * term_count, 0)):
+            blog_factories.BlogPageFactory(parent=blog_index)
+
+        posts = list(BlogPage.objects.child_of(blog_index))
+        for label, backend in [
+            ("Wagtail Postgres search", PostgresSearchBackend({})),
+            ("Postgres search", get_search_backend()),
+        ]:
+            backend.reset_index()
+            backend.add_bulk(BlogPage, posts)
+            self.benchmark_backend(label, backend, blog_index, expected, repeat, page_size)
+
+    def benchmark_backend(self, label, backend, blog_index, expected, repeat, page_size):
+        queryset = BlogPage.objects.child_of(blog_index).live()
+        title_first = ordered = prefix_found = 0
+        durations = []
+        query_counts = []
+
+        for term, (title_pk, description_pk, body_pk) in expected.items():
+            ranked = [post.pk for post in backend.search(term, queryset, order_by_relevance=True)]
+            title_first += ranked[:1] == [title_pk]
+            ordered += [pk for pk in ranked if pk in (title_pk, description_pk, body_pk)] == [
+                title_pk,
+                description_pk,
+                body_pk,
+            ]
+            prefix_found += title_pk in [post.pk for post in backend.search(term[:-3], queryset)]
+
+            for _ in range(repeat):
+                results = backend.search(term, queryset, order_by_relevance=True)
+                # Seeding fills up the query log, which then stops growing.
+                reset_queries()
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    page = SearchResultsPaginator(object_list=results, per_page=page_size).page(1)
+                    page.paginator.count
+                    durations.append(time.perf_counter() - start)
+                query_counts.append(len(queries))
+
+        term_count = len(expected)
+        percentiles = statistics.quantiles(durations, n=100)
+        print(f"{label}:")
+        print(f"  title match ranked first: {title_first}/{term_count}")
+        print(f"  title, description and body matches in order: {ordered}/{term_count}")
+        print(f"  found by prefix: {prefix_found}/{term_count}")
+        print(f"  queries per page: {statistics.mean(query_counts):.0f}")
+        print(f"  page and count p50: {percentiles[49] * 1000:.2f} ms, p99: {percentiles[98] * 1000:.2f} ms")
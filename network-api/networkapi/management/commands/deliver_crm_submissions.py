@@ -0,0 +1,56 @@
+import time
+
+import requests
+from django.core.management.base import BaseCommand
+
+from networkapi.campaign.outbox import (
+    delete_sent_submissions,
+    deliver_due_submissions,
+    requeue_failed_submissions,
+)
+
+
+class Command(BaseCommand):
+    help = """
+        Delivers queued petition signatures and newsletter signups to SQS and
+        Basket. Runs once, or keeps polling for new submissions with --loop.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of submissions to claim and deliver at a time",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep delivering submissions as they are queued",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2,
+            help="Seconds to wait for new submissions when there are none, with --loop",
+        )
+        parser.add_argument(
+            "--requeue-failed",
+            action="store_true",
+            help="Retry submissions that were given up on",
+        )
+
+    def handle(self, *args, **options):
+        if options["requeue_failed"]:
+            print(f"Requeued {requeue_failed_submissions()} failed submissions")
+
+        session = requests.Session()
+        while True:
+            delete_sent_submissions()
+            delivered = deliver_due_submissions(options["batch_size"], session=session)
+            while delivered == options["batch_size"]:
+                delivered = deliver_due_submissions(options["batch_size"], session=session)
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
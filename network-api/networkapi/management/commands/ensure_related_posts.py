@@ -1,6 +1,10 @@
 from django.core.management.base import BaseCommand
+from django.db.models import Count
 
 from networkapi.wagtailpages.models import BlogPage
+from networkapi.wagtailpages.pagemodels.blog.related_content import (
+    get_related_content_index,
+)
 
 
 class Command(BaseCommand):
@@ -11,16 +15,24 @@ class Command(BaseCommand):
     """
 
     def handle(self, *args, **options):
-        all_posts = BlogPage.objects.all()
+        # Posts that already have all their related posts don't need updating.
+        all_posts = (
+            BlogPage.objects.annotate(related_post_total=Count("related_posts"))
+            .filter(related_post_total__lt=BlogPage.related_post_count)
+            .order_by("pk")
+        )
         total_posts = all_posts.count()
 
         print("Total number of posts to update:", total_posts)
 
+        # Build the tag index for every locale once, so that finding the
+        # related posts for each post doesn't need any tag queries.
+        for locale_id in set(all_posts.values_list("locale_id", flat=True)):
+            index = get_related_content_index(locale_id)
+            print(f"Indexed the tags of {len(index)} live posts for locale {locale_id}")
+
         for i, post in enumerate(all_posts):
-            print(
-                f"Processing post {i+1} out of {total_posts}, "
-                "{post.related_posts.all().count()} preexisting related posts"
-            )
+            print(f"Processing post {i+1} out of {total_posts}, {post.related_post_total} preexisting related posts")
 
             post.save_revision()
 
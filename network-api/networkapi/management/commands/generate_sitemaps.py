@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from networkapi.sitemaps import generate_sitemaps
+
+
+class Command(BaseCommand):
+    help = "Regenerate the sitemaps of all locales - used post deploy"
+
+    def handle(self, *args, **options):
+        print("Generating sitemaps")
+        generate_sitemaps()
+        print("Done!")
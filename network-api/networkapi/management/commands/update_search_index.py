@@ -0,0 +1,65 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import dateparse, timezone
+
+from networkapi.search_index import process_index_updates, queue_changes_since
+
+
+def parse_since(value):
+    since = dateparse.parse_datetime(value)
+    if since is None:
+        date = dateparse.parse_date(value)
+        if date is None:
+            raise CommandError(f"--since must be an ISO 8601 date or date and time, not {value!r}")
+        since = datetime.datetime.combine(date, datetime.time())
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+class Command(BaseCommand):
+    help = """
+        Indexes objects that were saved or deleted since they were last
+        indexed. Runs once, or keeps indexing objects as they change with
+        --loop. With --since, first reindexes all objects that changed since
+        then. Use Wagtail's update_index to rebuild the whole index.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of objects to index at a time",
+        )
+        parser.add_argument(
+            "--since",
+            help="Also reindex objects that changed since this date or date and time, e.g. 2022-11-01T12:00",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep indexing objects as they change",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait for changes when there are none, with --loop",
+        )
+
+    def handle(self, *args, **options):
+        if options["since"]:
+            since = parse_since(options["since"])
+            print(f"Queued {queue_changes_since(since)} objects that changed since {since.isoformat()}")
+
+        while True:
+            processed = process_index_updates(options["batch_size"])
+            while processed == options["batch_size"]:
+                processed = process_index_updates(options["batch_size"])
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from networkapi.sitemaps import regenerate_outdated_sitemaps
+
+
+class Command(BaseCommand):
+    help = """
+        Regenerates the sections of the sitemaps that were marked as out of
+        date by publishing, moving or deleting pages. Runs once, or keeps
+        regenerating them as pages change with --loop. Use generate_sitemaps
+        to regenerate all sitemaps.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep regenerating sitemap sections as pages change",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait for changes when there are none, with --loop",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            regenerate_outdated_sitemaps()
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
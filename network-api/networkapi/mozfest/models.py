@@ -14,6 +14,7 @@ from networkapi.wagtailpages.models import (
 )
 from networkapi.wagtailpages.pagemodels import customblocks
 from networkapi.wagtailpages.pagemodels.customblocks.base_fields import base_fields
+from networkapi.wagtailpages.pulse import prefetch_pulse_profiles
 from networkapi.wagtailpages.utils import (
     get_page_tree_information,
     set_main_site_nav_information,
@@ -117,6 +118,7 @@ class MozfestPrimaryPage(FoundationMetadataPageMixin, FoundationBannerInheritanc
 
     def get_context(self, request, bypass_menu_buildstep=False):
         context = super().get_context(request)
+        prefetch_pulse_profiles(self.body)
         context = set_main_site_nav_information(self, context, "MozfestHomepage")
         context = get_page_tree_information(self, context)
 
@@ -0,0 +1,118 @@
+"""
+Queued search index updates.
+
+Wagtail indexes objects from their save and delete signals, within the
+request that saves them, and can only catch up on changes by rebuilding the
+whole index with `update_index`. Its automatic updates are turned off, and
+saving or deleting an indexed object instead marks its `SearchIndexUpdate`
+as pending, which costs one small write however often the object is saved.
+
+The `update_search_index` management command indexes pending objects in
+batches, upserting the index entries of each model in bulk, and removes the
+entries of objects that no longer exist. With `--since`, it first marks all
+objects that changed since then as pending again, so that an index can be
+brought up to date without reindexing everything.
+"""
+import logging
+from functools import reduce
+from operator import or_
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.utils import timezone
+from wagtail.core.models import Page
+from wagtail.search.backends import get_search_backend
+from wagtail.search.index import class_is_indexed
+
+from networkapi.wagtailpages.models import SearchIndexUpdate
+
+logger = logging.getLogger(__name__)
+
+
+def get_index_key(instance):
+    # Pages are indexed as their specific type, which they know without querying for it.
+    if isinstance(instance, Page):
+        return instance.content_type_id, str(instance.pk)
+    return ContentType.objects.get_for_model(instance).pk, str(instance.pk)
+
+
+def queue_index_update(instance):
+    """
+    Mark the index entry of a saved or deleted object as out of date.
+    """
+    content_type_id, object_id = get_index_key(instance)
+    now = timezone.now()
+    updated = SearchIndexUpdate.objects.filter(content_type_id=content_type_id, object_id=object_id).update(
+        changed_at=now, indexed_at=None
+    )
+    if not updated:
+        SearchIndexUpdate.objects.bulk_create(
+            [SearchIndexUpdate(content_type_id=content_type_id, object_id=object_id, changed_at=now)],
+            ignore_conflicts=True,
+        )
+
+
+def queue_changes_since(since):
+    """
+    Mark all objects that changed since `since` as pending again,
+    and return how many there are.
+    """
+    return SearchIndexUpdate.objects.filter(changed_at__gte=since).update(indexed_at=None)
+
+
+def index_model_updates(backend, model, updates):
+    """
+    Index the objects of `model` that `updates` are for, remove the entries
+    of those that are gone, and return the updates of those that are gone.
+    """
+    object_ids = [update.object_id for update in updates]
+    objects = list(model.get_indexed_objects().filter(pk__in=object_ids))
+    if objects:
+        backend.add_bulk(model, objects)
+
+    indexed_ids = {str(obj.pk) for obj in objects}
+    removed = [update for update in updates if update.object_id not in indexed_ids]
+    for update in removed:
+        backend.delete(model(pk=update.object_id))
+    return removed
+
+
+def process_index_updates(batch_size=500, backend=None):
+    """
+    Index up to `batch_size` pending objects, and return how many were indexed
+    or removed from the index. Objects that fail to index stay pending, as do
+    objects that change again while they are being indexed.
+    """
+    backend = backend or get_search_backend()
+    updates = list(SearchIndexUpdate.objects.filter(indexed_at__isnull=True).order_by("changed_at")[:batch_size])
+
+    by_content_type = {}
+    for update in updates:
+        by_content_type.setdefault(update.content_type_id, []).append(update)
+
+    indexed = []
+    removed = []
+    for content_type_id, content_type_updates in by_content_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None or not class_is_indexed(model):
+            removed.extend(content_type_updates)
+            continue
+
+        try:
+            model_removed = index_model_updates(backend, model, content_type_updates)
+        except Exception:
+            # Leave them pending, to be retried with the next batch.
+            logger.exception(f"Failed to index {len(content_type_updates)} {model._meta.label} objects")
+            continue
+        removed_ids = {update.pk for update in model_removed}
+        removed.extend(model_removed)
+        indexed.extend(update for update in content_type_updates if update.pk not in removed_ids)
+
+    def unchanged(updates):
+        return reduce(or_, (Q(pk=update.pk, changed_at=update.changed_at) for update in updates))
+
+    if indexed:
+        SearchIndexUpdate.objects.filter(unchanged(indexed)).update(indexed_at=timezone.now())
+    if removed:
+        SearchIndexUpdate.objects.filter(unchanged(removed)).delete()
+    return len(indexed) + len(removed)
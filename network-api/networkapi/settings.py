@@ -35,7 +35,11 @@ env = environ.Env(
     ASSET_DOMAIN=(str, ""),
     AWS_LOCATION=(str, ""),
     BASKET_URL=(str, ""),
+    BUYERS_GUIDE_CACHE_WARMUP=(bool, False),
+    BUYERS_GUIDE_VOTE_BUFFER_SIZE=(int, 0),
+    BUYERS_GUIDE_VOTE_BUFFER_TIMEOUT=(int, 5),
     BUYERS_GUIDE_VOTE_RATE_LIMIT=(str, "200/hour"),
+    CAMPAIGN_SUBMISSION_RATE_LIMIT=(str, "100/hour"),
     CONTENT_TYPE_NO_SNIFF=bool,
     CORS_ALLOWED_ORIGIN_REGEXES=(tuple, ()),
     CORS_ALLOWED_ORIGINS=(tuple, ()),
@@ -67,9 +71,14 @@ env = environ.Env(
     NETWORK_SITE_URL=(str, ""),
     PETITION_TEST_CAMPAIGN_ID=(str, ""),
     PNI_STATS_DB_URL=(str, None),
+    PULSE_API_CACHE_TIMEOUT=(int, 60 * 15),
     PULSE_API_DOMAIN=(str, ""),
+    PULSE_API_STALE_TIMEOUT=(int, 60 * 60 * 24),
+    PULSE_API_TIMEOUT=(float, 3.0),
     PULSE_DOMAIN=(str, ""),
     RANDOM_SEED=(int, None),
+    # Heroku's router is the remote address of every request on Heroku.
+    RATE_LIMIT_USE_X_FORWARDED_FOR=(bool, "DYNO" in os.environ),
     REDIS_URL=(str, ""),
     REFERRER_HEADER_VALUE=(str, ""),
     REVIEW_APP=(bool, False),
@@ -535,7 +544,19 @@ WAGTAILEMBEDS_FINDERS = [
 
 WAGTAILSEARCH_BACKENDS = {
     "default": {
-        "BACKEND": "wagtail.search.backends.database",
+        "BACKEND": "networkapi.utility.search",
+        # Objects are indexed from a queue by the update_search_index command.
+        "AUTO_UPDATE": False,
+        # Postgres text search configurations by language. Languages
+        # without one are indexed and searched without stemming.
+        "LOCALE_SEARCH_CONFIGS": {
+            "en": "english",
+            "de": "german",
+            "es": "spanish",
+            "fr": "french",
+            "nl": "dutch",
+            "pt-BR": "portuguese",
+        },
     }
 }
 
@@ -684,9 +705,23 @@ SLACK_WEBHOOK_RA = env("SLACK_WEBHOOK_RA")
 # Used by load_fake_data to ensure we have petitions that actually work
 PETITION_TEST_CAMPAIGN_ID = env("PETITION_TEST_CAMPAIGN_ID")
 
-# Buyers Guide Rate Limit Setting
+# Buyers Guide Rate Limit Setting: votes per client IP and product (see utility/rate_limits.py)
 BUYERS_GUIDE_VOTE_RATE_LIMIT = env("BUYERS_GUIDE_VOTE_RATE_LIMIT")
 
+# Petition and signup submissions per client IP and petition or signup
+CAMPAIGN_SUBMISSION_RATE_LIMIT = env("CAMPAIGN_SUBMISSION_RATE_LIMIT")
+
+# Take client IPs for rate limits from the last X-Forwarded-For address
+RATE_LIMIT_USE_X_FORWARDED_FOR = env("RATE_LIMIT_USE_X_FORWARDED_FOR")
+
+# Re-populate the PNI product listing cache in the background after publishing
+BUYERS_GUIDE_CACHE_WARMUP = env("BUYERS_GUIDE_CACHE_WARMUP")
+
+# Buyers Guide vote buffering: when the buffer size is above zero, votes are
+# aggregated in-process and written in batches (see buyersguide/voting.py).
+BUYERS_GUIDE_VOTE_BUFFER_SIZE = env("BUYERS_GUIDE_VOTE_BUFFER_SIZE")
+BUYERS_GUIDE_VOTE_BUFFER_TIMEOUT = env("BUYERS_GUIDE_VOTE_BUFFER_TIMEOUT")
+
 # Commento.io flag
 USE_COMMENTO = env("USE_COMMENTO")
 
@@ -703,6 +738,11 @@ INDEX_PAGE_CACHE_TIMEOUT = env("INDEX_PAGE_CACHE_TIMEOUT")
 FEED_CACHE_TIMEOUT = env("FEED_CACHE_TIMEOUT")
 FEED_LIMIT = env("FEED_LIMIT")
 
+# Pulse API client settings
+PULSE_API_TIMEOUT = env("PULSE_API_TIMEOUT")
+PULSE_API_CACHE_TIMEOUT = env("PULSE_API_CACHE_TIMEOUT")
+PULSE_API_STALE_TIMEOUT = env("PULSE_API_STALE_TIMEOUT")
+
 # Support pages with a large number of fields
 DATA_UPLOAD_MAX_NUMBER_FIELDS = env("DATA_UPLOAD_MAX_NUMBER_FIELDS")
 
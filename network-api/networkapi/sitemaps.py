@@ -1,31 +1,230 @@
-# Solution came from Aleksi44 on Github:
-# https://github.com/wagtail/wagtail/issues/6583#issuecomment-798960446
+"""
+Pre-generated sitemaps.
+
+The sitemap of every locale is split into sections, one for the homepage and
+one for each page below it, and each section into chunks of at most 50,000
+URLs. Chunks are rendered ahead of time and stored as `SitemapChunk`s, so
+serving them does not touch the page tree, and they are never generated
+while serving them.
+
+Publishing or unpublishing a page marks its section as out of date, and
+deleting or moving pages, adding a locale, and changes to the top level of
+the site mark the whole locale. Marks are `SitemapUpdate` rows, written in
+the transaction that changes the pages, so that marks from changes that are
+rolled back are rolled back with them. The `update_sitemaps` management
+command regenerates each marked section once, outside of the editor's
+request, however many pages in it changed, e.g. when unpublishing a page
+with all of its descendants. The `generate_sitemaps` management command
+regenerates all locales.
+
+The homepage's section is named "", which cannot be the slug of a page.
+
+`/sitemap.xml` lists the chunks of all locales, and `/<language>/sitemap.xml`
+the chunks of one locale.
+"""
+import logging
+from functools import reduce
+from operator import or_
+
 from django.conf import settings
-from django.contrib.sitemaps import views as sitemap_views
+from django.contrib.sitemaps import Sitemap
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
-from wagtail.contrib.sitemaps.sitemap_generator import Sitemap
-
-
-class CustomSitemap(Sitemap):
-    def items(self):
-        return (
-            self.get_wagtail_site()
-            .root_page.localized.get_descendants(inclusive=True)  # This is missing from sitemap_generator
-            .live()
-            .public()
-            .order_by("path")
-            .specific()
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.http import http_date
+from wagtail.core.models import Page, Site
+
+from networkapi.wagtailpages.locale_registry import locale_registry
+from networkapi.wagtailpages.models import SitemapChunk, SitemapUpdate
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_DOMAIN = "https://foundation.mozilla.org"
+
+SITEMAP_CHUNK_SIZE = Sitemap.limit
+
+HOME_SECTION = ""
+
+
+def get_sitemap_root(locale):
+    """
+    Return the version of the default site's root page in `locale`, if there is one.
+    """
+    site = Site.objects.select_related("root_page").filter(is_default_site=True).first()
+    if site is None:
+        return None
+    return site.root_page.get_translation_or_none(locale)
+
+
+def get_sitemap_sections(root_page):
+    return [HOME_SECTION] + list(root_page.get_children().values_list("slug", flat=True))
+
+
+def get_section_pages(root_page, section):
+    pages = Page.objects.live().public().order_by("path")
+    if section == HOME_SECTION:
+        pages = pages.filter(pk=root_page.pk)
+    else:
+        section_page = root_page.get_children().filter(slug=section).first()
+        if section_page is None:
+            return Page.objects.none()
+        pages = pages.descendant_of(section_page, inclusive=True)
+    return pages.specific()
+
+
+def get_section_urls(root_page, section):
+    return [url for page in get_section_pages(root_page, section) for url in page.get_sitemap_urls(None)]
+
+
+@transaction.atomic
+def generate_sitemap_section(locale, root_page, section):
+    """
+    Replace the chunks of one section of a locale's sitemap.
+    """
+    urls = get_section_urls(root_page, section)
+    chunks = []
+    for number, start in enumerate(range(0, len(urls), SITEMAP_CHUNK_SIZE), start=1):
+        chunk_urls = urls[start : start + SITEMAP_CHUNK_SIZE]
+        chunks.append(
+            SitemapChunk(
+                locale=locale,
+                section=section,
+                number=number,
+                content=render_to_string("sitemap.xml", {"urlset": chunk_urls}),
+                url_count=len(chunk_urls),
+                lastmod=max((url["lastmod"] for url in chunk_urls if url.get("lastmod")), default=None),
+            )
         )
 
+    SitemapChunk.objects.filter(locale=locale, section=section).delete()
+    SitemapChunk.objects.bulk_create(chunks)
+
+
+@transaction.atomic
+def generate_sitemaps(locales=None):
+    """
+    Regenerate all sections of the sitemaps of `locales`, or of all locales.
+    """
+    for locale in locales or locale_registry.locales.values():
+        root_page = get_sitemap_root(locale)
+        if root_page is None:
+            SitemapChunk.objects.filter(locale=locale).delete()
+            continue
+
+        sections = get_sitemap_sections(root_page)
+        SitemapChunk.objects.filter(locale=locale).exclude(section__in=sections).delete()
+        for section in sections:
+            generate_sitemap_section(locale, root_page, section)
+
+
+def mark_sitemap_outdated(locale, page=None):
+    """
+    Mark the section of the sitemap that `page` is in, or the whole sitemap
+    of `locale`, to be regenerated by the `update_sitemaps` command.
+    """
+    path = page.path if page else ""
+    now = timezone.now()
+    updated = SitemapUpdate.objects.filter(locale=locale, path=path).update(marked_at=now)
+    if not updated:
+        SitemapUpdate.objects.bulk_create(
+            [SitemapUpdate(locale=locale, path=path, marked_at=now)],
+            ignore_conflicts=True,
+        )
+
+
+def regenerate_outdated_sitemaps():
+    """
+    Regenerate each section of the sitemap that was marked as out of date
+    once, and return how many marks were processed. Marks of locales that
+    fail to regenerate stay, as do sections that are marked again while
+    they are being regenerated.
+    """
+    updates = list(SitemapUpdate.objects.select_related("locale"))
+
+    by_locale = {}
+    for update in updates:
+        by_locale.setdefault(update.locale, []).append(update)
+
+    processed = []
+    for locale, locale_updates in by_locale.items():
+        try:
+            update_sitemap_sections(locale, {update.path or None for update in locale_updates})
+        except Exception:
+            # Leave them marked, to be retried with the next run.
+            logger.exception(f"Failed to regenerate the sitemap of {locale}")
+            continue
+        processed.extend(locale_updates)
+
+    if processed:
+        SitemapUpdate.objects.filter(
+            reduce(or_, (Q(pk=update.pk, marked_at=update.marked_at) for update in processed))
+        ).delete()
+    return len(processed)
+
+
+def update_sitemap_sections(locale, paths):
+    """
+    Regenerate the sections of the sitemap of `locale` that the pages
+    at `paths` are in, or all of them if `paths` includes None.
+    """
+    root_page = get_sitemap_root(locale)
+    if root_page is None:
+        generate_sitemaps([locale])
+        return
+
+    section_path_length = (root_page.depth + 1) * Page.steplen
+    paths = {path for path in paths if path is None or path.startswith(root_page.path)}
+    if any(path is None or len(path) <= section_path_length for path in paths):
+        # Top level pages are sections of their own, which
+        # may have been added, renamed or unpublished.
+        generate_sitemaps([locale])
+        return
+
+    section_paths = {path[:section_path_length] for path in paths}
+    for section in Page.objects.filter(path__in=section_paths).values_list("slug", flat=True):
+        generate_sitemap_section(locale, root_page, section)
+
+
+def get_sitemap_chunks(locale):
+    return SitemapChunk.objects.filter(locale=locale).defer("content")
+
+
+def get_sitemap_index_entries(locales):
+    return [
+        {
+            "location": f"{SITEMAP_DOMAIN}/{locale.language_code}/{chunk.filename}",
+            "lastmod": chunk.lastmod,
+        }
+        for locale in locales
+        for chunk in get_sitemap_chunks(locale)
+    ]
+
 
 def sitemap(request, **kwargs):
-    sitemaps = {"wagtail": CustomSitemap(request)}
-    return sitemap_views.sitemap(request, sitemaps, **kwargs)
+    locale = locale_registry.get_active()
+    context = {"sitemaps": get_sitemap_index_entries([locale])}
+    return render(request, "sitemap-index.xml", context, content_type="text/xml")
 
 
-def sitemap_index(request):
-    context = {}
-    context["languages"] = [lang[0] for lang in settings.LANGUAGES]
-    context["domain"] = "https://foundation.mozilla.org"
+def sitemap_chunk(request, section, number):
+    chunk = SitemapChunk.objects.filter(locale=locale_registry.get_active(), section=section, number=number).first()
+    if chunk is None:
+        raise Http404
+
+    response = HttpResponse(chunk.content, content_type="application/xml")
+    if chunk.lastmod:
+        response["Last-Modified"] = http_date(chunk.lastmod.timestamp())
+    return response
 
+
+def sitemap_index(request):
+    locales = [
+        locale_registry.locales[language_code]
+        for language_code, _ in settings.LANGUAGES
+        if language_code in locale_registry.locales
+    ]
+    context = {"sitemaps": get_sitemap_index_entries(locales)}
     return render(request, "sitemap-index.xml", context, content_type="text/xml")
@@ -5,7 +5,6 @@ from django.contrib import admin
 from django.http import HttpResponse
 from django.shortcuts import render
 from django.urls import include, path, re_path
-from django.views.decorators.cache import cache_page
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import TemplateView
 from django.views.generic.base import RedirectView
@@ -25,7 +24,7 @@ from networkapi.wagtailcustomization.image_url_tag_urls import (
 )
 from networkapi.wagtailpages.rss import AtomFeed, RSSFeed
 
-from .sitemaps import sitemap, sitemap_index
+from .sitemaps import HOME_SECTION, sitemap, sitemap_chunk, sitemap_index
 
 # from wagtail.core import urls as wagtail_urls
 from .utility import watail_core_url_override as wagtail_urls
@@ -140,7 +139,9 @@ urlpatterns += i18n_patterns(
     *foundation_redirects(),
     # wagtail-managed data
     re_path(r"", include(wagtail_urls)),
-    path("sitemap.xml", cache_page(86400)(sitemap)),
+    path("sitemap.xml", sitemap),
+    path("sitemap-<int:number>.xml", sitemap_chunk, {"section": HOME_SECTION}),
+    path("sitemap-<str:section>-<int:number>.xml", sitemap_chunk),
 )
 
 if settings.USE_S3 is not True:
@@ -0,0 +1,34 @@
+"""
+Version tokens for groups of cached values.
+
+Cached values that can't be deleted one key at a time, like everything
+derived from the page tree, or data that every process keeps in memory,
+include a version token from the shared cache in their keys, or compare it
+to the one they were loaded with. Bumping the token replaces it, which
+leaves every value cached with the old one to expire unused.
+
+Tokens are timestamps rather than counters, so that a token that was evicted
+from the cache can never bring back values cached with an earlier one.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def get_cache_version(key):
+    """
+    Return the version token stored at `key`, storing a new one if there is
+    none. Returns None if the cache does not keep it, e.g. a dummy cache.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(*keys):
+    """
+    Replace the version tokens stored at `keys` with a new one.
+    """
+    cache.set_many({key: time.time_ns() for key in keys}, None)
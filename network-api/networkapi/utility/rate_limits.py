@@ -0,0 +1,218 @@
+"""
+Sliding window rate limits.
+
+A `RateLimiter` allows a number of hits per key (such as a client IP and the
+thing being posted to) in a period, as configured by a rate setting like
+`"200/hour"`. Hits are counted per fixed window, and the count of the previous
+window is weighted by how much of it still overlaps the sliding window, which
+approximates a true sliding window without storing every hit.
+
+When the default cache is Redis, counts are kept in Redis, and checked and
+incremented in one round trip by a Lua script, so that limits hold across
+processes. Otherwise they are kept in the memory of each process, which is
+good enough for development. If Redis cannot be reached, hits are allowed.
+"""
+import functools
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+RATE_PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+RATE_RE = re.compile(r"^\s*(?P<count>\d+)\s*/\s*(?P<multiplier>\d*)\s*(?P<period>[smhd])[a-z]*\s*$")
+
+REDIS_CACHE_BACKEND = "django_redis.cache.RedisCache"
+
+# Counts the hit in the current window, unless the weighted count of the
+# current and previous windows has reached the limit. Returns 1 if allowed.
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call("GET", KEYS[1]) or "0")
+local previous = tonumber(redis.call("GET", KEYS[2]) or "0")
+if previous * tonumber(ARGV[2]) + current >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call("INCR", KEYS[1])
+redis.call("EXPIRE", KEYS[1], ARGV[3])
+return 1
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def parse_rate(rate):
+    """
+    Parse a rate like `"200/hour"` or `"5/10m"` into a `(count, seconds)`
+    tuple, or return None if `rate` is empty, which disables the limit.
+    """
+    if not rate:
+        return None
+
+    match = RATE_RE.match(rate)
+    if match is None:
+        raise ValueError(f"Invalid rate: {rate!r}")
+    period = int(match["multiplier"] or 1) * RATE_PERIODS[match["period"]]
+    return int(match["count"]), period
+
+
+class LocalMemoryBackend:
+    """
+    Window counts kept in the memory of this process.
+    """
+
+    # Counts of past windows are dropped once there are this many.
+    max_entries = 10000
+
+    def __init__(self):
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def hit(self, key, limit, period, now):
+        window = int(now // period)
+        previous_weight = 1 - (now % period) / period
+
+        with self.lock:
+            current = self.counts.get((key, window), 0)
+            previous = self.counts.get((key, window - 1), 0)
+            if previous * previous_weight + current >= limit:
+                return False
+
+            if len(self.counts) >= self.max_entries:
+                self.counts = {entry: count for entry, count in self.counts.items() if entry[1] >= window - 1}
+            self.counts[(key, window)] = current + 1
+            return True
+
+    def clear(self):
+        with self.lock:
+            self.counts = {}
+
+
+class RedisBackend:
+    """
+    Window counts kept in Redis, shared by all processes.
+    """
+
+    def __init__(self, connection):
+        self.script = connection.register_script(SLIDING_WINDOW_SCRIPT)
+
+    def hit(self, key, limit, period, now):
+        from redis.exceptions import RedisError
+
+        window = int(now // period)
+        previous_weight = 1 - (now % period) / period
+        try:
+            allowed = self.script(
+                keys=[f"{key}:{window}", f"{key}:{window - 1}"],
+                args=[limit, previous_weight, period * 2],
+            )
+        except RedisError as exception:
+            logger.warning("Could not check rate limit for %s: %s", key, exception)
+            return True
+        return bool(allowed)
+
+    def clear(self):
+        pass
+
+
+_redis_backend = None
+_redis_backend_lock = threading.Lock()
+
+
+def get_redis_backend():
+    global _redis_backend
+    with _redis_backend_lock:
+        if _redis_backend is None:
+            from django_redis import get_redis_connection
+
+            _redis_backend = RedisBackend(get_redis_connection("default"))
+        return _redis_backend
+
+
+class RateLimiter:
+    """
+    Limit hits per key to the rate in the `rate_setting` setting.
+    """
+
+    def __init__(self, name, rate_setting):
+        self.name = name
+        self.rate_setting = rate_setting
+        self.local_backend = LocalMemoryBackend()
+
+    @property
+    def rate(self):
+        return parse_rate(getattr(settings, self.rate_setting))
+
+    def get_backend(self):
+        if settings.CACHES["default"]["BACKEND"] == REDIS_CACHE_BACKEND:
+            return get_redis_backend()
+        return self.local_backend
+
+    def get_key(self, key_parts):
+        return ":".join(["ratelimit", self.name, *(str(part) for part in key_parts)])
+
+    def hit(self, *key_parts):
+        """
+        Count a hit for the key made up of `key_parts`, and
+        return whether it is within the rate limit.
+        """
+        rate = self.rate
+        if rate is None:
+            return True
+
+        limit, period = rate
+        return self.get_backend().hit(self.get_key(key_parts), limit, period, time.time())
+
+    def hit_request(self, request, *key_parts):
+        """
+        Count a hit for the client that made `request` and `key_parts`, and
+        return whether it is within the rate limit. Requests from clients whose
+        address isn't known are not limited, rather than all counted as one.
+        """
+        client_ip = get_client_ip(request)
+        if not client_ip:
+            return True
+        return self.hit(client_ip, *key_parts)
+
+    def clear(self):
+        self.local_backend.clear()
+
+
+def get_client_ip(request):
+    """
+    Return the IP address of the client that made a request, or None if it
+    isn't known.
+
+    Behind a proxy that appends the client's address to `X-Forwarded-For`,
+    such as Heroku's router, `RATE_LIMIT_USE_X_FORWARDED_FOR` is set, and
+    `REMOTE_ADDR` is the proxy's address. Only the last forwarded address is
+    used, as clients can send the header themselves.
+    """
+    if settings.RATE_LIMIT_USE_X_FORWARDED_FOR:
+        forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        return forwarded_for.split(",")[-1].strip() or None
+    return request.META.get("REMOTE_ADDR") or None
+
+
+def too_many_requests(message="Too many requests"):
+    return HttpResponse(message, status=429, content_type="text/plain")
+
+
+def rate_limited(limiter):
+    """
+    Decorate a view to limit requests per client IP and view arguments.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not limiter.hit_request(request, *args, *kwargs.values()):
+                return too_many_requests()
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,200 @@
+"""
+Postgres full-text search.
+
+This extends Wagtail's Postgres search backend, which keeps a title, body and
+autocomplete tsvector per indexed object, with GIN indexes on all three:
+
+- Objects are indexed with the text search configuration for the language of
+  their locale, and searched with the one for the active language, so that
+  e.g. German pages are stemmed as German. Languages that Postgres has no
+  configuration for use "simple", which doesn't stem at all.
+- Fields are weighted by what they are rather than by how their boosts
+  compare to those of every other model: the object's own title is weighted
+  A, names of related topics, tags and authors, boosted above 4, B, intros
+  and descriptions, boosted up to 4, C, and everything else, like the body, D.
+- The last term of a query matches as a prefix, unless searching with
+  `partial_match=False`, so that results show up while a word is typed.
+- Search results count themselves with a window function in the query that
+  fetches them, instead of with a second query. `SearchResultsPaginator`
+  fetches the page before counting to make use of that.
+
+After changing the configurations or weights, queue every indexed object for
+the `update_search_index` worker in a data migration, as
+`wagtailpages.0079_queue_search_reindex` does, so that the index is rebuilt
+without anyone having to run `./manage.py update_index` by hand.
+"""
+from django.core import paginator
+from django.db import connection
+from django.db.models import Count, Window
+from django.utils import translation
+from wagtail.search.backends.database import SearchBackend as DatabaseSearchBackend
+from wagtail.search.backends.database.postgres import postgres
+from wagtail.search.index import SearchField
+
+from networkapi.wagtailpages.locale_registry import locale_registry
+
+TITLE_WEIGHT = "A"
+RELATED_WEIGHT = "B"
+INTRO_WEIGHT = "C"
+BODY_WEIGHT = "D"
+
+INTRO_MAX_BOOST = 4
+
+# ts_rank weights for D, C, B and A.
+RANK_WEIGHTS = "{0.1,0.2,0.4,1.0}"
+
+DEFAULT_SEARCH_CONFIG = "simple"
+
+TOTAL_FIELD = "_search_total"
+
+
+class ObjectIndexer(postgres.ObjectIndexer):
+    def __init__(self, obj, backend):
+        super().__init__(obj, backend)
+        self.config = backend.get_config_for_locale_id(getattr(obj, "locale_id", None))
+
+    def get_weight(self, obj, field):
+        if obj is self.obj and field.field_name == "title":
+            return TITLE_WEIGHT
+        boost = field.boost or 1
+        if boost > INTRO_MAX_BOOST:
+            return RELATED_WEIGHT
+        if boost > 1:
+            return INTRO_WEIGHT
+        return BODY_WEIGHT
+
+    def prepare_field(self, obj, field):
+        if isinstance(field, SearchField):
+            yield (field, self.get_weight(obj, field), self.prepare_value(field.get_value(obj)))
+        else:
+            yield from super().prepare_field(obj, field)
+
+
+class Index(postgres.Index):
+    def add_items(self, model, objs):
+        if not model.get_search_fields():
+            return
+
+        indexers = [ObjectIndexer(obj, self.backend) for obj in objs]
+        if indexers:
+            content_type_pk = postgres.get_content_type_pk(model)
+            update_method = self.add_items_upsert if self._enable_upsert else self.add_items_update_then_create
+            update_method(content_type_pk, indexers)
+
+
+class SearchTotalMixin:
+    def search(self, config, start, stop, score_field=None, total_field=None):
+        queryset = super().search(config, None, None, score_field=score_field)
+        if total_field is not None:
+            queryset = queryset.annotate(**{total_field: Window(Count("*"))})
+        return queryset[start:stop]
+
+
+class PostgresSearchQueryCompiler(SearchTotalMixin, postgres.PostgresSearchQueryCompiler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sql_weights = RANK_WEIGHTS
+        self.LAST_TERM_IS_PREFIX = self.partial_match
+        self.total = None
+
+    def get_config(self, backend):
+        return backend.get_config_for_language(translation.get_language())
+
+
+class PostgresAutocompleteQueryCompiler(SearchTotalMixin, postgres.PostgresAutocompleteQueryCompiler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sql_weights = RANK_WEIGHTS
+        self.total = None
+
+
+class PostgresSearchResults(postgres.PostgresSearchResults):
+    def get_queryset(self, for_count=False):
+        if for_count:
+            return super().get_queryset(for_count=True)
+
+        return self.query_compiler.search(
+            self.query_compiler.get_config(self.backend),
+            self.start,
+            self.stop,
+            score_field=self._score_field,
+            total_field=TOTAL_FIELD,
+        )
+
+    def _do_search(self):
+        results = super()._do_search()
+        if results:
+            # Clones of these results share the query compiler, so
+            # the total is known to all of them, and to the paginator.
+            self.query_compiler.total = getattr(results[0], TOTAL_FIELD, None)
+        return results
+
+    def _do_count(self):
+        if self.query_compiler.total is not None:
+            return self.query_compiler.total
+        return super()._do_count()
+
+
+class PostgresSearchBackend(postgres.PostgresSearchBackend):
+    query_compiler_class = PostgresSearchQueryCompiler
+    autocomplete_query_compiler_class = PostgresAutocompleteQueryCompiler
+    results_class = PostgresSearchResults
+
+    def __init__(self, params):
+        super().__init__(params)
+        self.locale_configs = {
+            language_code.lower(): config for language_code, config in params.get("LOCALE_SEARCH_CONFIGS", {}).items()
+        }
+        self.default_config = self.config or DEFAULT_SEARCH_CONFIG
+
+    def get_config_for_language(self, language_code):
+        # Django's language codes are lowercase, and Wagtail's locales'
+        # aren't. A regional variant falls back to its generic language.
+        language_code = (language_code or "").lower()
+        config = self.locale_configs.get(language_code) or self.locale_configs.get(language_code.split("-")[0])
+        return config or self.default_config
+
+    def get_config_for_locale_id(self, locale_id):
+        for language_code, locale in locale_registry.locales.items():
+            if locale.id == locale_id:
+                return self.get_config_for_language(language_code)
+        return self.get_config_for_language(None)
+
+    def get_index_for_model(self, model, db_alias=None):
+        return Index(self, db_alias)
+
+
+def SearchBackend(params):
+    # Other databases are left to the database backend's fallbacks.
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend(params)
+    return DatabaseSearchBackend(params)
+
+
+class SearchResultsPaginator(paginator.Paginator):
+    """
+    A paginator that fetches a page before counting the objects, so that
+    search results can count themselves while fetching it. Orphans are not
+    supported.
+    """
+
+    def page(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise paginator.PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise paginator.EmptyPage("That page number is less than 1")
+
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom : bottom + self.per_page])
+        number = self.validate_number(number)
+        return self._get_page(object_list, number, self)
+
+    def get_page(self, number):
+        try:
+            return self.page(number)
+        except paginator.PageNotAnInteger:
+            return self.page(1)
+        except paginator.EmptyPage:
+            return self.page(self.num_pages)
@@ -0,0 +1,157 @@
+import os
+import unittest
+import uuid
+
+import redis
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from networkapi.utility.cache_versions import bump_cache_version, get_cache_version
+from networkapi.utility.rate_limits import (
+    SLIDING_WINDOW_SCRIPT,
+    RateLimiter,
+    RedisBackend,
+    get_client_ip,
+    parse_rate,
+)
+
+
+class RecordingRedisConnection:
+    """
+    Stands in for a Redis connection, recording how the sliding window
+    script is called, and answering with `result`, or raising it.
+    """
+
+    def __init__(self, result=1):
+        self.result = result
+        self.scripts = []
+        self.calls = []
+
+    def register_script(self, script):
+        self.scripts.append(script)
+
+        def run(keys, args):
+            self.calls.append((keys, args))
+            if isinstance(self.result, Exception):
+                raise self.result
+            return self.result
+
+        return run
+
+
+class TestRateLimits(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("200/hour"), (200, 60 * 60))
+        self.assertEqual(parse_rate("5/10m"), (5, 10 * 60))
+        self.assertIsNone(parse_rate(""))
+        with self.assertRaises(ValueError):
+            parse_rate("often")
+
+    @override_settings(RATE_LIMIT_USE_X_FORWARDED_FOR=False)
+    def test_client_ip_is_the_remote_address(self):
+        request = self.factory.post("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="10.0.0.2")
+
+        self.assertEqual(get_client_ip(request), "10.0.0.1")
+
+    @override_settings(RATE_LIMIT_USE_X_FORWARDED_FOR=True)
+    def test_client_ip_behind_a_proxy(self):
+        # Clients can send X-Forwarded-For themselves, so only
+        # the address the proxy appended to it is used.
+        request = self.factory.post("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="1.2.3.4, 10.0.0.2")
+
+        self.assertEqual(get_client_ip(request), "10.0.0.2")
+
+    @override_settings(RATE_LIMIT_USE_X_FORWARDED_FOR=True, BUYERS_GUIDE_VOTE_RATE_LIMIT="1/hour")
+    def test_requests_without_a_client_ip_are_not_limited(self):
+        limiter = RateLimiter("test", "BUYERS_GUIDE_VOTE_RATE_LIMIT")
+        request = self.factory.post("/", REMOTE_ADDR="10.0.0.1")
+
+        self.assertIsNone(get_client_ip(request))
+        self.assertTrue(limiter.hit_request(request, 1))
+        self.assertTrue(limiter.hit_request(request, 1))
+
+    @override_settings(RATE_LIMIT_USE_X_FORWARDED_FOR=True, BUYERS_GUIDE_VOTE_RATE_LIMIT="1/hour")
+    def test_forwarded_clients_are_limited_separately(self):
+        limiter = RateLimiter("test", "BUYERS_GUIDE_VOTE_RATE_LIMIT")
+
+        def request(forwarded_for):
+            return self.factory.post("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=forwarded_for)
+
+        self.assertTrue(limiter.hit_request(request("10.0.0.2"), 1))
+        self.assertFalse(limiter.hit_request(request("10.0.0.2"), 1))
+        self.assertTrue(limiter.hit_request(request("10.0.0.3"), 1))
+
+    def test_redis_backend_runs_the_sliding_window_script(self):
+        connection = RecordingRedisConnection(result=0)
+        backend = RedisBackend(connection)
+
+        # Halfway through the second hour-long window.
+        allowed = backend.hit("ratelimit:test:10.0.0.1", 200, 3600, 3600 * 1.5)
+
+        self.assertFalse(allowed)
+        self.assertEqual(connection.scripts, [SLIDING_WINDOW_SCRIPT])
+        self.assertEqual(
+            connection.calls,
+            [(["ratelimit:test:10.0.0.1:1", "ratelimit:test:10.0.0.1:0"], [200, 0.5, 7200])],
+        )
+
+    def test_redis_backend_allows_hits_when_redis_is_down(self):
+        backend = RedisBackend(RecordingRedisConnection(result=RedisConnectionError("Down")))
+
+        with self.assertLogs("networkapi.utility.rate_limits", "WARNING"):
+            self.assertTrue(backend.hit("ratelimit:test:10.0.0.1", 200, 3600, 3600 * 1.5))
+
+
+@unittest.skipUnless(os.environ.get("REDIS_URL"), "Needs a Redis server, set in REDIS_URL")
+class TestRedisSlidingWindow(SimpleTestCase):
+    def setUp(self):
+        self.connection = redis.Redis.from_url(os.environ["REDIS_URL"])
+        self.backend = RedisBackend(self.connection)
+        self.key = f"ratelimit:test:{uuid.uuid4()}"
+        self.addCleanup(lambda: self.connection.delete(f"{self.key}:0", f"{self.key}:1", f"{self.key}:2"))
+
+    def test_hits_are_limited_per_window(self):
+        hits = [self.backend.hit(self.key, 2, 3600, 10) for _ in range(3)]
+
+        self.assertEqual(hits, [True, True, False])
+        self.assertGreater(self.connection.ttl(f"{self.key}:0"), 3600)
+
+    def test_previous_window_is_weighted(self):
+        for _ in range(2):
+            self.backend.hit(self.key, 2, 3600, 10)
+
+        # A quarter into the next window, 3/4 of the previous window's
+        # 2 hits still count, which leaves room for one more hit.
+        hits = [self.backend.hit(self.key, 2, 3600, 3600 * 1.25) for _ in range(2)]
+        self.assertEqual(hits, [True, False])
+
+        # Near the end of the next window, they barely count.
+        self.assertTrue(self.backend.hit(self.key, 2, 3600, 3600 * 1.99))
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestCacheVersions(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_version_is_created_once(self):
+        version = get_cache_version("test_version")
+
+        self.assertIsNotNone(version)
+        self.assertEqual(get_cache_version("test_version"), version)
+
+    def test_bump_replaces_versions(self):
+        versions = [get_cache_version("test_version"), get_cache_version("other_version")]
+
+        bump_cache_version("test_version", "other_version")
+
+        self.assertNotEqual(get_cache_version("test_version"), versions[0])
+        self.assertNotEqual(get_cache_version("other_version"), versions[1])
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+    def test_no_version_without_a_cache(self):
+        self.assertIsNone(get_cache_version("test_version"))
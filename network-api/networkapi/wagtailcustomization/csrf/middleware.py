@@ -6,7 +6,7 @@ Ever other page should accept CSRF as normal.
 from django.middleware.csrf import CsrfViewMiddleware
 from wagtail.core.views import serve
 
-from networkapi.wagtailpages.pagemodels.buyersguide.products import ProductPage
+from networkapi.wagtailpages.pagemodels.buyersguide.product_slugs import is_product_slug
 
 
 class CustomCsrfViewMiddleware(CsrfViewMiddleware):
@@ -17,15 +17,10 @@ class CustomCsrfViewMiddleware(CsrfViewMiddleware):
             # and if so, do not perform any CSRF validation
             path = request.path.rstrip("/").split("/").pop()  # ie general-percy-product
 
-            # Find the page
-            try:
-                page = ProductPage.objects.get(slug=path)
-            except (ProductPage.MultipleObjectsReturned, ProductPage.DoesNotExist):
-                return super().process_view(request, callback, callback_args, callback_kwargs)
-
-            # Do one last check that the page is in-fact an instance of a ProductPage
-            if isinstance(page, ProductPage):
-                # Page that had the POST request is infact a ProductPage
+            # Product slugs are kept in memory, so that POSTs to other pages
+            # don't need a database lookup, and translated products (which
+            # share their slug) are recognized as well.
+            if is_product_slug(path):
                 # Don't perform CSRF validation on ProductPages.
                 return None
 
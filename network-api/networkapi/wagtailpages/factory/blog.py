@@ -2,7 +2,7 @@ from datetime import timezone
 from random import choice
 
 from django.conf import settings
-from factory import Faker, LazyAttribute
+from factory import Faker, LazyAttribute, Sequence
 from factory.django import DjangoModelFactory
 from wagtail.core.models import Page as WagtailPage
 from wagtail_factories import PageFactory
@@ -103,6 +103,8 @@ class BlogPageTopicFactory(DjangoModelFactory):
     class Meta:
         model = BlogPageTopic
 
+    name = Sequence(lambda n: f"Topic {n}")
+
 
 def generate(seed):
     reseed(seed)
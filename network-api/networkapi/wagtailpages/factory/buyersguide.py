@@ -115,7 +115,11 @@ class ProductPageVotesFactory(DjangoModelFactory):
     class Meta:
         model = pagemodels.ProductPageVotes
 
-    vote_bins = LazyFunction(lambda: ",".join([str(randint(1, 50)) for x in range(0, 5)]))
+    bin_0 = LazyFunction(lambda: randint(1, 50))
+    bin_1 = LazyFunction(lambda: randint(1, 50))
+    bin_2 = LazyFunction(lambda: randint(1, 50))
+    bin_3 = LazyFunction(lambda: randint(1, 50))
+    bin_4 = LazyFunction(lambda: randint(1, 50))
 
 
 class ProductPageFactory(PageFactory):
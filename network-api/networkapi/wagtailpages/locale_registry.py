@@ -0,0 +1,69 @@
+"""
+In-process registry of all Locales, by language code.
+
+Almost every request needs one or more Locales: the default locale, and the
+locale for the request's language. Rather than querying for them every time,
+every process keeps all Locales in memory, and reloads them only when the
+version token in the shared cache changes. Saving or deleting a Locale
+replaces that token.
+"""
+
+from django.conf import settings
+from django.utils import translation
+from wagtail.core.models import Locale
+from wagtail.core.utils import get_supported_content_language_variant
+
+from networkapi.utility.cache_versions import bump_cache_version, get_cache_version
+
+LOCALE_REGISTRY_VERSION_KEY = "locale_registry_version"
+
+
+class LocaleRegistry:
+    def __init__(self):
+        self._locales = None
+        self._version = None
+
+    def get_version(self):
+        return get_cache_version(LOCALE_REGISTRY_VERSION_KEY)
+
+    def load(self):
+        return {locale.language_code: locale for locale in Locale.objects.all()}
+
+    @property
+    def locales(self):
+        version = self.get_version()
+        # Without a shared version, e.g. with a dummy cache, always reload.
+        if self._locales is None or version is None or version != self._version:
+            self._locales = self.load()
+            self._version = version
+        return self._locales
+
+    def get(self, language_code):
+        """
+        Return the Locale for a language code, falling back to
+        the default locale if there is no such Locale.
+        """
+        locales = self.locales
+        locale = locales.get(language_code) or locales.get(settings.LANGUAGE_CODE)
+        if locale is None:
+            raise Locale.DoesNotExist(f"There is no Locale for {language_code} or the default language.")
+        return locale
+
+    def get_default(self):
+        return self.get(settings.LANGUAGE_CODE)
+
+    def get_active(self):
+        """
+        Return the Locale for the active language, like `Locale.get_active()`.
+        """
+        try:
+            return self.get(get_supported_content_language_variant(translation.get_language()))
+        except LookupError:
+            return self.get_default()
+
+
+locale_registry = LocaleRegistry()
+
+
+def invalidate_locale_registry():
+    bump_cache_version(LOCALE_REGISTRY_VERSION_KEY)
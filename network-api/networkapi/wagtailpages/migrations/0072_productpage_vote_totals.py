@@ -0,0 +1,23 @@
+# Generated by Django 3.2.16 on 2026-10-18 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailpages", "0071_buyersguidepage_remove_outdated_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productpage",
+            name="average_creepiness",
+            field=models.FloatField(db_index=True, default=50, editable=False),
+        ),
+        migrations.AddField(
+            model_name="productpage",
+            name="total_votes",
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+    ]
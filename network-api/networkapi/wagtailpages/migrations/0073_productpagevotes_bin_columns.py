@@ -0,0 +1,68 @@
+# Generated by Django 3.2.16 on 2026-10-18 16:55
+
+from django.db import migrations, models
+
+BIN_FIELDS = ["bin_0", "bin_1", "bin_2", "bin_3", "bin_4"]
+
+
+def copy_vote_bins_to_columns(apps, schema_editor):
+    ProductPageVotes = apps.get_model("wagtailpages", "ProductPageVotes")
+
+    votes_to_update = []
+    for votes in ProductPageVotes.objects.all().iterator():
+        for field_name, value in zip(BIN_FIELDS, votes.vote_bins.split(",")):
+            setattr(votes, field_name, int(value))
+        votes_to_update.append(votes)
+
+    ProductPageVotes.objects.bulk_update(votes_to_update, BIN_FIELDS, batch_size=500)
+
+
+def copy_vote_columns_to_bins(apps, schema_editor):
+    ProductPageVotes = apps.get_model("wagtailpages", "ProductPageVotes")
+
+    votes_to_update = []
+    for votes in ProductPageVotes.objects.all().iterator():
+        votes.vote_bins = ",".join(str(getattr(votes, field_name)) for field_name in BIN_FIELDS)
+        votes_to_update.append(votes)
+
+    ProductPageVotes.objects.bulk_update(votes_to_update, ["vote_bins"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailpages", "0072_productpage_vote_totals"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productpagevotes",
+            name="bin_0",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="productpagevotes",
+            name="bin_1",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="productpagevotes",
+            name="bin_2",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="productpagevotes",
+            name="bin_3",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="productpagevotes",
+            name="bin_4",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(copy_vote_bins_to_columns, reverse_code=copy_vote_columns_to_bins),
+        migrations.RemoveField(
+            model_name="productpagevotes",
+            name="vote_bins",
+        ),
+    ]
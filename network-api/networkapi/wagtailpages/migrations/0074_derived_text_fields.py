@@ -0,0 +1,51 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:50
+
+from bs4 import BeautifulSoup
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def populate_derived_text(apps, schema_editor):
+    # Custom model methods are not available during migrations,
+    # so mimic what ArticlePage.full_clean() and ProductPage.full_clean() do.
+    ArticlePage = apps.get_model("wagtailpages", "ArticlePage")
+    ProductPage = apps.get_model("wagtailpages", "ProductPage")
+
+    articles = []
+    for article in ArticlePage.objects.all().iterator():
+        headers = []
+        for block in article.body.raw_data:
+            if block["type"] == "content":
+                soup = BeautifulSoup(str(block["value"]), "html.parser")
+                headers.extend(header.get_text() for header in soup.findAll("h2"))
+        article.page_titles = list({slugify(header): header for header in headers}.items())
+        articles.append(article)
+    ArticlePage.objects.bulk_update(articles, ["page_titles"], batch_size=500)
+
+    products = []
+    for product in ProductPage.objects.all().iterator():
+        first_paragraph = BeautifulSoup(product.blurb, "html.parser").find("p")
+        product.blurb_summary = first_paragraph.text if first_paragraph else ""
+        products.append(product)
+    ProductPage.objects.bulk_update(products, ["blurb_summary"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailpages", "0073_productpagevotes_bin_columns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="articlepage",
+            name="page_titles",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name="productpage",
+            name="blurb_summary",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(populate_derived_text, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailcore", "0066_collection_management_permissions"),
+        ("wagtailpages", "0074_derived_text_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SitemapChunk",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("section", models.CharField(max_length=255)),
+                ("number", models.PositiveIntegerField()),
+                ("content", models.TextField()),
+                ("url_count", models.PositiveIntegerField(default=0)),
+                ("lastmod", models.DateTimeField(blank=True, null=True)),
+                (
+                    "locale",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="wagtailcore.locale"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["locale", "section", "number"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="sitemapchunk",
+            constraint=models.UniqueConstraint(fields=("locale", "section", "number"), name="unique_sitemap_chunk"),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:17
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def populate_topic_slugs(apps, schema_editor):
+    # Topics used to be looked up by slugify(name), so keep that as their slug.
+    # Names that slugify to the same slug in a locale get a numbered suffix,
+    # as they could not be told apart by their route before either. Names that
+    # slugify to nothing get the "topic" slug, as in BlogPageTopic.save().
+    BlogPageTopic = apps.get_model("wagtailpages", "BlogPageTopic")
+
+    topics = []
+    slugs = set()
+    for topic in BlogPageTopic.objects.order_by("locale_id", "pk"):
+        slug = base_slug = slugify(topic.name) or "topic"
+        suffix = 1
+        while (topic.locale_id, slug) in slugs:
+            suffix += 1
+            slug = f"{base_slug[:45]}-{suffix}"
+        slugs.add((topic.locale_id, slug))
+        topic.slug = slug
+        topics.append(topic)
+    BlogPageTopic.objects.bulk_update(topics, ["slug"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailpages", "0075_sitemapchunk"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpagetopic",
+            name="slug",
+            field=models.SlugField(blank=True, editable=False),
+        ),
+        migrations.RunPython(populate_topic_slugs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="blogpagetopic",
+            constraint=models.UniqueConstraint(fields=("locale", "slug"), name="unique_blog_topic_slug_per_locale"),
+        ),
+    ]
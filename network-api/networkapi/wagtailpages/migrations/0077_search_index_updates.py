@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("wagtailpages", "0076_blog_topic_slugs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchIndexUpdate",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("object_id", models.CharField(max_length=255)),
+                ("changed_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("indexed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="contenttypes.contenttype"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="searchindexupdate",
+            index=models.Index(
+                condition=models.Q(("indexed_at__isnull", True)),
+                fields=["changed_at"],
+                name="search_index_update_pending",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="searchindexupdate",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "object_id"), name="unique_search_index_update"
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-18 23:10
+
+from django.db import migrations
+
+BIN_FIELDS = ["bin_0", "bin_1", "bin_2", "bin_3", "bin_4"]
+DEFAULT_CREEPINESS = 50
+
+
+def backfill_vote_totals(apps, schema_editor):
+    # Custom model methods are not available during migrations,
+    # so mimic what ProductPage.update_vote_totals() does.
+    ProductPage = apps.get_model("wagtailpages", "ProductPage")
+
+    products_to_update = []
+    for product in ProductPage.objects.select_related("votes").iterator():
+        if product.votes is None:
+            continue
+
+        product.total_votes = sum(getattr(product.votes, field_name) for field_name in BIN_FIELDS)
+        if product.total_votes:
+            product.average_creepiness = product.creepiness_value / product.total_votes
+        else:
+            product.average_creepiness = DEFAULT_CREEPINESS
+        products_to_update.append(product)
+
+    ProductPage.objects.bulk_update(products_to_update, ["total_votes", "average_creepiness"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailpages", "0077_search_index_updates"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_vote_totals, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 3.2.16 on 2026-10-18 23:25
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def queue_search_reindex(apps, schema_editor):
+    # Objects indexed before the per-locale text search configurations and
+    # field weights were introduced keep their old index entries until they
+    # are indexed again, so queue all of them for the update_search_index worker.
+    IndexEntry = apps.get_model("wagtailsearch", "IndexEntry")
+    Page = apps.get_model("wagtailcore", "Page")
+    SearchIndexUpdate = apps.get_model("wagtailpages", "SearchIndexUpdate")
+
+    now = timezone.now()
+    SearchIndexUpdate.objects.update(changed_at=now, indexed_at=None)
+
+    keys = {(content_type_id, str(pk)) for content_type_id, pk in Page.objects.values_list("content_type_id", "pk")}
+    keys.update(IndexEntry.objects.values_list("content_type_id", "object_id"))
+    SearchIndexUpdate.objects.bulk_create(
+        [
+            SearchIndexUpdate(content_type_id=content_type_id, object_id=object_id, changed_at=now)
+            for content_type_id, object_id in keys
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailcore", "0066_collection_management_permissions"),
+        ("wagtailsearch", "0006_customise_indexentry"),
+        ("wagtailpages", "0078_backfill_product_vote_totals"),
+    ]
+
+    operations = [
+        migrations.RunPython(queue_search_reindex, reverse_code=migrations.RunPython.noop),
+    ]
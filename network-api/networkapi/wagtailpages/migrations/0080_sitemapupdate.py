@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-18 23:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailcore", "0066_collection_management_permissions"),
+        ("wagtailpages", "0079_queue_search_reindex"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SitemapUpdate",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("path", models.CharField(blank=True, max_length=255)),
+                ("marked_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "locale",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="wagtailcore.locale"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="sitemapupdate",
+            constraint=models.UniqueConstraint(fields=("locale", "path"), name="unique_sitemap_update"),
+        ),
+    ]
@@ -84,6 +84,8 @@ from .pagemodels.research_hub.relations import (
     ResearchLandingPageFeaturedResearchTopicRelation,
 )
 from .pagemodels.research_hub.taxonomies import ResearchRegion, ResearchTopic
+from .pagemodels.search_index import SearchIndexUpdate
+from .pagemodels.sitemaps import SitemapChunk, SitemapUpdate
 from .pagemodels.youtube import (
     YoutubeRegrets2021Page,
     YoutubeRegrets2022Page,
@@ -0,0 +1,136 @@
+"""
+Navigation tree for mini-sites and primary pages.
+
+Mini-site sidebars, mini-site horizontal navs and primary page menus list the
+menu-listable pages below some root page, a few levels deep. Rather than
+walking the tree one page at a time, the whole subtree is loaded with one
+path-prefix query, together with the `header` of every page and all view
+restrictions, and assembled in memory.
+
+Trees shown to anonymous users are cached per root and language. Publishing,
+unpublishing or deleting a page only throws away the trees of its ancestors
+and itself, which are the only ones it can be in, by bumping a version token
+per root path. Moving a page or changing a view restriction throws away all
+trees. Trees shown to authenticated users include drafts, which change on
+every save, so they are not cached.
+"""
+
+from django.core.cache import cache
+from django.utils.translation import get_language, gettext
+from wagtail.core.models import Page, PageViewRestriction
+
+from networkapi.utility.cache_versions import bump_cache_version, get_cache_version
+
+NAV_TREE_CACHE_TIMEOUT = 60 * 60 * 24
+NAV_TREE_VERSION_KEY = "nav_tree_version"
+
+
+def get_nav_tree_version_key(path):
+    return f"{NAV_TREE_VERSION_KEY}_{path}"
+
+
+def get_nav_tree_cache_key(root, max_depth):
+    version = get_cache_version(NAV_TREE_VERSION_KEY)
+    root_version = get_cache_version(get_nav_tree_version_key(root.path))
+    return f"nav_tree_{root.pk}_{get_language()}_{max_depth}_{version}_{root_version}"
+
+
+def get_headers(pages):
+    """
+    Return a mapping of page id to `header`, with one query for
+    every page type in `pages` that has a header field.
+    """
+    page_ids_by_model = {}
+    for page in pages:
+        model = page.specific_class
+        if model is not None and any(field.name == "header" for field in model._meta.fields):
+            page_ids_by_model.setdefault(model, []).append(page.pk)
+
+    headers = {}
+    for model, page_ids in page_ids_by_model.items():
+        headers.update(model.objects.filter(pk__in=page_ids).values_list("pk", "header"))
+    return headers
+
+
+def build_nav_tree(root, authenticated=False, max_depth=2):
+    """
+    Return the menu entries for `root` and its menu-listable descendants,
+    in depth-first order, down to `max_depth` levels below the root.
+    """
+    restrictions = list(
+        PageViewRestriction.objects.order_by("pk").values_list("page_id", "page__path", "restriction_type")
+    )
+
+    pages = Page.objects.descendant_of(root, inclusive=True).filter(depth__lte=root.depth + max_depth).order_by("path")
+
+    # Do not show draft/private pages to users who are
+    # not logged into the CMS itself.
+    restricted_paths = [path for _, path, _ in restrictions]
+    included_paths = set()
+    nodes = []
+    for page in pages:
+        if page.pk != root.pk:
+            if page.path[: -Page.steplen] not in included_paths or not page.show_in_menus:
+                continue
+            if not authenticated:
+                if not page.live or any(page.path.startswith(path) for path in restricted_paths):
+                    continue
+        included_paths.add(page.path)
+        nodes.append(page)
+
+    # A page's view restriction is the first one on the page itself or any of its
+    # ancestors, where aliases use the restrictions of the page they are an alias of.
+    ancestor_ids = []
+    if restrictions:
+        ancestor_ids = [alias_of_id or pk for pk, alias_of_id in root.get_ancestors().values_list("pk", "alias_of_id")]
+
+    lineage = {}
+    headers = get_headers(nodes)
+    entries = []
+    for page in nodes:
+        page_ids = lineage.get(page.path[: -Page.steplen], ancestor_ids) + [page.alias_of_id or page.pk]
+        lineage[page.path] = page_ids
+
+        depth = page.depth - root.depth
+        title = headers.get(page.pk) or page.title
+        entries.append(
+            {
+                "page": page,
+                "menu_title": title if depth > 0 else gettext("Overview"),
+                "depth": depth,
+                "restriction": next(
+                    (restriction_type for page_id, _, restriction_type in restrictions if page_id in page_ids),
+                    None,
+                ),
+            }
+        )
+
+    return entries
+
+
+def get_nav_tree(root, authenticated=False, max_depth=2):
+    if authenticated:
+        return build_nav_tree(root, authenticated, max_depth)
+
+    cache_key = get_nav_tree_cache_key(root, max_depth)
+    entries = cache.get(cache_key)
+
+    if entries is None:
+        entries = build_nav_tree(root, authenticated, max_depth)
+        cache.set(cache_key, entries, NAV_TREE_CACHE_TIMEOUT)
+
+    return entries
+
+
+def invalidate_nav_trees(*pages):
+    """
+    Throw away the trees that any of `pages` can be in, which are
+    those of their ancestors and themselves, or all trees if no
+    pages are given.
+    """
+    if not pages:
+        bump_cache_version(NAV_TREE_VERSION_KEY)
+        return
+
+    paths = {page.path[:end] for page in pages for end in range(Page.steplen, len(page.path) + 1, Page.steplen)}
+    bump_cache_version(*[get_nav_tree_version_key(path) for path in paths])
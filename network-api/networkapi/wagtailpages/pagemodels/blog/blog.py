@@ -17,7 +17,7 @@ from wagtail.admin.edit_handlers import (
 )
 from wagtail.core import blocks
 from wagtail.core.fields import StreamField
-from wagtail.core.models import Locale, Orderable, Page, TranslatableMixin
+from wagtail.core.models import Orderable, Page, TranslatableMixin
 from wagtail.core.rich_text import get_text_for_indexing
 from wagtail.images.edit_handlers import ImageChooserPanel
 from wagtail.search import index
@@ -30,6 +30,7 @@ from networkapi.wagtailpages.pagemodels.profiles import Profile
 from ...utils import (
     TitleWidget,
     get_content_related_by_tag,
+    get_default_locale,
     set_main_site_nav_information,
 )
 from .. import customblocks
@@ -281,7 +282,7 @@ class BlogPage(FoundationMetadataPageMixin, Page):
         context["related_posts"] = list(filter(None, related_posts))
 
         # Pull this object specifically using the English page title
-        default_locale = Locale.objects.get(language_code=settings.LANGUAGE_CODE)
+        (default_locale, default_locale_id) = get_default_locale()
         blog_page = BlogIndexPage.objects.get(title__iexact="Blog", locale=default_locale)
 
         if blog_page:
@@ -298,28 +299,14 @@ class BlogPage(FoundationMetadataPageMixin, Page):
         previewing does not save the amended list into the model, as previews
         shouldn't change the model in any way.
         """
-        additional_posts = list()
-        post_count = self.related_posts.all().count()
-        missing_count = self.related_post_count - post_count
-
-        if missing_count == 0:
-            return additional_posts
-
-        related_posts = get_content_related_by_tag(self)
-
-        if len(related_posts) > 0:
-            # Add as many posts as there are missing, or until
-            # we run out of related posts, whichever comes first.
-            for post in related_posts:
-                if missing_count == 0:
-                    break
-                if self.related_posts.filter(related_post=post).count() > 0:
-                    # Make sure to skip over duplicates
-                    continue
-                additional_posts.append(post)
-                missing_count = missing_count - 1
-
-        return additional_posts
+        existing_ids = [post.related_post_id for post in self.related_posts.all()]
+        missing_count = self.related_post_count - len(existing_ids)
+
+        if missing_count <= 0:
+            return list()
+
+        # Skip over posts that are already related, so that we don't add duplicates.
+        return get_content_related_by_tag(self, result_count=missing_count, exclude=existing_ids)
 
     def ensure_related_posts(self):
         """
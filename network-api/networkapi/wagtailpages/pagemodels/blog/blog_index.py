@@ -1,7 +1,9 @@
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Union
 
 from django import http
+from django.conf import settings
 from django.core import paginator
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.forms import CheckboxSelectMultiple
@@ -17,10 +19,10 @@ from wagtail.admin.edit_handlers import (
 )
 from wagtail.contrib.routable_page.models import route
 from wagtail.core.fields import StreamField
-from wagtail.core.models import Locale
 from wagtail.core.models import Orderable as WagtailOrderable
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
+from networkapi.utility.search import SearchResultsPaginator
 from networkapi.wagtailpages.forms import BlogIndexPageForm
 from networkapi.wagtailpages.pagemodels import customblocks
 from networkapi.wagtailpages.pagemodels.profiles import Profile
@@ -31,13 +33,18 @@ from networkapi.wagtailpages.utils import (
     titlecase,
 )
 
-from ..index import IndexPage
-from .blog_topic import BlogPageTopic
+from ..index import IndexEntries, IndexPage
+from .blog_topic import (
+    BlogPageTopic,
+    get_blog_topic_for_slug,
+    get_blog_topic_translation,
+    get_blog_topics_by_slug,
+)
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
     from django.http import HttpRequest, HttpResponse
-    from wagtail.search.backends.database.fallback import DatabaseSearchResults
+    from wagtail.search.backends.base import BaseSearchResults
 
 
 class FeaturedBlogPages(WagtailOrderable, models.Model):
@@ -165,7 +172,7 @@ class BlogIndexPage(IndexPage):
         if not hasattr(self, "filtered"):
             featured = [feature.blog.localized.pk for feature in self.featured_pages.all()]
             featured.extend([feature.blog_page.localized.pk for feature in self.featured_video_post.all()])
-            entries = entries.exclude(pk__in=featured)
+            entries = entries.exclude_ids(featured)
 
         return entries
 
@@ -198,10 +205,7 @@ class BlogIndexPage(IndexPage):
         # then explicitly set all the metadata that can be localized, making
         # sure to use the localized topic for those fields:
         locale = get_locale_from_request(context["request"])
-        try:
-            localized_topic = topic.get_translation(locale)
-        except ObjectDoesNotExist:
-            localized_topic = topic
+        localized_topic = get_blog_topic_translation(topic, locale.id)
 
         context["index_intro"] = localized_topic.intro
         context["index_title"] = titlecase(f"{localized_topic.name} {self.title}")
@@ -221,9 +225,23 @@ class BlogIndexPage(IndexPage):
         # rather than with the localized topic. This might have something to do with
         # localization issues of the ParentalManyToManyField. So the pages need to be
         # localized, but not the topic.
-        entries = entries.specific().filter(pk__in=topic.blogpage_set.all())
+        cache_key = self.get_topic_cache_key(locale, topic.slug)
+        rows = cache.get(cache_key)
+        if rows is None:
+            rows = entries.filter_ids(topic.blogpage_set.values_list("pk", flat=True)).rows
+            cache.set(cache_key, rows, settings.INDEX_PAGE_CACHE_TIMEOUT)
 
-        return entries
+        return IndexEntries(rows)
+
+    def get_topic_cache_key(self, locale, topic_slug):
+        return f"{self.get_cache_key(locale)}_topic_{topic_slug}"
+
+    def clear_index_page_cache(self, locale):
+        super().clear_index_page_cache(locale)
+        (DEFAULT_LOCALE, DEFAULT_LOCALE_ID) = get_default_locale()
+        cache.delete_many(
+            [self.get_topic_cache_key(locale, topic_slug) for topic_slug in get_blog_topics_by_slug(DEFAULT_LOCALE_ID)]
+        )
 
     def set_seo_fields_from_topic(self, topic):
         if topic.title:
@@ -245,20 +263,7 @@ class BlogIndexPage(IndexPage):
     # helper function to resolve topic slugs to actual objects
     def get_topic_object_for_slug(self, topic_slug):
         (DEFAULT_LOCALE, DEFAULT_LOCALE_ID) = get_default_locale()
-
-        english_topics = BlogPageTopic.objects.filter(locale_id=DEFAULT_LOCALE_ID)
-
-        # We can't use .filter for @property fields,
-        # so we have to run through all topics =(
-        for blog_page_topic in english_topics:
-
-            if blog_page_topic.slug == topic_slug:
-                topic_object = blog_page_topic
-                break
-        else:
-            topic_object = None
-
-        return topic_object
+        return get_blog_topic_for_slug(topic_slug, DEFAULT_LOCALE_ID)
 
     # helper function for /topic/... subroutes
     def extract_topic_information(self, topic_slug):
@@ -414,11 +419,12 @@ class BlogIndexPage(IndexPage):
         query = request.GET.get("q", "")
 
         entries = self.get_search_entries(query=query)
+        entries_page = SearchResultsPaginator(object_list=entries, per_page=self.page_size).page(1)
 
         context_overrides = {
             "index_title": "Search",
-            "entries": entries[: self.page_size],
-            "has_more": entries.count() > self.page_size,
+            "entries": entries_page,
+            "has_more": entries_page.has_next(),
             "query": query,
         }
 
@@ -443,7 +449,7 @@ class BlogIndexPage(IndexPage):
 
         entries = self.get_search_entries(query=query)
 
-        entries_paginator = paginator.Paginator(
+        entries_paginator = SearchResultsPaginator(
             object_list=entries,
             per_page=self.page_size,
             allow_empty_first_page=False,
@@ -467,17 +473,8 @@ class BlogIndexPage(IndexPage):
             }
         )
 
-    def get_search_entries(
-        self,
-        query: str = "",
-        locale: Optional[Locale] = None,
-    ) -> Union["QuerySet", "DatabaseSearchResults"]:
-        locale = locale or Locale.get_active()
-        entries = self.get_all_entries(locale=locale).specific()
+    def get_search_entries(self, query: str = "") -> Union["QuerySet", "BaseSearchResults"]:
+        entries = self.get_entries_queryset().specific()
         if query:
-            entries = entries.search(
-                query,
-                partial_match=False,
-                order_by_relevance=True,
-            )
+            entries = entries.search(query, order_by_relevance=True)
         return entries
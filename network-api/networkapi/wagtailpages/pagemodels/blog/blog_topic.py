@@ -1,3 +1,6 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.template.defaultfilters import slugify
 from wagtail.admin.edit_handlers import FieldPanel
@@ -6,16 +9,25 @@ from wagtail.core.models import TranslatableMixin
 from wagtail.images.edit_handlers import ImageChooserPanel
 from wagtail.snippets.models import register_snippet
 
+from networkapi.utility.cache_versions import bump_cache_version, get_cache_version
 from networkapi.wagtailpages.pagemodels.customblocks.base_rich_text_options import (
     base_rich_text_options,
 )
 from networkapi.wagtailpages.utils import get_default_locale
 
+BLOG_TOPICS_VERSION_KEY = "blog_topics_version"
+
+# The slug of topics whose names have no ASCII letters or digits, which slugify() drops.
+FALLBACK_TOPIC_SLUG = "topic"
+
 
 @register_snippet
 class BlogPageTopic(TranslatableMixin, models.Model):
     name = models.CharField(max_length=50)
 
+    # Derived from the name when the topic is created or renamed, for /topic/<slug>/ routes.
+    slug = models.SlugField(max_length=50, blank=True, editable=False)
+
     title = models.TextField(
         blank=True,
         help_text="Optional title that will apear on the page and when topic page is shared. "
@@ -51,16 +63,30 @@ class BlogPageTopic(TranslatableMixin, models.Model):
     @classmethod
     def get_topics(cls):
         (DEFAULT_LOCALE, DEFAULT_LOCALE_ID) = get_default_locale()
-        choices = [
-            (topic.name, topic.name)
-            for topic in BlogPageTopic.objects.filter(locale_id=DEFAULT_LOCALE_ID).order_by("name")
-        ]
+        choices = [(topic.name, topic.name) for topic in get_blog_topics_by_slug(DEFAULT_LOCALE_ID).values()]
         choices.insert(0, ("All", "All"))
         return choices
 
-    @property
-    def slug(self):
-        return slugify(self.name)
+    def clean(self):
+        super().clean()
+        if self.locale_id is None or slug_matches_name(self.slug, self.name):
+            return
+        duplicates = BlogPageTopic.objects.filter(locale_id=self.locale_id).exclude(pk=self.pk)
+        if slugify(self.name):
+            duplicates = duplicates.filter(slug=slugify(self.name))
+        else:
+            # All such names share the fallback slug, so compare the names themselves.
+            duplicates = duplicates.filter(name__iexact=self.name)
+        if duplicates.exists():
+            raise ValidationError({"name": "A topic with this name already exists."})
+
+    def save(self, *args, **kwargs):
+        # Keep the slug while the name still matches it, so that routes don't
+        # change, and topics keep the numbered slugs they were given when
+        # their names slugified to the same slug.
+        if not slug_matches_name(self.slug, self.name):
+            self.slug = get_available_topic_slug(self.name, self.locale_id, ignore_pk=self.pk)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -68,3 +94,79 @@ class BlogPageTopic(TranslatableMixin, models.Model):
     class Meta(TranslatableMixin.Meta):
         verbose_name = "Blog Page Topic"
         verbose_name_plural = "Blog Page Topics"
+        constraints = [
+            models.UniqueConstraint(fields=["locale", "slug"], name="unique_blog_topic_slug_per_locale"),
+        ]
+
+
+def get_topic_base_slug(name):
+    return slugify(name) or FALLBACK_TOPIC_SLUG
+
+
+def slug_matches_name(slug, name):
+    """
+    Whether `slug` is the slug of `name`, with or without a numbered suffix.
+    """
+    base_slug = get_topic_base_slug(name)
+    if not slug:
+        return False
+    if slug == base_slug:
+        return True
+    prefix, _, suffix = slug.rpartition("-")
+    return prefix == base_slug[:45] and suffix.isdigit()
+
+
+def get_available_topic_slug(name, locale_id, ignore_pk=None):
+    """
+    Return the slug of `name`, with a numbered suffix if another
+    topic in the locale already has that slug.
+    """
+    slug = base_slug = get_topic_base_slug(name)
+    taken = set(
+        BlogPageTopic.objects.filter(locale_id=locale_id, slug__startswith=base_slug[:45])
+        .exclude(pk=ignore_pk)
+        .values_list("slug", flat=True)
+    )
+    suffix = 1
+    while slug in taken:
+        suffix += 1
+        slug = f"{base_slug[:45]}-{suffix}"
+    return slug
+
+
+def get_blog_topics_version():
+    return get_cache_version(BLOG_TOPICS_VERSION_KEY)
+
+
+def get_blog_topics_by_slug(locale_id):
+    """
+    Return the blog topics of a locale by slug, ordered by name. They are
+    cached until a topic is saved or deleted, or INDEX_PAGE_CACHE_TIMEOUT runs out.
+    """
+    cache_key = f"blog_topics_{locale_id}_{get_blog_topics_version()}"
+    topics = cache.get(cache_key)
+    if topics is None:
+        topics = {topic.slug: topic for topic in BlogPageTopic.objects.filter(locale_id=locale_id).order_by("name")}
+        cache.set(cache_key, topics, settings.INDEX_PAGE_CACHE_TIMEOUT)
+    return topics
+
+
+def get_blog_topic_for_slug(slug, locale_id):
+    return get_blog_topics_by_slug(locale_id).get(slug)
+
+
+def get_blog_topic_translation(topic, locale_id):
+    """
+    Return the translation of `topic` in a locale, or `topic` itself if
+    it has not been translated.
+    """
+    if topic.locale_id == locale_id:
+        return topic
+    for translation in get_blog_topics_by_slug(locale_id).values():
+        if translation.translation_key == topic.translation_key:
+            return translation
+    return topic
+
+
+def invalidate_blog_topics():
+    bump_cache_version(BLOG_TOPICS_VERSION_KEY)
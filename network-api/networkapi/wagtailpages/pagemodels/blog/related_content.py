@@ -0,0 +1,94 @@
+"""
+Per-locale inverted tag index for finding blog posts related by tag.
+
+Blog posts and banner pages show the live blog posts that share the most tags
+with them. Rather than running a tag-overlap query for every page, the tags of
+all live blog posts in a locale are loaded with a single query into an index
+mapping every tag to the posts that carry it. Related posts are then found by
+counting overlaps in memory. The index is cached per locale and thrown away
+whenever a blog post is published, unpublished or deleted.
+"""
+import heapq
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+
+class RelatedContentIndex:
+    """
+    Tags of all live blog posts in one locale.
+
+    Built from `(post id, tag id, last published timestamp)` rows.
+    """
+
+    def __init__(self, rows):
+        self.post_tags = defaultdict(set)
+        self.tag_posts = defaultdict(list)
+        self.published = {}
+        for post_id, tag_id, published in rows:
+            self.post_tags[post_id].add(tag_id)
+            self.tag_posts[tag_id].append(post_id)
+            self.published[post_id] = published
+
+    def __len__(self):
+        return len(self.post_tags)
+
+    def get_related_ids(self, tag_ids, result_count=3, exclude=()):
+        """
+        Return the ids of the posts sharing the most of `tag_ids`, with the
+        most recently published posts first for the same number of tags.
+        """
+        common_tags = Counter()
+        for tag_id in set(tag_ids):
+            common_tags.update(self.tag_posts.get(tag_id, ()))
+        for post_id in exclude:
+            common_tags.pop(post_id, None)
+
+        published = self.published
+        ranked = heapq.nlargest(
+            result_count,
+            ((count, published[post_id], post_id) for post_id, count in common_tags.items()),
+        )
+        return [post_id for _, _, post_id in ranked]
+
+    def get_all_related_ids(self, result_count=3):
+        """
+        Return a mapping of every indexed post id to its related post ids.
+        """
+        return {
+            post_id: self.get_related_ids(tag_ids, result_count, exclude=[post_id])
+            for post_id, tag_ids in self.post_tags.items()
+        }
+
+
+def get_related_content_cache_key(locale_id):
+    return f"related_content_index_{locale_id}"
+
+
+def build_related_content_index(locale_id):
+    BlogPageTag = apps.get_model(app_label="wagtailpages", model_name="BlogPageTag")
+
+    rows = BlogPageTag.objects.filter(content_object__live=True, content_object__locale_id=locale_id).values_list(
+        "content_object_id", "tag_id", "content_object__last_published_at"
+    )
+
+    return RelatedContentIndex(
+        (post_id, tag_id, published.timestamp() if published else 0) for post_id, tag_id, published in rows
+    )
+
+
+def get_related_content_index(locale_id):
+    cache_key = get_related_content_cache_key(locale_id)
+    index = cache.get(cache_key)
+
+    if index is None:
+        index = build_related_content_index(locale_id)
+        cache.set(cache_key, index, settings.INDEX_PAGE_CACHE_TIMEOUT)
+
+    return index
+
+
+def invalidate_related_content_index(locale_id):
+    cache.delete(get_related_content_cache_key(locale_id))
@@ -0,0 +1,107 @@
+"""
+Per-language index of the Buyers Guide product categories.
+
+The PNI navigation shows the default locale categories, each replaced by its
+localized counterpart where one exists, together with the number of live
+products in every category. The index is built with a fixed number of
+queries, cached per language code, and thrown away whenever a category is
+saved or deleted, or a product is published, unpublished or deleted.
+"""
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from networkapi.wagtailpages.locale_registry import locale_registry
+from networkapi.wagtailpages.utils import get_default_locale
+
+CATEGORY_INDEX_TIMEOUT = 60 * 60 * 24
+
+
+class CategoryIndex:
+    """
+    The visible categories for one language code, in navigation order.
+
+    Every category is the localized version where one exists. Its `original`
+    and the original's `published_product_page_count` are filled in, and
+    `localized_parent` holds the localized version of its parent category.
+    """
+
+    def __init__(self, categories):
+        self.categories = categories
+        self._by_slug = {category.original.slug: category for category in categories}
+        self._children = {}
+        for category in categories:
+            if category.localized_parent is not None:
+                self._children.setdefault(category.localized_parent.translation_key, []).append(category)
+
+    def get(self, slug):
+        """Return the localized category for an original category slug, if it is visible."""
+        return self._by_slug.get(slug)
+
+    def get_children(self, category):
+        return self._children.get(category.translation_key, [])
+
+
+def get_category_index_cache_key(language_code):
+    return f"pni_category_index_{language_code}"
+
+
+def build_category_index(language_code):
+    BuyersGuideProductCategory = apps.get_model(app_label="wagtailpages", model_name="BuyersGuideProductCategory")
+    ProductPageCategory = apps.get_model(app_label="wagtailpages", model_name="ProductPageCategory")
+    (DEFAULT_LOCALE, DEFAULT_LOCALE_ID) = get_default_locale()
+
+    originals = list(
+        BuyersGuideProductCategory.objects.filter(hidden=False, locale_id=DEFAULT_LOCALE_ID).select_related("parent")
+    )
+
+    product_counts = dict(
+        ProductPageCategory.objects.filter(category__in=originals, product__live=True)
+        .values("category_id")
+        .annotate(count=Count("id"))
+        .values_list("category_id", "count")
+    )
+
+    localized_categories = {}
+    if language_code != settings.LANGUAGE_CODE:
+        locale = locale_registry.get(language_code)
+        if locale.id != DEFAULT_LOCALE_ID:
+            localized_categories = {
+                category.translation_key: category
+                for category in BuyersGuideProductCategory.objects.filter(
+                    translation_key__in=[original.translation_key for original in originals],
+                    locale=locale,
+                ).select_related("parent")
+            }
+
+    categories = []
+    for original in originals:
+        original.original = original
+        original.published_product_page_count = product_counts.get(original.id, 0)
+        category = localized_categories.get(original.translation_key, original)
+        category.original = original
+        categories.append(category)
+
+    for category in categories:
+        parent = category.original.parent
+        category.localized_parent = parent and localized_categories.get(parent.translation_key, parent)
+
+    return CategoryIndex(categories)
+
+
+def get_category_index(language_code):
+    key = get_category_index_cache_key(language_code)
+    index = cache.get(key)
+    if index is None:
+        index = build_category_index(language_code)
+        cache.set(key, index, CATEGORY_INDEX_TIMEOUT)
+    return index
+
+
+def invalidate_category_index():
+    """
+    Drop the category index of every language code, as the default locale
+    categories and product counts are shared by all of them.
+    """
+    cache.delete_many([get_category_index_cache_key(language_code) for language_code, _ in settings.LANGUAGES])
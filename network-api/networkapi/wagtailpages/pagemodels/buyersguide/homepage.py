@@ -19,11 +19,24 @@ from wagtail.admin.edit_handlers import (
     PageChooserPanel,
 )
 from wagtail.contrib.routable_page.models import RoutablePageMixin, route
-from wagtail.core.models import Locale, Orderable, Page, TranslatableMixin
+from wagtail.core.models import Orderable, Page, TranslatableMixin
 from wagtail.snippets.edit_handlers import SnippetChooserPanel
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
 from networkapi.utility import orderables
+from networkapi.wagtailpages.locale_registry import locale_registry
+from networkapi.wagtailpages.pagemodels.buyersguide.category_index import (
+    get_category_index,
+)
+from networkapi.wagtailpages.pagemodels.buyersguide.product_cache import (
+    PRODUCT_CACHE_TIMEOUT,
+    ProductCard,
+    get_cached_product_cards,
+    get_category_products_cache_key,
+    get_home_products_cache_key,
+    get_product_cache_version,
+    serialize_product_cards,
+)
 from networkapi.wagtailpages.pagemodels.buyersguide.utils import (
     get_categories_for_locale,
     sort_average,
@@ -262,49 +275,32 @@ class BuyersGuidePage(RoutablePageMixin, FoundationMetadataPageMixin, Page):
     def categories_page(self, request, slug):
         context = self.get_context(request, bypass_products=True)
         language_code = get_language_from_request(request)
-        locale_id = Locale.objects.get(language_code=language_code).id
         slug = slugify(slug)
 
-        (DEFAULT_LOCALE, DEFAULT_LOCALE_ID) = get_default_locale()
-
         # because we may be working with localized content, and the slug
-        # will always be our english slug, we need to find the english
-        # category first, and then find its corresponding localized version
-        BuyersGuideProductCategory = apps.get_model(
-            app_label="wagtailpages",
-            model_name="BuyersGuideProductCategory",
-        )
-        try:
-            original_category = BuyersGuideProductCategory.objects.get(slug=slug, locale_id=DEFAULT_LOCALE_ID)
-        except BuyersGuideProductCategory.DoesNotExist:
-            original_category = get_object_or_404(BuyersGuideProductCategory, name__iexact=slug)
-
-        if locale_id != DEFAULT_LOCALE_ID:
+        # will always be our english slug, we look up the localized version
+        # of the english category in the category index.
+        category = get_category_index(language_code).get(slug)
+
+        if category is None:
+            # Hidden categories are not part of the index, but can still be visited.
+            (DEFAULT_LOCALE, DEFAULT_LOCALE_ID) = get_default_locale()
+            BuyersGuideProductCategory = apps.get_model(
+                app_label="wagtailpages",
+                model_name="BuyersGuideProductCategory",
+            )
             try:
-                category = BuyersGuideProductCategory.objects.get(
-                    translation_key=original_category.translation_key,
-                    locale_id=DEFAULT_LOCALE_ID,
-                )
+                category = BuyersGuideProductCategory.objects.get(slug=slug, locale_id=DEFAULT_LOCALE_ID)
             except BuyersGuideProductCategory.DoesNotExist:
-                category = original_category
-        else:
-            category = original_category
+                category = get_object_or_404(BuyersGuideProductCategory, name__iexact=slug)
 
         authenticated = request.user.is_authenticated
-        key = f"cat_product_dicts_{slug}_auth" if authenticated else f"cat_product_dicts_{slug}_live"
-        key = f"{language_code}_{key}"
-        products = cache.get(key)
-        exclude_cat_ids = [excats.category.id for excats in self.excluded_categories.all()]
+        version = get_product_cache_version(language_code)
+        key = get_category_products_cache_key(language_code, slug, authenticated, version)
+        products = get_cached_product_cards(key)
 
-        ProductPage = apps.get_model(app_label="wagtailpages", model_name="ProductPage")
         if products is None:
-            products = get_product_subset(
-                self.cutoff_date,
-                authenticated,
-                key,
-                ProductPage.objects.exclude(product_categories__category__id__in=exclude_cat_ids),
-                language_code=language_code,
-            )
+            products = self.get_products(language_code, authenticated, key)
 
         context["category"] = slug
         context["current_category"] = category
@@ -312,7 +308,7 @@ class BuyersGuidePage(RoutablePageMixin, FoundationMetadataPageMixin, Page):
         context["pageTitle"] = (
             f'{category.localized.name} | {gettext("Privacy & security guide")}' f" | Mozilla Foundation"
         )
-        context["template_cache_key_fragment"] = f"{category.slug}_{request.LANGUAGE_CODE}"
+        context["template_cache_key_fragment"] = f"{category.slug}_{request.LANGUAGE_CODE}_{version}"
 
         # Checking if category has custom metadata, if so, update the share image and description.
         if category.share_image:
@@ -362,29 +358,36 @@ class BuyersGuidePage(RoutablePageMixin, FoundationMetadataPageMixin, Page):
         language_code = get_language_from_request(request)
 
         authenticated = request.user.is_authenticated
-        key = "home_product_dicts_authed" if authenticated else "home_product_dicts_live"
-        key = f"{key}_{language_code}"
-        products = cache.get(key)
-        exclude_cat_ids = [excats.category.id for excats in self.excluded_categories.all()]
+        version = get_product_cache_version(language_code)
+        key = get_home_products_cache_key(language_code, authenticated, version)
+        products = get_cached_product_cards(key)
 
-        ProductPage = apps.get_model(app_label="wagtailpages", model_name="ProductPage")
         if not kwargs.get("bypass_products", False) and products is None:
-            products = get_product_subset(
-                self.cutoff_date,
-                authenticated,
-                key,
-                ProductPage.objects.exclude(product_categories__category__id__in=exclude_cat_ids),
-                language_code=language_code,
-            )
+            products = self.get_products(language_code, authenticated, key)
 
         context["categories"] = get_categories_for_locale(language_code)
         context["current_category"] = None
         context["featured_cta"] = self.call_to_action
         context["products"] = products
         context["web_monetization_pointer"] = settings.WEB_MONETIZATION_POINTER
-        context["template_cache_key_fragment"] = f"pni_home_{request.LANGUAGE_CODE}"
+        context["template_cache_key_fragment"] = f"pni_home_{request.LANGUAGE_CODE}_{version}"
         return context
 
+    def get_products(self, language_code, authenticated, key):
+        """
+        Get the (cached) product listing for the given language code and
+        authentication state, leaving out products in excluded categories.
+        """
+        exclude_cat_ids = [excats.category.id for excats in self.excluded_categories.all()]
+        ProductPage = apps.get_model(app_label="wagtailpages", model_name="ProductPage")
+        return get_product_subset(
+            self.cutoff_date,
+            authenticated,
+            key,
+            ProductPage.objects.exclude(product_categories__category__id__in=exclude_cat_ids),
+            language_code=language_code,
+        )
+
     def get_editorial_content_index(self):
         BuyersGuideEditorialContentIndexPage = apps.get_model(
             app_label="wagtailpages",
@@ -518,17 +521,26 @@ def get_product_subset(cutoff_date, authenticated, key, products, language_code=
     filter a queryset based on our current cutoff date,
     as well as based on whether a user is authenticated
     to the system or not (authenticated users get to
-    see all products, including draft products)
+    see all products, including draft products), and cache
+    the resulting product cards under `key`.
     """
-    try:
-        locale = Locale.objects.get(language_code=language_code)
-    except Locale.DoesNotExist:
-        locale = Locale.objects.get(language_code=settings.LANGUAGE_CODE)
-
+    locale = locale_registry.get(language_code)
     products = products.filter(review_date__gte=cutoff_date, locale=locale)
 
     if not authenticated:
         products = products.live()
 
-    products = sort_average(products)
-    return cache.get_or_set(key, products, 86400)
+    products = list(sort_average(products).select_related("image").prefetch_related("product_categories__category"))
+
+    # Category names are shown in the language of the listing, falling back to
+    # the default locale name for categories that have not been translated.
+    category_names = {}
+    if products:
+        BuyersGuideProductCategory = apps.get_model(app_label="wagtailpages", model_name="BuyersGuideProductCategory")
+        category_names = dict(
+            BuyersGuideProductCategory.objects.filter(locale=locale).values_list("translation_key", "name")
+        )
+
+    cards = [ProductCard.from_product(product, category_names) for product in products]
+    cache.set(key, serialize_product_cards(cards), PRODUCT_CACHE_TIMEOUT)
+    return cards
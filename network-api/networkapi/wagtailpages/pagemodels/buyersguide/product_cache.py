@@ -0,0 +1,207 @@
+"""
+Cache keys for the PNI product listings.
+
+The product listings on the Buyers Guide home page and category pages are
+cached per language code, category and authentication state. Rather than
+tracking every key that was ever written, each language code has a version
+token that is part of all of its keys. Publishing a product or Buyers Guide
+page replaces the version token of the affected language codes, which
+invalidates all of their listing keys at once without touching the rest of
+the cache. Stale keys simply expire.
+
+The listings themselves are stored as compact product cards, holding only
+the fields that the product grid renders, rather than as pickled page
+instances. The cached payload carries a format version, so that a change
+to the card layout is picked up as a cache miss instead of a broken page.
+"""
+import logging
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from networkapi.utility.cache_versions import bump_cache_version, get_cache_version
+from networkapi.wagtailpages.pagemodels.buyersguide.utils import (
+    get_categories_for_locale,
+)
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_CACHE_TIMEOUT = 60 * 60 * 24
+PRODUCT_CARD_FORMAT_VERSION = 1
+
+
+class ProductCard:
+    """
+    Summary of a product page with everything the product grid needs,
+    including the rendition URLs of the product image.
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "company",
+        "url",
+        "blurb",
+        "worst_case",
+        "adult_content",
+        "privacy_ding",
+        "creepiness",
+        "image_url",
+        "image_1x_url",
+        "image_2x_url",
+        "category_slugs",
+        "category_names",
+    )
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __eq__(self, other):
+        return isinstance(other, ProductCard) and self.to_tuple() == other.to_tuple()
+
+    def __repr__(self):
+        return f"<ProductCard: {self.title}>"
+
+    @classmethod
+    def from_product(cls, product, category_names):
+        """
+        Build a card for `product`, using `category_names` to look up the
+        localized name of each of its categories by translation key.
+        """
+        image = product.image
+        categories = [product_category.category for product_category in product.product_categories.all()]
+        return cls(
+            product.id,
+            product.title,
+            product.company,
+            product.url,
+            product.blurb,
+            product.worst_case,
+            product.adult_content,
+            product.privacy_ding,
+            getattr(product, "sort_creepiness", product.average_creepiness),
+            image.get_rendition("fill-600x600").url if image else "",
+            image.get_rendition("fill-360x360").url if image else "",
+            image.get_rendition("fill-720x720").url if image else "",
+            tuple(category.slug for category in categories),
+            tuple(category_names.get(category.translation_key, category.name) for category in categories),
+        )
+
+    def to_tuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+
+def serialize_product_cards(cards):
+    """
+    Turn product cards into the cached payload. Cards are stored as plain
+    tuples, so the pickled payload does not repeat the field names per card.
+    """
+    return (PRODUCT_CARD_FORMAT_VERSION, [card.to_tuple() for card in cards])
+
+
+def deserialize_product_cards(payload):
+    """
+    Turn a cached payload back into product cards, or return None if it was
+    written with a different card format.
+    """
+    try:
+        version, rows = payload
+    except (TypeError, ValueError):
+        return None
+    if version != PRODUCT_CARD_FORMAT_VERSION:
+        return None
+    return [ProductCard(*row) for row in rows]
+
+
+def get_cached_product_cards(key):
+    return deserialize_product_cards(cache.get(key))
+
+
+def get_product_cache_version_key(language_code):
+    return f"pni_product_cache_version_{language_code}"
+
+
+def get_product_cache_version(language_code):
+    return get_cache_version(get_product_cache_version_key(language_code))
+
+
+def get_home_products_cache_key(language_code, authenticated, version):
+    key = "home_product_dicts_authed" if authenticated else "home_product_dicts_live"
+    return f"{key}_{language_code}_{version}"
+
+
+def get_category_products_cache_key(language_code, slug, authenticated, version):
+    key = f"cat_product_dicts_{slug}_auth" if authenticated else f"cat_product_dicts_{slug}_live"
+    return f"{language_code}_{key}_{version}"
+
+
+def get_language_codes_for_locale(locale):
+    """
+    Return all language codes whose product listings show products of this
+    locale. Listings in every language fall back to default locale products
+    that have not been translated, and show their images, scores and
+    categories, so a default locale change affects all of them.
+    """
+    if locale.language_code != settings.LANGUAGE_CODE:
+        return [locale.language_code]
+    return [language_code for language_code, _ in settings.LANGUAGES]
+
+
+def invalidate_product_cache(page):
+    """
+    Invalidate the cached product listings that could contain `page`, which is
+    either a product page or a Buyers Guide page.
+    """
+    language_codes = get_language_codes_for_locale(page.locale)
+    bump_cache_version(*[get_product_cache_version_key(language_code) for language_code in language_codes])
+
+    if settings.BUYERS_GUIDE_CACHE_WARMUP:
+        BuyersGuidePage = apps.get_model(app_label="wagtailpages", model_name="BuyersGuidePage")
+        buyersguide_page = BuyersGuidePage.objects.ancestor_of(page, inclusive=True).first()
+        if buyersguide_page:
+            transaction.on_commit(lambda: start_product_cache_warmup(buyersguide_page.pk, language_codes))
+
+
+def warm_product_cache(buyersguide_page, language_code):
+    """
+    Populate the logged-out home page and category listings for a language code.
+    All of these listings contain the same products, so they are computed once.
+    """
+    version = get_product_cache_version(language_code)
+    home_key = get_home_products_cache_key(language_code, False, version)
+    products = buyersguide_page.get_products(language_code, False, home_key)
+    payload = serialize_product_cards(products)
+
+    cache.set_many(
+        {
+            get_category_products_cache_key(language_code, category.slug, False, version): payload
+            for category in get_categories_for_locale(language_code)
+        },
+        PRODUCT_CACHE_TIMEOUT,
+    )
+
+
+def start_product_cache_warmup(buyersguide_page_id, language_codes):
+    """
+    Warm the product listing cache in a background thread, so that the
+    request that triggered the invalidation does not have to wait for it.
+    """
+
+    def warmup():
+        BuyersGuidePage = apps.get_model(app_label="wagtailpages", model_name="BuyersGuidePage")
+        try:
+            buyersguide_page = BuyersGuidePage.objects.get(pk=buyersguide_page_id)
+            for language_code in language_codes:
+                warm_product_cache(buyersguide_page, language_code)
+        except Exception:
+            logger.exception("Could not warm the PNI product cache")
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=warmup, daemon=True)
+    thread.start()
+    return thread
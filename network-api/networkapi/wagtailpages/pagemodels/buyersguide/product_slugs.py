@@ -0,0 +1,47 @@
+"""
+In-process set of all product page slugs.
+
+Product pages accept vote POSTs without a CSRF token, so the CSRF middleware
+has to know whether a POST targets a product page before the page is served.
+Every process keeps the slugs of all product pages in memory, and reloads
+them only when the version token in the shared cache changes. Saving or
+deleting a product page replaces that token.
+"""
+
+from django.apps import apps
+
+from networkapi.utility.cache_versions import bump_cache_version, get_cache_version
+
+PRODUCT_SLUGS_VERSION_KEY = "pni_product_slugs_version"
+
+
+class ProductSlugs:
+    def __init__(self):
+        self._slugs = None
+        self._version = None
+
+    def get_version(self):
+        return get_cache_version(PRODUCT_SLUGS_VERSION_KEY)
+
+    def load(self):
+        ProductPage = apps.get_model(app_label="wagtailpages", model_name="ProductPage")
+        return frozenset(ProductPage.objects.values_list("slug", flat=True))
+
+    def __contains__(self, slug):
+        version = self.get_version()
+        # Without a shared version, e.g. with a dummy cache, always reload.
+        if self._slugs is None or version is None or version != self._version:
+            self._slugs = self.load()
+            self._version = version
+        return slug in self._slugs
+
+
+product_slugs = ProductSlugs()
+
+
+def is_product_slug(slug):
+    return slug in product_slugs
+
+
+def invalidate_product_slugs():
+    bump_cache_version(PRODUCT_SLUGS_VERSION_KEY)
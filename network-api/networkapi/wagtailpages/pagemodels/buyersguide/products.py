@@ -2,12 +2,11 @@ import json
 import re
 import typing
 
-from bs4 import BeautifulSoup
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.core.validators import int_list_validator
 from django.db import Error, models
-from django.db.models import F
+from django.db.models import F, Value
+from django.db.models.functions import Cast
 from django.http import (
     HttpResponse,
     HttpResponseNotAllowed,
@@ -16,6 +15,7 @@ from django.http import (
 )
 from django.templatetags.static import static
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.text import slugify
 from django.utils.translation import gettext
 from modelcluster import models as cluster_models
@@ -36,6 +36,7 @@ from wagtail_airtable.mixins import AirtableMixin
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
 from networkapi.utility import orderables
+from networkapi.utility.rate_limits import too_many_requests
 from networkapi.wagtailpages.fields import ExtendedYesNoField
 from networkapi.wagtailpages.pagemodels.buyersguide.forms import (
     BuyersGuideProductCategoryForm,
@@ -44,6 +45,10 @@ from networkapi.wagtailpages.pagemodels.buyersguide.utils import (
     get_buyersguide_featured_cta,
     get_categories_for_locale,
 )
+from networkapi.wagtailpages.pagemodels.buyersguide.voting import (
+    record_vote,
+    vote_rate_limiter,
+)
 from networkapi.wagtailpages.pagemodels.customblocks.base_rich_text_options import (
     base_rich_text_options,
 )
@@ -53,6 +58,7 @@ from networkapi.wagtailpages.pagemodels.mixin.foundation_metadata import (
 from networkapi.wagtailpages.pagemodels.mixin.snippets import LocalizedSnippet
 from networkapi.wagtailpages.utils import (
     TitleWidget,
+    get_first_paragraph_text,
     get_language_from_request,
     get_original_by_slug,
     insert_panels_after,
@@ -62,6 +68,9 @@ if typing.TYPE_CHECKING:
     from networkapi.wagtailpages.models import BuyersGuideArticlePage
 
 
+# The creepiness score used for products that have not received any votes yet.
+DEFAULT_CREEPINESS = 50
+
 TRACK_RECORD_CHOICES = [
     ("Great", "Great"),
     ("Average", "Average"),
@@ -165,7 +174,7 @@ class BuyersGuideProductCategory(
         SynchronizedField("parent"),
     ]
 
-    @property
+    @cached_property
     def published_product_page_count(self):
         return ProductPage.objects.filter(product_categories__category=self).live().count()
 
@@ -238,23 +247,39 @@ class BuyersGuideProductCategoryArticlePageRelation(TranslatableMixin, Orderable
 class ProductPageVotes(models.Model):
     """
     PNI product voting bins. This does not need translating.
+
+    Each bin is stored in its own column, so that votes can be recorded
+    with atomic increments rather than a read-modify-write cycle.
     """
 
-    vote_bins = models.CharField(default="0,0,0,0,0", max_length=50, validators=[int_list_validator])
+    BIN_FIELDS = ["bin_0", "bin_1", "bin_2", "bin_3", "bin_4"]
+
+    bin_0 = models.PositiveIntegerField(default=0)
+    bin_1 = models.PositiveIntegerField(default=0)
+    bin_2 = models.PositiveIntegerField(default=0)
+    bin_3 = models.PositiveIntegerField(default=0)
+    bin_4 = models.PositiveIntegerField(default=0)
 
     def set_votes(self, bin_list):
         """
         There are 5 "bins" for votes: <20%, <40%, <60%, <80%, <100%.
         When setting votes, ensure there are only 5 bins (max)
         """
-        bin_list = [str(x) for x in bin_list]
-        self.vote_bins = ",".join(bin_list[0:5])
+        for field_name, value in zip(self.BIN_FIELDS, bin_list):
+            setattr(self, field_name, int(value))
         self.save()
 
+        # Keep the denormalized vote totals on the product(s) using these bins current.
+        total = sum(self.get_votes())
+        if total:
+            average = Cast(F("creepiness_value"), models.FloatField()) / total
+        else:
+            average = Value(DEFAULT_CREEPINESS, output_field=models.FloatField())
+        ProductPage.objects.filter(votes=self).update(total_votes=total, average_creepiness=average)
+
     def get_votes(self):
-        """Pull the votes out of the database and split them. Convert to ints."""
-        votes = [int(x) for x in self.vote_bins.split(",")]
-        return votes
+        """Return the vote counts of all bins, in bin order."""
+        return [getattr(self, field_name) for field_name in self.BIN_FIELDS]
 
     def get_most_voted(self):
         votes = self.get_votes()
@@ -470,6 +495,8 @@ class ProductPage(AirtableMixin, FoundationMetadataPageMixin, Page):
         blank=True,
     )
     blurb = RichTextField(verbose_name="intro Blurb", features=base_rich_text_options, blank=True)
+    # The text of the first paragraph of `blurb`, as derived by `full_clean()`.
+    blurb_summary = models.TextField(blank=True, editable=False)
     product_url = models.URLField(
         verbose_name="product URL",
         max_length=2048,
@@ -570,6 +597,10 @@ class ProductPage(AirtableMixin, FoundationMetadataPageMixin, Page):
         blank=True,
         related_name="votes",
     )
+    # Denormalized from creepiness_value and the vote bins, so that product
+    # listings can be sorted by the database rather than in Python.
+    average_creepiness = models.FloatField(default=DEFAULT_CREEPINESS, db_index=True, editable=False)
+    total_votes = models.PositiveIntegerField(default=0, db_index=True, editable=False)
 
     @classmethod
     def map_import_fields(cls):
@@ -718,9 +749,25 @@ class ProductPage(AirtableMixin, FoundationMetadataPageMixin, Page):
         try:
             average = product.creepiness_value / product.total_vote_count
         except ZeroDivisionError:
-            average = 50
+            average = DEFAULT_CREEPINESS
         return average
 
+    def update_vote_totals(self):
+        """
+        Recompute the denormalized `total_votes` and `average_creepiness`
+        fields from this page's own creepiness value and vote bins.
+        """
+        if not self.votes:
+            self.total_votes = 0
+            self.average_creepiness = DEFAULT_CREEPINESS
+            return
+
+        self.total_votes = sum(self.votes.get_votes())
+        try:
+            self.average_creepiness = self.creepiness_value / self.total_votes
+        except ZeroDivisionError:
+            self.average_creepiness = DEFAULT_CREEPINESS
+
     @property
     def get_voting_json(self):
         """
@@ -746,10 +793,8 @@ class ProductPage(AirtableMixin, FoundationMetadataPageMixin, Page):
         if self.search_description:
             return self.search_description
 
-        soup = BeautifulSoup(self.blurb, "html.parser")
-        first_paragraph = soup.find("p")
-        if first_paragraph:
-            return first_paragraph.text
+        if self.blurb_summary:
+            return self.blurb_summary
 
         return super().get_meta_description()
 
@@ -963,26 +1008,13 @@ class ProductPage(AirtableMixin, FoundationMetadataPageMixin, Page):
                     if (not product.live and not request.user.is_authenticated) or not product:
                         return HttpResponseNotFound("Product does not exist")
 
-                    # Save the new voting totals
-                    product.creepiness_value = product.creepiness_value + value
-
-                    # Add the vote to the vote bin
-                    if not product.votes:
-                        # If there is no vote bin attached to this product yet, create one now.
-                        votes = ProductPageVotes()
-                        votes.save()
-                        product.votes = votes
-
-                    # Add the vote to the proper "vote bin"
-                    votes = product.votes.get_votes()
-                    index = int((value - 1) / 20)
-                    votes[index] += 1
-                    product.votes.set_votes(votes)
-
-                    # Don't save this as a revision with .save_revision() as to not spam the Audit log
-                    # And don't make this live with .publish(). The Page model will have the proper
-                    # data stored on it already, and the revision history won't be spammed by votes.
-                    product.save()
+                    if not vote_rate_limiter.hit_request(request, product.pk):
+                        return too_many_requests("Too many votes")
+
+                    # Votes are recorded with atomic increments, rather than by updating
+                    # and saving the product. This keeps concurrent votes from overwriting
+                    # each other, and the revision history won't be spammed by votes.
+                    record_vote(product, value)
                     return HttpResponse("Vote recorded", content_type="text/plain")
                 except ProductPage.DoesNotExist:
                     return HttpResponseNotFound("Missing page")
@@ -996,9 +1028,33 @@ class ProductPage(AirtableMixin, FoundationMetadataPageMixin, Page):
 
         return super().serve(request, *args, **kwargs)
 
+    def with_content_json(self, content_json):
+        """
+        Votes are recorded directly on the page row, outside of the revision
+        system, so publishing or reverting to a revision should never restore
+        the vote data that happened to be stored in that revision.
+        """
+        obj = super().with_content_json(content_json)
+        # Votes may have come in since this instance was loaded, so read them fresh.
+        vote_data = (
+            ProductPage.objects.filter(pk=self.pk)
+            .values("creepiness_value", "votes_id", "total_votes", "average_creepiness")
+            .first()
+        )
+        for field_name, value in (vote_data or {}).items():
+            setattr(obj, field_name, value)
+        return obj
+
+    def full_clean(self, *args, **kwargs):
+        # Derive the summary when the page is saved or previewed, rather than
+        # parsing the blurb every time the page's metadata is rendered.
+        self.blurb_summary = get_first_paragraph_text(self.blurb)
+        super().full_clean(*args, **kwargs)
+
     def save(self, *args, **kwargs):
         # When a new ProductPage is created, ensure a vote bin always exists.
         # We can use save() or a post-save Wagtail hook.
+        self.update_vote_totals()
         save = super().save(*args, **kwargs)
         self.get_or_create_votes()
         return save
@@ -1,7 +1,10 @@
 from django.apps import apps
-from django.conf import settings
-from wagtail.core.models import Locale
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
+from networkapi.wagtailpages.pagemodels.buyersguide.category_index import (
+    get_category_index,
+)
 from networkapi.wagtailpages.utils import get_default_locale
 
 
@@ -11,38 +14,28 @@ def get_categories_for_locale(language_code):
     with their localized counterpart, where possible, so that we don't
     end up with an incomplete category list due to missing locale records.
     """
-    BuyersGuideProductCategory = apps.get_model(app_label="wagtailpages", model_name="BuyersGuideProductCategory")
-    DEFAULT_LANGUAGE_CODE = settings.LANGUAGE_CODE
-    (DEFAULT_LOCALE, DEFAULT_LOCALE_ID) = get_default_locale()
-
-    default_locale_list = BuyersGuideProductCategory.objects.filter(
-        hidden=False,
-        locale=DEFAULT_LOCALE,
-    )
-
-    if language_code == DEFAULT_LANGUAGE_CODE:
-        return default_locale_list
-
-    try:
-        actual_locale = Locale.objects.get(language_code=language_code)
-    except Locale.DoesNotExist:
-        actual_locale = Locale.objects.get(language_code=DEFAULT_LANGUAGE_CODE)
-
-    return [
-        BuyersGuideProductCategory.objects.filter(
-            translation_key=cat.translation_key,
-            locale=actual_locale,
-        ).first()
-        or cat
-        for cat in default_locale_list
-    ]
+    return get_category_index(language_code).categories
 
 
 def sort_average(products):
     """
     `products` is a QuerySet of ProductPages.
+
+    Votes are only recorded on the original (default locale) product, so each
+    product is sorted on the stored `average_creepiness` of its original, which
+    lets the database do the ordering in a single query.
     """
-    return sorted(products, key=lambda p: p.creepiness)
+    ProductPage = apps.get_model(app_label="wagtailpages", model_name="ProductPage")
+    (DEFAULT_LOCALE, DEFAULT_LOCALE_ID) = get_default_locale()
+
+    original_creepiness = ProductPage.objects.filter(
+        translation_key=OuterRef("translation_key"),
+        locale_id=DEFAULT_LOCALE_ID,
+    ).values("average_creepiness")[:1]
+
+    return products.annotate(
+        sort_creepiness=Coalesce(Subquery(original_creepiness), F("average_creepiness")),
+    ).order_by("sort_creepiness", "path")
 
 
 def get_buyersguide_featured_cta(page):
@@ -0,0 +1,203 @@
+"""
+Recording of PNI product creepiness votes.
+
+Votes are written with atomic SQL increments on the product's creepiness
+total and vote bin columns, so that concurrent voters cannot overwrite each
+other and recording a vote never requires a full page save.
+
+During campaign spikes, votes can be buffered in-process and flushed in
+batches by setting `BUYERS_GUIDE_VOTE_BUFFER_SIZE` to a value above zero.
+
+Votes per client IP and product are limited to `BUYERS_GUIDE_VOTE_RATE_LIMIT`
+by `vote_rate_limiter`, before they reach the database.
+"""
+import atexit
+import logging
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+from networkapi.utility.rate_limits import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+VOTE_BIN_COUNT = 5
+
+vote_rate_limiter = RateLimiter("buyersguide-vote", "BUYERS_GUIDE_VOTE_RATE_LIMIT")
+
+
+def get_vote_bin(value):
+    """
+    Map a creepiness value (0-100) onto one of the 5 vote bins:
+    <20%, <40%, <60%, <80%, <100%.
+    """
+    return min(max(int((value - 1) / 20), 0), VOTE_BIN_COUNT - 1)
+
+
+class PendingVotes:
+    """
+    Aggregated, not yet recorded votes for a single product.
+    """
+
+    __slots__ = ("votes_id", "creepiness", "bins")
+
+    def __init__(self, votes_id):
+        self.votes_id = votes_id
+        self.creepiness = 0
+        self.bins = [0] * VOTE_BIN_COUNT
+
+    def add(self, value):
+        self.creepiness += value
+        self.bins[get_vote_bin(value)] += 1
+
+    def merge(self, other):
+        self.creepiness += other.creepiness
+        self.bins = [count + other_count for count, other_count in zip(self.bins, other.bins)]
+
+    @property
+    def count(self):
+        return sum(self.bins)
+
+
+def apply_votes(pending_votes):
+    """
+    Record a `{product_id: PendingVotes}` mapping using one atomic UPDATE
+    for the vote bins and one for the product totals, per product.
+    """
+    ProductPage = apps.get_model(app_label="wagtailpages", model_name="ProductPage")
+    ProductPageVotes = apps.get_model(app_label="wagtailpages", model_name="ProductPageVotes")
+
+    with transaction.atomic():
+        for product_id, pending in pending_votes.items():
+            count = pending.count
+            if not count:
+                continue
+
+            ProductPageVotes.objects.filter(pk=pending.votes_id).update(
+                **{
+                    field_name: F(field_name) + increment
+                    for field_name, increment in zip(ProductPageVotes.BIN_FIELDS, pending.bins)
+                    if increment
+                }
+            )
+
+            # All right-hand sides of an UPDATE see the row's values from before
+            # the update, so the average is computed from the new totals here.
+            ProductPage.objects.filter(pk=product_id).update(
+                creepiness_value=F("creepiness_value") + pending.creepiness,
+                total_votes=F("total_votes") + count,
+                average_creepiness=(
+                    Cast(F("creepiness_value") + pending.creepiness, FloatField())
+                    / Cast(F("total_votes") + count, FloatField())
+                ),
+            )
+
+
+class VoteBuffer:
+    """
+    Thread-safe, in-process buffer of votes, aggregated per product.
+
+    The buffer is flushed to the database once it holds `max_size` votes, and
+    a timer flushes it no later than `max_age` seconds after the oldest
+    buffered vote, so a quiet worker does not hold on to votes. Anything left
+    over is flushed when the process exits.
+
+    A flush triggered by a vote waits for the voter's transaction to commit,
+    so other visitors' votes are never written inside a request transaction
+    that may still roll back. Votes from a flush that fails are put back into
+    the buffer, to be retried on the next flush.
+    """
+
+    def __init__(self, max_size, max_age):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._size = 0
+        self._timer = None
+
+    def add(self, product_id, votes_id, value):
+        with self._lock:
+            if product_id not in self._pending:
+                self._pending[product_id] = PendingVotes(votes_id)
+            self._pending[product_id].add(value)
+            self._size += 1
+            self._start_timer()
+
+            should_flush = self._size >= self.max_size
+
+        if should_flush:
+            transaction.on_commit(self.flush)
+
+    def flush(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._size = 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not pending:
+            return
+
+        try:
+            apply_votes(pending)
+        except Exception:
+            logger.exception("Could not record buffered votes, keeping them for the next flush")
+            self._restore(pending)
+
+    def _restore(self, pending_votes):
+        with self._lock:
+            for product_id, pending in pending_votes.items():
+                if product_id not in self._pending:
+                    self._pending[product_id] = PendingVotes(pending.votes_id)
+                self._pending[product_id].merge(pending)
+                self._size += pending.count
+            self._start_timer()
+
+    def _start_timer(self):
+        # Must be called with the lock held.
+        if self._timer is None:
+            self._timer = threading.Timer(self.max_age, self._flush_on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread gets its own database connection, which Django's
+            # request handling will never close for us.
+            connection.close()
+
+    def __len__(self):
+        return self._size
+
+
+vote_buffer = VoteBuffer(
+    max_size=getattr(settings, "BUYERS_GUIDE_VOTE_BUFFER_SIZE", 0),
+    max_age=getattr(settings, "BUYERS_GUIDE_VOTE_BUFFER_TIMEOUT", 5),
+)
+atexit.register(vote_buffer.flush)
+
+
+def record_vote(product, value):
+    """
+    Record a single creepiness vote for `product`, which should be the
+    original (default locale) product, as that is where votes are stored.
+    """
+    if not product.votes_id:
+        product.get_or_create_votes()
+
+    if vote_buffer.max_size > 1:
+        vote_buffer.add(product.pk, product.votes_id, value)
+        return
+
+    pending = PendingVotes(product.votes_id)
+    pending.add(value)
+    apply_votes({product.pk: pending})
@@ -1,9 +1,7 @@
-import json
-from urllib import parse, request
-
-from django.conf import settings
 from wagtail.core import blocks
 
+from networkapi.wagtailpages.pulse import pulse_client
+
 
 class LatestProfileQueryValue(blocks.StructValue):
     @property
@@ -39,16 +37,7 @@ class LatestProfileList(blocks.StructBlock):
 
     year = blocks.CharBlock(required=False, default="")
 
-    def get_context(
-        self,
-        value,
-        parent_context=None,
-        no_limit=False,
-        initial_year=False,
-        ordering=False,
-    ):
-        context = super().get_context(value, parent_context=parent_context)
-
+    def get_pulse_query(self, value, no_limit=False, initial_year=False, ordering=False):
         query_args = {
             "limit": value["max_number_of_results"],
             "profile_type": value["profile_type"],
@@ -65,29 +54,17 @@ class LatestProfileList(blocks.StructBlock):
             query_args.pop("limit")
 
         # Filter out emptish values
-        query_args = {k: v for k, v in query_args.items() if v}
+        return {k: v for k, v in query_args.items() if v}
 
-        url = "{pulse_api}/api/pulse/v2/profiles/?{query}".format(
-            pulse_api=settings.FRONTEND["PULSE_API_DOMAIN"],
-            query=parse.urlencode(query_args),
-        )
-
-        data = []
-
-        try:
-            response = request.urlopen(url)
-            response_data = response.read()
-            data = json.loads(response_data)
-
-            for profile in data:
-                profile["created_entries"] = False
-                profile["published_entries"] = False
-                profile["entry_count"] = False
-                profile["user_bio_long"] = False
+    def get_context(self, value, parent_context=None):
+        context = super().get_context(value, parent_context=parent_context)
+        data = pulse_client.get_profiles(self.get_pulse_query(value))
 
-        except (IOError, ValueError) as exception:
-            print(str(exception))
-            pass
+        for profile in data:
+            profile["created_entries"] = False
+            profile["published_entries"] = False
+            profile["entry_count"] = False
+            profile["user_bio_long"] = False
 
         context["profiles"] = data
         context["profile_type"] = value["profile_type"]
@@ -1,9 +1,7 @@
-import json
-from urllib import request
-
-from django.conf import settings
 from wagtail.core import blocks
 
+from networkapi.wagtailpages.pulse import pulse_client
+
 
 class ProfileById(blocks.StructBlock):
 
@@ -14,34 +12,19 @@ class ProfileById(blocks.StructBlock):
         ", specify a comma separated list (e.g. 85,105,332).",
     )
 
+    def get_pulse_query(self, value):
+        return {"format": "json", "ids": value["ids"].replace(" ", "")}
+
     def get_context(self, value, parent_context=None):
         context = super().get_context(value, parent_context=parent_context)
-        ids = context["block"].value["ids"].replace(" ", "")
-        profiles = list()
-
-        # FIXME: the protocol should be part of the pulse api variable.
-        #   see: https://github.com/mozilla/foundation.mozilla.org/issues/1824
-
-        url = "{pulse_api}/api/pulse/v2/profiles/?format=json&ids={ids}".format(
-            pulse_api=settings.FRONTEND["PULSE_API_DOMAIN"], ids=ids
-        )
-
-        try:
-            response = request.urlopen(url)
-            response_data = response.read()
-            data = json.loads(response_data)
-
-            as_dict = {}
-            for profile in data:
-                as_dict[str(profile["profile_id"])] = profile
-
-            profiles = [as_dict[id] for id in ids.split(",") if id in as_dict]
+        query_args = self.get_pulse_query(value)
+        data = pulse_client.get_profiles(query_args)
 
-        except (IOError, ValueError) as exception:
-            print(str(exception))
-            pass
+        as_dict = {}
+        for profile in data:
+            as_dict[str(profile["profile_id"])] = profile
 
-        context["profiles"] = profiles
+        context["profiles"] = [as_dict[id] for id in query_args["ids"].split(",") if id in as_dict]
         return context
 
     class Meta:
@@ -1,6 +1,3 @@
-import json
-from urllib import parse, request
-
 from django.conf import settings
 from django.core import serializers
 from django.core.exceptions import ValidationError
@@ -10,6 +7,8 @@ from wagtail.core.blocks.stream_block import StreamBlockValidationError
 from wagtail.core.blocks.struct_block import StructBlockValidationError
 from wagtail.snippets.blocks import SnippetChooserBlock
 
+from networkapi.wagtailpages.pulse import pulse_client
+
 from .latest_profile_list import LatestProfileList
 
 
@@ -34,21 +33,15 @@ class ProfileDirectory(LatestProfileList):
         help_text="Example: 2019,2018,2017,2016,2015,2014,2013",
     )
 
+    def get_pulse_query(self, value):
+        years = value["filter_values"].split(",")
+        return super().get_pulse_query(value, no_limit=True, initial_year=years[0], ordering="custom_name")
+
     def get_context(self, value, parent_context=None):
         pulse_api = settings.FRONTEND["PULSE_API_DOMAIN"]
-        filter_values = value["filter_values"]
-        years = filter_values.split(",")
-        initial_year = years[0]
-
-        context = super().get_context(
-            value,
-            parent_context=parent_context,
-            no_limit=True,
-            initial_year=initial_year,
-            ordering="custom_name",
-        )
-
-        context["filters"] = years
+        context = super().get_context(value, parent_context=parent_context)
+
+        context["filters"] = value["filter_values"].split(",")
         context["api_endpoint"] = f"{pulse_api}/api/pulse/v2/profiles/?ordering=custom_name&is_active=true&format=json"
         return context
 
@@ -122,10 +115,7 @@ class TabbedProfileDirectory(blocks.StructBlock):
 
         return result
 
-    def get_context(self, value, parent_context=None, ordering=False):
-        context = super().get_context(value, parent_context=parent_context)
-        pulse_api = settings.FRONTEND["PULSE_API_DOMAIN"]
-
+    def get_pulse_query(self, value, ordering=False):
         query_args = {
             "profile_type": value["profile_type"],
             "program_type": value["program_type"],
@@ -146,28 +136,18 @@ class TabbedProfileDirectory(blocks.StructBlock):
                 query_args.pop(filter_key)
 
         # Filter out emptish values
-        query_args = {k: v for k, v in query_args.items() if v}
-
-        url = "{pulse_api}/api/pulse/v2/profiles/?{query}".format(
-            pulse_api=pulse_api, query=parse.urlencode(query_args)
-        )
-
-        data = []
-
-        try:
-            response = request.urlopen(url)
-            response_data = response.read()
-            data = json.loads(response_data)
+        return {k: v for k, v in query_args.items() if v}
 
-            for profile in data:
-                profile["created_entries"] = False
-                profile["published_entries"] = False
-                profile["entry_count"] = False
-                profile["user_bio_long"] = False
+    def get_context(self, value, parent_context=None, ordering=False):
+        context = super().get_context(value, parent_context=parent_context)
+        pulse_api = settings.FRONTEND["PULSE_API_DOMAIN"]
+        data = pulse_client.get_profiles(self.get_pulse_query(value, ordering=ordering))
 
-        except (IOError, ValueError) as exception:
-            print(str(exception))
-            pass
+        for profile in data:
+            profile["created_entries"] = False
+            profile["published_entries"] = False
+            profile["entry_count"] = False
+            profile["user_bio_long"] = False
 
         context["profiles"] = data
         context["profile_type"] = value["profile_type"]
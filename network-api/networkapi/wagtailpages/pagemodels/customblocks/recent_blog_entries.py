@@ -1,10 +1,11 @@
 from django.apps import apps
+from django.core.exceptions import ObjectDoesNotExist
 from django.template.defaultfilters import slugify
 from wagtail.core import blocks
 
 from networkapi.wagtailpages.utils import get_locale_from_request
 
-from ..blog.blog_topic import BlogPageTopic
+from ..blog.blog_topic import BlogPageTopic, get_blog_topics_by_slug
 
 
 class RecentBlogEntries(blocks.StructBlock):
@@ -70,13 +71,23 @@ class RecentBlogEntries(blocks.StructBlock):
         if topic and topic != "All":
             type = "topic"
             query = slugify(topic)
-            try:
-                # verify this topic exists, and set up a filter for it
-                topic_object = BlogPageTopic.objects.get(name=topic, locale=locale)
-                blog_page.extract_topic_information(topic_object.slug)
-            except BlogPageTopic.DoesNotExist:
-                # do nothing
-                pass
+            topic_object = next(
+                (
+                    topic_object
+                    for topic_object in get_blog_topics_by_slug(locale.id).values()
+                    if topic_object.name == topic
+                ),
+                None,
+            )
+            if topic_object is not None:
+                # Topics whose names slugify to the same slug have numbered slugs.
+                query = topic_object.slug
+                try:
+                    # verify this topic exists, and set up a filter for it
+                    blog_page.extract_topic_information(query)
+                except ObjectDoesNotExist:
+                    # do nothing
+                    pass
 
         # get the entries based on prefiltering
         entries = blog_page.get_entries(context)
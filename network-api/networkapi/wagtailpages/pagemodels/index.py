@@ -3,13 +3,14 @@ import re
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
 from django.db import models
 from django.http import JsonResponse
 from django.template import loader
 from taggit.models import Tag
 from wagtail.admin.edit_handlers import FieldPanel
 from wagtail.contrib.routable_page.models import RoutablePageMixin, route
-from wagtail.core.models import Page
+from wagtail.core.models import Page, get_page_models
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
 from networkapi.wagtailpages.utils import (
@@ -22,6 +23,83 @@ from networkapi.wagtailpages.utils import (
 from .mixin.foundation_metadata import FoundationMetadataPageMixin
 
 
+class IndexEntries:
+    """
+    The ordered entries of an index page, held as `(page id, content type id)`
+    pairs so that they can be cached as plain data. Filtering, counting and
+    slicing are list operations; only slicing fetches the (specific) pages,
+    in a single query per slice. Pages that were unpublished since the entries
+    were cached are left out of the slice.
+    """
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.get_pages(self.rows))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.get_pages(self.rows[key])
+        return self.get_pages([self.rows[key]])[0]
+
+    @property
+    def ids(self):
+        return [page_id for page_id, _ in self.rows]
+
+    @staticmethod
+    def get_pages(rows):
+        if not rows:
+            return []
+        pages = Page.objects.live().public().filter(pk__in=[page_id for page_id, _ in rows]).specific().in_bulk()
+        return [pages[page_id] for page_id, _ in rows if page_id in pages]
+
+    def filter_ids(self, ids):
+        ids = set(ids)
+        return IndexEntries(row for row in self.rows if row[0] in ids)
+
+    def exclude_ids(self, ids):
+        ids = set(ids)
+        return IndexEntries(row for row in self.rows if row[0] not in ids)
+
+    def not_type(self, model):
+        """Leave out entries of `model` or any of its subclasses, like `PageQuerySet.not_type`."""
+        content_types = ContentType.objects.get_for_models(
+            *[page_model for page_model in get_page_models() if issubclass(page_model, model)]
+        )
+        content_type_ids = {content_type.id for content_type in content_types.values()}
+        return IndexEntries(row for row in self.rows if row[1] not in content_type_ids)
+
+
+def get_tagged_page_models():
+    """
+    All page models with a `tags` field, e.g. blog pages.
+    """
+    tagged_page_models = []
+    for page_model in get_page_models():
+        try:
+            page_model._meta.get_field("tags")
+        except FieldDoesNotExist:
+            continue
+        tagged_page_models.append(page_model)
+    return tagged_page_models
+
+
+def filter_pages_by_tags(queryset, tag_slugs):
+    """
+    Filter a page queryset down to the pages that have ANY of the given tags,
+    by matching against the tag through table of every tagged page model.
+    """
+    tagged = models.Q(pk__in=[])
+    for page_model in get_tagged_page_models():
+        through = page_model._meta.get_field("tags").remote_field.through
+        tagged |= models.Q(pk__in=through.objects.filter(tag__slug__in=tag_slugs).values("content_object_id"))
+    return queryset.filter(tagged)
+
+
 class IndexPage(FoundationMetadataPageMixin, RoutablePageMixin, Page):
     """
     This is a page type for creating "index" pages that
@@ -86,24 +164,30 @@ class IndexPage(FoundationMetadataPageMixin, RoutablePageMixin, Page):
         return context
 
     def get_cache_key(self, locale):
-        return f"index_items_{self.slug}_{locale}"
+        return f"index_entries_{self.slug}_{locale}"
 
     def clear_index_page_cache(self, locale):
         cache.delete(self.get_cache_key(locale))
 
+    def get_entries_queryset(self):
+        """
+        All (live) child pages, ordered "newest first".
+        """
+        return self.get_children().live().public().order_by("-first_published_at", "title")
+
     def get_all_entries(self, locale):
         """
         Get all (live) child entries, ordered "newest first",
         ideally from cache, or "anew" if the cache expired.
         """
         cache_key = self.get_cache_key(locale)
-        child_set = cache.get(cache_key)
+        rows = cache.get(cache_key)
 
-        if child_set is None:
-            child_set = self.get_children().live().public().order_by("-first_published_at", "title")
-            cache.set(cache_key, child_set, settings.INDEX_PAGE_CACHE_TIMEOUT)
+        if rows is None:
+            rows = list(self.get_entries_queryset().values_list("id", "content_type_id"))
+            cache.set(cache_key, rows, settings.INDEX_PAGE_CACHE_TIMEOUT)
 
-        return child_set
+        return IndexEntries(rows)
 
     def get_entries(self, context=dict()):
         """
@@ -136,37 +220,19 @@ class IndexPage(FoundationMetadataPageMixin, RoutablePageMixin, Page):
 
     def filter_entries_for_tag(self, entries, context):
         """
-        Realise the 'entries' queryset and filter it for tags presences.
-        We need to perform this realisation because there is no guarantee
-        that all children for this IndexPage in fact have a `tags` field,
-        so in order to test this each entry needs to be "cast" into its
-        specific model before we can test for whether i) there are tags
-        to work with and then ii) those tags match the specified ones.
+        Filter the entries down to those that have any of the specified
+        tags. The tags are matched in the database, against the tag tables
+        of all page types that have tags, so only the ids of the matching
+        entries are fetched, and they keep any filtering done before.
         """
         terms = self.filtered.get("terms")
 
-        # "unsluggify" all terms. Note that we cannot use list comprehension,
-        # as not all terms might be real tags, and list comprehension cannot
-        # be made to ignore throws.
-        context["terms"] = list()
-        for term in terms:
-            try:
-                tag = Tag.objects.get(slug=term)
-                context["terms"].append(str(tag))
-            except Tag.DoesNotExist:
-                # ignore non-existent tags
-                pass
-
-        entries = [
-            entry
-            for entry in entries.specific()
-            if hasattr(entry, "tags") and not
-            # Determine whether there is any overlap between 'all tags' and
-            # the tags specified. This effects ANY matching (rather than ALL).
-            set([tag.slug for tag in entry.tags.all()]).isdisjoint(terms)
-        ]
+        # "unsluggify" all terms, ignoring any that are not real tags.
+        tag_names = dict(Tag.objects.filter(slug__in=terms).values_list("slug", "name"))
+        context["terms"] = [tag_names[term] for term in terms if term in tag_names]
 
-        return entries
+        tagged_ids = filter_pages_by_tags(Page.objects.filter(pk__in=entries.ids), terms).values_list("pk", flat=True)
+        return entries.filter_ids(tagged_ids)
 
     """
     Sub routes
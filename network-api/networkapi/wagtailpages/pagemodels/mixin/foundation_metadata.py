@@ -1,75 +1,132 @@
+from django.core.cache import cache
+from django.utils.functional import cached_property
 from taggit.models import Tag
 from wagtail.images.models import Image
 from wagtailmetadata.models import MetadataPageMixin
 
+from networkapi.utility.cache_versions import bump_cache_version, get_cache_version
+
 default_social_share_tag = None
 default_social_share_image = None
 
+INHERITED_METADATA_CACHE_TIMEOUT = 60 * 60 * 24
+INHERITED_METADATA_VERSION_KEY = "inherited_metadata_version"
+
+
+def get_default_social_share_image():
+    """
+    The first Wagtail image that has the "social share image" tag is the default
+    image in social shares, when no image is set on a page or its ancestors.
+
+    This is looked up once in the life-time of the server, the first time
+    it is needed. After that, the default social share image is cached.
+    """
+    # necessary because we're going to reassign them, rather than
+    # assign same-named vars in local scope:
+    global default_social_share_tag, default_social_share_image
+
+    if default_social_share_tag is None:
+        # get the tag with name "social share image"
+        default_share_tag_name = "social share image"
+        tag, create = Tag.objects.get_or_create(name=default_share_tag_name)
+        default_social_share_tag = tag
+
+        # then find an image in the CMS that uses that tag (defaulting to `None`):
+        default_social_share_image = Image.objects.filter(tags=default_social_share_tag).first()
+
+    return default_social_share_image
+
+
+def get_inherited_metadata_version():
+    return get_cache_version(INHERITED_METADATA_VERSION_KEY)
+
+
+def resolve_inherited_metadata(page):
+    """
+    Return the search description and share image of the nearest ancestors of
+    `page` that have them set, loading all ancestors at once.
+    """
+    ancestors = list(page.get_ancestors().order_by("-depth"))
+
+    description = next((ancestor.search_description for ancestor in ancestors if ancestor.search_description), None)
+
+    # Share images are stored per page type, so look them up with one query
+    # for every page type among the ancestors that has a share image field.
+    ancestor_ids_by_model = {}
+    for ancestor in ancestors:
+        model = ancestor.specific_class
+        if model is not None and issubclass(model, MetadataPageMixin):
+            ancestor_ids_by_model.setdefault(model, []).append(ancestor.pk)
+
+    image_ids = {}
+    for model, ancestor_ids in ancestor_ids_by_model.items():
+        image_ids.update(
+            model.objects.filter(pk__in=ancestor_ids, search_image__isnull=False).values_list("pk", "search_image_id")
+        )
+
+    image_id = next((image_ids[ancestor.pk] for ancestor in ancestors if ancestor.pk in image_ids), None)
+    image = Image.objects.filter(pk=image_id).first() if image_id else None
+    return description, image
+
+
+def get_inherited_metadata(page):
+    """
+    Return the inherited search description and share image for `page`, which
+    are cached per parent page until a page with children is published or moved.
+    """
+    parent_path = page.path[: -page.steplen]
+    if not parent_path:
+        return None, None
+
+    cache_key = f"inherited_metadata_{parent_path}_{get_inherited_metadata_version()}"
+    metadata = cache.get(cache_key)
+
+    if metadata is None:
+        metadata = resolve_inherited_metadata(page)
+        cache.set(cache_key, metadata, INHERITED_METADATA_CACHE_TIMEOUT)
+
+    return metadata
+
+
+def invalidate_inherited_metadata():
+    bump_cache_version(INHERITED_METADATA_VERSION_KEY)
+
 
 # Override the MetadataPageMixin to allow for a default
 # description and image in page metadata for all Pages on the site
 class FoundationMetadataPageMixin(MetadataPageMixin):
-    def __init__(self, *args, **kwargs):
-        # The first Wagtail image returned that has the specified tag name will
-        # be the default image URL in social shares when no Image is specified at the Page level
-        super().__init__(*args, **kwargs)
-
-        # This will run once in the life-time of the server, when the first page instance
-        # that inherits this mixin gets instantiated. After that, this code will not kick
-        # in, and the default social share image is cached.
-        if default_social_share_tag is None:
-            self.set_default_social_share_tag_and_image()
-
     # Change this string to update the default description of all pages on the site
     default_description = (
         "Mozilla is a global non-profit dedicated to putting you in control of your online "
         "experience and shaping the future of the web for the public good. "
     )
 
+    @cached_property
+    def inherited_metadata(self):
+        return get_inherited_metadata(self)
+
     def get_meta_description(self):
         if self.search_description:
             return self.search_description
 
-        parent = self.get_parent()
-
-        while parent:
-            if parent.search_description:
-                return parent.search_description
-            parent = parent.get_parent()
-
-        return self.default_description
-
-    def set_default_social_share_tag_and_image(self):
-        # necessary because we're going to reassign them, rather than
-        # assign same-named vars in local scope:
-        global default_social_share_tag, default_social_share_image
-
-        # get the tag with name "social share image"
-        default_share_tag_name = "social share image"
-        tag, create = Tag.objects.get_or_create(name=default_share_tag_name)
-        default_social_share_tag = tag
-
-        # then find an image in the CMS that uses that tag (defaulting to `None`):
-        default_social_share_image = Image.objects.filter(tags=default_social_share_tag).first()
+        # If not, use the search description of the nearest ancestor that has one.
+        description, image = self.inherited_metadata
+        return description or self.default_description
 
     def get_meta_image(self):
         # If we have a local social share image, use that
         if self.search_image:
             return self.search_image
 
-        # If not, walk up our ancestor chain and use the first social
-        # share image for an ancestor that explicitly has one set.
-        parent = self.get_parent().specific
-        while parent:
-            if hasattr(parent, "search_image") and parent.search_image:
-                return parent.search_image
-            if hasattr(parent, "homepage") and parent.homepage.search_image:
-                return parent.homepage.search_image
-            parent = parent.get_parent()
+        # If not, use the social share image of the nearest
+        # ancestor that explicitly has one set.
+        description, image = self.inherited_metadata
+        if image:
+            return image
 
         # We still haven't found a social share image, so, last resort: return
         # whatever is the default social share image. Which could be `None`!
-        return default_social_share_image
+        return get_default_social_share_image()
 
     class Meta:
         abstract = True
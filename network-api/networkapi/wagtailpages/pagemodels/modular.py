@@ -4,6 +4,7 @@ from wagtail.core.fields import StreamField
 from wagtail.core.models import Page
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
+from ..pulse import prefetch_pulse_profiles
 from ..utils import get_page_tree_information, set_main_site_nav_information
 from .customblocks.base_fields import base_fields
 from .mixin.foundation_metadata import FoundationMetadataPageMixin
@@ -67,6 +68,7 @@ class ModularPage(FoundationMetadataPageMixin, Page):
 
     def get_context(self, request):
         context = super().get_context(request)
+        prefetch_pulse_profiles(self.body)
         return set_main_site_nav_information(self, context, "Homepage")
 
 
@@ -5,6 +5,7 @@ from wagtail.core.models import Page
 from wagtail.images.edit_handlers import ImageChooserPanel
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
+from ..pulse import prefetch_pulse_profiles
 from ..utils import get_page_tree_information, set_main_site_nav_information
 from .customblocks.base_fields import base_fields
 from .mixin.foundation_banner_inheritance import FoundationBannerInheritanceMixin
@@ -102,6 +103,7 @@ class PrimaryPage(FoundationMetadataPageMixin, FoundationBannerInheritanceMixin,
 
     def get_context(self, request):
         context = super().get_context(request)
+        prefetch_pulse_profiles(self.body)
         context = set_main_site_nav_information(self, context, "Homepage")
         context = get_page_tree_information(self, context)
         return context
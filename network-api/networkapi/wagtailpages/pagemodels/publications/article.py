@@ -1,5 +1,6 @@
 from django import forms
 from django.db import models
+from django.utils.functional import cached_property
 from modelcluster.fields import ParentalKey
 from wagtail.admin.edit_handlers import (
     FieldPanel,
@@ -17,7 +18,9 @@ from wagtail_color_panel.fields import ColorField
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
 from networkapi.wagtailpages.pagemodels.profiles import Profile
-from networkapi.wagtailpages.pagemodels.publications.publication import PublicationPage
+from networkapi.wagtailpages.pagemodels.publications.structure import (
+    get_publication_structure,
+)
 from networkapi.wagtailpages.utils import (
     TitleWidget,
     get_plaintext_titles,
@@ -54,6 +57,9 @@ class ArticlePage(FoundationMetadataPageMixin, Page):
     subpage_types: list = []
     body = StreamField(article_fields)
 
+    # The slugs and text of the headings in `body`, as derived by `full_clean()`.
+    page_titles = models.JSONField(default=list, blank=True, editable=False)
+
     toc_thumbnail_image = models.ForeignKey(
         "wagtailimages.Image",
         null=True,
@@ -239,10 +245,13 @@ class ArticlePage(FoundationMetadataPageMixin, Page):
         TranslatableField("footnotes"),
     ]
 
+    @cached_property
+    def publication_structure(self):
+        return get_publication_structure(self)
+
     @property
     def is_publication_article(self):
-        parent = self.get_parent().specific
-        return parent.__class__ is PublicationPage
+        return self.publication_structure.is_publication_article(self)
 
     @property
     def next_page(self):
@@ -256,23 +265,7 @@ class ArticlePage(FoundationMetadataPageMixin, Page):
         Otherwise if the parent page is a Publication page: look for the next sibling,
         if there is no next sibling page, return this pages' parent.
         """
-
-        parent = self.get_parent().specific
-        next_page = self.get_siblings().filter(path__gt=self.path, live=True).first()
-        if parent.is_chapter_page:
-            # if there is no next page look for the next chapter
-            if not next_page:
-                next_page = parent.get_siblings().filter(path__gt=self.path, live=True).first()
-                # if there is no next chapter return to the parent.get_parent()
-                if not next_page:
-                    next_page = parent.get_parent()
-        else:
-            # Parent is a PublicationPage, not a chapter page
-            # if there is no next page, return the parent
-            if not next_page:
-                next_page = parent
-
-        return next_page
+        return self.publication_structure.get_next_page(self)
 
     @property
     def prev_page(self):
@@ -281,36 +274,18 @@ class ArticlePage(FoundationMetadataPageMixin, Page):
 
         Check the parent page type. If the parent page type is a "Chapter Page",
         then look for siblings of `this` page. If no previous sibling can be found
-        look for the parent page previous sibling. And if that cannot be found,
-        return the Chapter Page's parent (Publication Page).
+        return the Chapter Page, or if that is not live, the previous chapter. And if
+        that cannot be found, return the Chapter Page's parent (Publication Page).
         Otherwise if the parent page is a Publication page: look for the previous sibling,
         if there is no previous sibling page, return this pages' parent.
         """
-
-        parent = self.get_parent().specific
-        prev_page = self.get_siblings().filter(path__lt=self.path, live=True).reverse().first()
-        if parent.is_chapter_page:
-            # look for the previous page in this chapter
-            # if there is no previous page look for the previous chapter
-            if not prev_page:
-                prev_page = parent.get_siblings().filter(path__lt=self.path, live=True).reverse().first()
-                # if there is no previous chapter return to the parent.get_parent()
-                if not prev_page:
-                    prev_page = parent.get_parent()
-        else:
-            # Parent is a PublicationPage, not a chapter page
-            # look for the previous page in this publication
-            # if there is no previous page, return the parent
-            if not prev_page:
-                prev_page = parent
-
-        return prev_page
+        return self.publication_structure.get_prev_page(self)
 
     def breadcrumb_list(self):
         """
-        Get all the parent PublicationPages and return a QuerySet
+        Get all the parent PublicationPages and return a list
         """
-        return Page.objects.ancestor_of(self).type(PublicationPage).live()
+        return self.publication_structure.get_breadcrumbs(self)
 
     @property
     def zen_nav(self):
@@ -318,12 +293,28 @@ class ArticlePage(FoundationMetadataPageMixin, Page):
 
     @property
     def get_page_titles(self):
-        return get_plaintext_titles(None, self.body, "content")
+        return tuple(tuple(title) for title in self.page_titles)
+
+    def full_clean(self, *args, **kwargs):
+        # Pages are cleaned when they are saved or published, and before they are
+        # previewed, so the headings only need to be parsed out of the body then.
+        self.page_titles = get_plaintext_titles(None, self.body, "content")
+        super().full_clean(*args, **kwargs)
 
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
-        # Add get_titles to the page context. This is in get_context() because
-        # we need access to the `request` object
+        # Add get_titles to the page context.
         # menu_items is required for zen_nav in the templates
-        context["get_titles"] = get_plaintext_titles(request, self.body, "content")
+        context["get_titles"] = self.get_page_titles
+
+        # The table of contents lists the publication the article is in, or
+        # for articles in a chapter, the publication the chapter is in.
+        structure = self.publication_structure
+        parent = structure.get_parent(self)
+        publication = structure.get_parent(parent) if structure.is_chapter(parent) else parent
+        if structure.is_publication(publication):
+            context["table_of_contents"] = {
+                "publication": publication,
+                "entries": structure.get_table_of_contents(publication, live=not request.user.is_authenticated),
+            }
         return set_main_site_nav_information(self, context, "Homepage")
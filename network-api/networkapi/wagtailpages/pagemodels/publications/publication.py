@@ -1,5 +1,6 @@
 from django import forms
 from django.db import models
+from django.utils.functional import cached_property
 from modelcluster.fields import ParentalKey
 from wagtail.admin.edit_handlers import FieldPanel, InlinePanel, MultiFieldPanel
 from wagtail.core.fields import RichTextField
@@ -12,6 +13,9 @@ from wagtail_color_panel.fields import ColorField
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
 from networkapi.wagtailpages.pagemodels.profiles import Profile
+from networkapi.wagtailpages.pagemodels.publications.structure import (
+    get_publication_structure,
+)
 from networkapi.wagtailpages.utils import set_main_site_nav_information
 
 from ..customblocks.base_rich_text_options import base_rich_text_options
@@ -251,6 +255,10 @@ class PublicationPage(FoundationMetadataPageMixin, Page):
         """
         return True
 
+    @cached_property
+    def publication_structure(self):
+        return get_publication_structure(self)
+
     @property
     def is_chapter_page(self):
         """
@@ -258,8 +266,7 @@ class PublicationPage(FoundationMetadataPageMixin, Page):
         "ChapterPage". The templates used very similar logic and structure, and
         all the fields are the same.
         """
-        parent = self.get_parent().specific
-        return parent.__class__ is PublicationPage
+        return self.publication_structure.is_chapter(self)
 
     @property
     def next_page(self):
@@ -267,13 +274,8 @@ class PublicationPage(FoundationMetadataPageMixin, Page):
         Only applies to Chapter Publication (sub-Publication Pages).
         Returns a Page object or None.
         """
-        next_page = self.get_parent()
-        if self.is_chapter_page:
-            sibling = self.get_siblings().filter(path__gt=self.path, live=True).first()
-            if sibling:
-                # If there is no more chapters. Return the parent page.
-                next_page = sibling
-        return next_page
+        # If there is no more chapters, or this is not a chapter, return the parent page.
+        return self.publication_structure.get_next_page(self) or self.get_parent()
 
     @property
     def prev_page(self):
@@ -281,13 +283,8 @@ class PublicationPage(FoundationMetadataPageMixin, Page):
         Only applies to Chapter Publication (sub-Publication Pages).
         Returns a Page object or None.
         """
-        prev_page = self.get_parent()
-        if self.is_chapter_page:
-            sibling = self.get_siblings().filter(path__lt=self.path, live=True).reverse().first()
-            if sibling:
-                # If there is no more chapters. Return the parent page.
-                prev_page = sibling
-        return prev_page
+        # If there is no more chapters, or this is not a chapter, return the parent page.
+        return self.publication_structure.get_prev_page(self) or self.get_parent()
 
     @property
     def zen_nav(self):
@@ -295,19 +292,14 @@ class PublicationPage(FoundationMetadataPageMixin, Page):
 
     def breadcrumb_list(self):
         """
-        Get all the parent PublicationPages and return a QuerySet
+        Get all the parent PublicationPages and return a list
         """
-        return Page.objects.ancestor_of(self).type(PublicationPage).live()
+        return self.publication_structure.get_breadcrumbs(self)
 
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
-        pages = []
-        for page in self.get_children():
-            if request.user.is_authenticated:
-                # User is logged in, and can preview a page. Get all pages, even drafts.
-                pages.append({"child": page, "grandchildren": page.get_children()})
-            elif page.live:
-                # User is not logged in AND this page is live. Only fetch live grandchild pages.
-                pages.append({"child": page, "grandchildren": page.get_children().live()})
-        context["child_pages"] = pages
+        # User is logged in, and can preview a page. Get all pages, even drafts.
+        # Otherwise only get live child and grandchild pages.
+        live = not request.user.is_authenticated
+        context["child_pages"] = self.publication_structure.get_table_of_contents(self, live=live)
         return set_main_site_nav_information(self, context, "Homepage")
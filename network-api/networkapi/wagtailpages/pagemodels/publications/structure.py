@@ -0,0 +1,229 @@
+"""
+Reading order of publications.
+
+A publication is a tree of publication pages and articles: the chapters of a
+publication are publication pages nested under it, and articles belong to a
+publication or one of its chapters. Articles and chapters link to the page
+before and after them, publication pages list their chapters and articles,
+and both show breadcrumbs of the publication pages above them.
+
+Rather than looking up parents and siblings with a few queries per link on
+every render, the whole tree of a publication is loaded with one query into a
+`PublicationStructure`, which answers all of the above from memory. Structures
+are cached per publication, and rebuilt when any publication page or article
+is saved, moved or deleted.
+"""
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from wagtail.core.models import Page
+
+from networkapi.utility.cache_versions import bump_cache_version, get_cache_version
+
+PUBLICATION_STRUCTURE_VERSION_KEY = "publication_structure_version"
+
+
+def get_parent_path(path):
+    return path[: -Page.steplen]
+
+
+class PublicationStructure:
+    """
+    All pages of a publication, as generic `Page` objects ordered by path.
+
+    `publication_content_type_id` is the content type of publication pages.
+    Pages that are not in the structure, such as unsaved pages that are
+    being previewed, are placed in it by their path.
+    """
+
+    def __init__(self, pages, publication_content_type_id):
+        self.pages = pages
+        self.publication_content_type_id = publication_content_type_id
+        self.pages_by_path = {page.path: page for page in pages}
+
+    @cached_property
+    def children(self):
+        children = {}
+        for page in self.pages:
+            children.setdefault(get_parent_path(page.path), []).append(page)
+        return children
+
+    def is_publication(self, page):
+        return page is not None and page.content_type_id == self.publication_content_type_id
+
+    def get_parent(self, page):
+        return self.pages_by_path.get(get_parent_path(page.path))
+
+    def get_children(self, page, live=False):
+        children = self.children.get(page.path, [])
+        if live:
+            return [child for child in children if child.live]
+        return list(children)
+
+    def get_next_sibling(self, page):
+        siblings = self.children.get(get_parent_path(page.path), [])
+        return next((sibling for sibling in siblings if sibling.path > page.path and sibling.live), None)
+
+    def get_prev_sibling(self, page):
+        siblings = self.children.get(get_parent_path(page.path), [])
+        return next((sibling for sibling in reversed(siblings) if sibling.path < page.path and sibling.live), None)
+
+    def is_chapter(self, page):
+        """
+        A publication page nested under a publication page is a chapter.
+        """
+        return self.is_publication(page) and self.is_publication(self.get_parent(page))
+
+    def is_publication_article(self, page):
+        return self.is_publication(self.get_parent(page))
+
+    def get_next_page(self, page):
+        """
+        Return the page after `page` in the reading order, or None if it
+        is not part of the publication's reading order.
+
+        The next page of a chapter is the next chapter, or its publication
+        after the last chapter. The next page of an article is the next
+        article of its publication or chapter, then the next chapter, and
+        finally the publication itself.
+        """
+        parent = self.get_parent(page)
+        if self.is_publication(page):
+            return (self.is_chapter(page) and self.get_next_sibling(page)) or parent
+
+        if not self.is_publication(parent):
+            return None
+        next_page = self.get_next_sibling(page)
+        if next_page is None and self.is_chapter(parent):
+            next_page = self.get_next_sibling(parent) or self.get_parent(parent)
+        return next_page or parent
+
+    def get_prev_page(self, page):
+        """
+        Return the page before `page` in the reading order, or None if it
+        is not part of the publication's reading order.
+
+        The previous page of a chapter is the previous chapter, or its
+        publication before the first chapter. The previous page of an article
+        is the previous article of its publication or chapter, then its
+        chapter, then the previous chapter, and finally the publication itself.
+        """
+        parent = self.get_parent(page)
+        if self.is_publication(page):
+            return (self.is_chapter(page) and self.get_prev_sibling(page)) or parent
+
+        if not self.is_publication(parent):
+            return None
+        prev_page = self.get_prev_sibling(page)
+        if prev_page is None and self.is_chapter(parent):
+            if parent.live:
+                prev_page = parent
+            else:
+                prev_page = self.get_prev_sibling(parent) or self.get_parent(parent)
+        return prev_page or parent
+
+    def get_table_of_contents(self, page, live=False):
+        """
+        Return the children of `page` with their own children, for a table of
+        contents, as `{"child": ..., "grandchildren": [...]}` entries. Tables
+        of contents show fields of the specific pages, so those are fetched
+        in bulk, with one query per page type.
+        """
+        children = [(child, self.get_children(child, live=live)) for child in self.get_children(page, live=live)]
+        page_ids = [entry.pk for child, grandchildren in children for entry in [child, *grandchildren]]
+        specific_pages = {page.pk: page for page in Page.objects.filter(pk__in=page_ids).specific()}
+        return [
+            {
+                "child": specific_pages[child.pk],
+                "grandchildren": [
+                    specific_pages[grandchild.pk] for grandchild in grandchildren if grandchild.pk in specific_pages
+                ],
+            }
+            for child, grandchildren in children
+            if child.pk in specific_pages
+        ]
+
+    def get_breadcrumbs(self, page):
+        """
+        Return the live publication pages above `page`, from the top down.
+        """
+        breadcrumbs = []
+        parent = self.get_parent(page)
+        while parent is not None:
+            if self.is_publication(parent) and parent.live:
+                breadcrumbs.append(parent)
+            parent = self.get_parent(parent)
+        return breadcrumbs[::-1]
+
+
+def get_publication_content_type_id():
+    return ContentType.objects.get_by_natural_key("wagtailpages", "publicationpage").id
+
+
+def find_publication_root(page, publication_content_type_id):
+    """
+    Return the id and path of the publication that `page` belongs to, the
+    topmost of the publication pages directly above or at `page`, or None.
+    """
+    ancestors = (
+        Page.objects.ancestor_of(page, inclusive=True).order_by("-path").values_list("id", "path", "content_type_id")
+    )
+    root = None
+    for page_id, path, content_type_id in ancestors:
+        if content_type_id == publication_content_type_id:
+            root = (page_id, path)
+        elif path != page.path:
+            # Articles are not publications, but belong to the one above them.
+            break
+    return root
+
+
+def build_publication_structure(root_path, publication_content_type_id):
+    pages = Page.objects.filter(path__startswith=root_path).order_by("path")
+    return PublicationStructure(list(pages), publication_content_type_id)
+
+
+def get_publication_structure_version():
+    return get_cache_version(PUBLICATION_STRUCTURE_VERSION_KEY)
+
+
+def get_publication_root_cache_key(page_id, version):
+    return f"publication_root_{page_id}_{version}"
+
+
+def get_publication_structure(page):
+    """
+    Return the structure of the publication that `page` belongs to,
+    or an empty structure if it does not belong to a publication.
+    """
+    version = get_publication_structure_version()
+    publication_content_type_id = get_publication_content_type_id()
+
+    # Which publication a page belongs to is cached as well, for all pages of
+    # a publication at once, so that their renders need no queries at all.
+    root_cache_key = get_publication_root_cache_key(page.pk, version)
+    root = cache.get(root_cache_key) if page.pk else None
+    if root is None:
+        root = find_publication_root(page, publication_content_type_id) or ()
+        if page.pk:
+            cache.set(root_cache_key, root, settings.INDEX_PAGE_CACHE_TIMEOUT)
+    if not root:
+        return PublicationStructure([], publication_content_type_id)
+
+    root_id, root_path = root
+    cache_key = f"publication_structure_{root_id}_{version}"
+    structure = cache.get(cache_key)
+    if structure is None:
+        structure = build_publication_structure(root_path, publication_content_type_id)
+        cache.set(cache_key, structure, settings.INDEX_PAGE_CACHE_TIMEOUT)
+        cache.set_many(
+            {get_publication_root_cache_key(page.pk, version): root for page in structure.pages},
+            settings.INDEX_PAGE_CACHE_TIMEOUT,
+        )
+    return structure
+
+
+def invalidate_publication_structure():
+    bump_cache_version(PUBLICATION_STRUCTURE_VERSION_KEY)
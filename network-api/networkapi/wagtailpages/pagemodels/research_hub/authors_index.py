@@ -1,16 +1,19 @@
 from django import http, shortcuts
 from django.db import models
-from django.utils import text as text_utils
 from wagtail import images as wagtail_images
 from wagtail.contrib.routable_page import models as routable_models
 from wagtail.core import models as wagtail_models
 from wagtail.images.edit_handlers import ImageChooserPanel
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
-from networkapi.wagtailpages import utils
+from networkapi.wagtailpages.locale_registry import locale_registry
 from networkapi.wagtailpages.pagemodels import profiles
 from networkapi.wagtailpages.pagemodels.research_hub import base as research_base
-from networkapi.wagtailpages.pagemodels.research_hub import detail_page, library_page
+from networkapi.wagtailpages.pagemodels.research_hub import (
+    detail_page,
+    facets,
+    library_page,
+)
 
 
 class ResearchAuthorsIndexPage(
@@ -47,14 +50,17 @@ class ResearchAuthorsIndexPage(
 
     def get_context(self, request):
         context = super().get_context(request)
-        author_profiles = profiles.Profile.objects.all()
-        author_profiles = author_profiles.filter_research_authors()
         # When the index is displayed in a non-default locale, then want to show
         # the profile associated with that locale. But, profiles do not necessarily
         # exist in all locales. We prefer showing the profile for the locale, but fall
-        # back to the profile on the default locale.
-        author_profiles = utils.localize_queryset(author_profiles)
-        context["author_profiles"] = author_profiles
+        # back to the profile on the default locale. The research facet index has
+        # these localized profiles as its author options.
+        facet_index = self.get_facet_index(request)
+        profile_ids = [profile_id for profile_id, _, _ in facet_index.options["author"]]
+        author_profiles = profiles.Profile.objects.select_related("image").in_bulk(profile_ids)
+        context["author_profiles"] = [
+            author_profiles[profile_id] for profile_id in profile_ids if profile_id in author_profiles
+        ]
         context["breadcrumbs"] = self.get_breadcrumbs()
         return context
 
@@ -65,27 +71,49 @@ class ResearchAuthorsIndexPage(
         profile_id: str,
         profile_slug: str,
     ):
-        context_overrides = self.get_author_detail_context(profile_id=int(profile_id))
+        author_stats = self.get_facet_index(request).get_author_stats(int(profile_id))
+        if author_stats is None:
+            raise http.Http404("No research author found for this id")
 
-        slugified_profile_name = text_utils.slugify(context_overrides["author_profile"].name)
-        if not slugified_profile_name == profile_slug:
+        if not author_stats["slug"] == profile_slug:
             raise http.Http404("Slug does not fit profile name")
 
+        context_overrides = self.get_author_detail_context(profile_id=int(profile_id), author_stats=author_stats)
+
         return self.render(
             request=request,
             template="wagtailpages/research_author_detail_page.html",
             context_overrides=context_overrides,
         )
 
-    def get_author_detail_context(self, profile_id: int):
-        research_author_profiles = profiles.Profile.objects.filter_research_authors()
-        author_profile = shortcuts.get_object_or_404(
-            research_author_profiles,
-            id=profile_id,
-        )
-
-        author_research_count = self.get_author_research(author_profile).count()
-        latest_research = self.get_latest_research(author_profile)
+    def get_facet_index(self, request):
+        """
+        Return the research facet index of the active locale, loading
+        it from the cache only once per request.
+        """
+        if request is None:
+            return facets.get_research_facet_index(locale_registry.get_active())
+        if not hasattr(request, "research_facet_index"):
+            request.research_facet_index = facets.get_research_facet_index(locale_registry.get_active())
+        return request.research_facet_index
+
+    def get_author_stats(self, profile_id: int, locale):
+        """
+        Return the research stats of an author in `locale`, as
+        `ResearchFacetIndex.get_author_stats` does.
+        """
+        return facets.get_research_facet_index(locale).get_author_stats(profile_id)
+
+    def get_author_detail_context(self, profile_id: int, author_stats=None):
+        # `author_detail` passes the stats it already looked up.
+        if author_stats is None:
+            author_stats = self.get_author_stats(profile_id, locale_registry.get_active())
+        if author_stats is None:
+            raise http.Http404("No research author found for this id")
+        author_profile = shortcuts.get_object_or_404(profiles.Profile, id=profile_id)
+
+        author_research_count = author_stats["research_count"]
+        latest_research = self.get_latest_research(author_profile, author_stats=author_stats)
 
         # On author detail pages to include the link to the authors index.
         detail_page_breadcrumbs = self.get_breadcrumbs(include_self=True)
@@ -98,28 +126,15 @@ class ResearchAuthorsIndexPage(
             "library_page": library_page.ResearchLibraryPage.objects.first(),
         }
 
-    def get_latest_research(self, author_profile):
-        LATEST_RESEARCH_COUNT_LIMIT = 3
-        author_research = self.get_author_research(author_profile)
-        author_research = author_research.order_by("-original_publication_date")
-        latest_research = author_research[:LATEST_RESEARCH_COUNT_LIMIT]
-        return latest_research
-
-    def get_author_research(self, author_profile):
-        author_research = detail_page.ResearchDetailPage.objects.all()
-        # During tree sync, an alias is created for every detail page. But, these
-        # aliases are still associated with the profile in the default locale. So, when
-        # displaying the author page for a non-default locale author, we also want to
-        # the detail pages for active locale that are still associated with the default
-        # locales author. We know the default locale's author will have the same
-        # `translation_key` as the current locale's author. So, instead of filtering
-        # for the author `id`, we filter by `translation_key`.
-        author_research = author_research.filter(
-            research_authors__author_profile__translation_key=(author_profile.translation_key)
-        )
-        # And then we fitler for the active locale.
-        author_research = author_research.filter(locale=wagtail_models.Locale.get_active())
-        return author_research
+    def get_latest_research(self, author_profile, author_stats=None):
+        if author_stats is None:
+            author_stats = self.get_author_stats(author_profile.id, locale_registry.get_active())
+        if author_stats is None:
+            return []
+
+        latest_research_ids = author_stats["latest_research_ids"]
+        latest_research = detail_page.ResearchDetailPage.objects.in_bulk(latest_research_ids)
+        return [latest_research[page_id] for page_id in latest_research_ids if page_id in latest_research]
 
     def get_banner(self):
         return self.banner_image
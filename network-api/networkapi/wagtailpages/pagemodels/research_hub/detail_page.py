@@ -151,7 +151,7 @@ class ResearchDetailPage(research_base.ResearchHubBasePage):
     ]
 
     search_fields = wagtail_models.Page.search_fields + [
-        index.SearchField("introduction"),
+        index.SearchField("introduction", boost=4),
         index.SearchField("overview"),
         index.SearchField("collaborators"),
         index.FilterField("original_publication_date"),  # For sorting
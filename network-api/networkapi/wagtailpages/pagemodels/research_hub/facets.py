@@ -0,0 +1,344 @@
+"""
+Per-locale facet index for the research library.
+
+The research library filters live research detail pages by author, topic,
+region and publication year, and lists every option of those filters. Pages
+are filtered by the `translation_key` of their authors, topics and regions,
+so that aliased pages, whose relations still point at the default locale's
+objects, show up for the localized options too.
+
+Rather than adding a join per selected option and running a DISTINCT ON query
+per option list on every request, the facets of all live research detail
+pages in a locale are loaded into an index mapping every option to the set of
+pages that have it. Filtering intersects those sets, and option counts are
+the sizes of their intersections with the filtered pages. The same index
+provides the research count, latest research and slug of every author for
+the authors index.
+
+The index is cached per locale. Saving or deleting a research detail page,
+or one of its author, topic or region relations, marks that page as changed,
+and once the transaction commits, each changed page is updated in every
+cached index. If another process is updating the indexes at the same time,
+they are rebuilt instead of overwriting each other's changes, as they also
+are on changes to profiles, topics and regions, which are the option labels.
+"""
+import datetime
+import heapq
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import text as text_utils
+from django.utils.translation import pgettext_lazy
+
+from networkapi.utility.cache_versions import bump_cache_version, get_cache_version
+from networkapi.wagtailpages.locale_registry import locale_registry
+from networkapi.wagtailpages.pagemodels import profiles as profile_models
+from networkapi.wagtailpages.pagemodels.research_hub import (
+    detail_page,
+    relations,
+    taxonomies,
+)
+
+RESEARCH_FACET_INDEX_VERSION_KEY = "research_facet_index_version"
+RESEARCH_FACET_INDEX_LOCK_KEY = "research_facet_index_lock"
+RESEARCH_FACET_INDEX_LOCK_TIMEOUT = 30
+
+FACETS = ("author", "topic", "region")
+
+LATEST_RESEARCH_COUNT = 3
+
+# The IDs of pages that changed in the current transaction.
+_changed = threading.local()
+
+
+def get_facet_relations():
+    """
+    Return the relation model and related field name of every facet.
+    """
+    return {
+        "author": (relations.ResearchAuthorRelation, "author_profile"),
+        "topic": (relations.ResearchDetailPageResearchTopicRelation, "research_topic"),
+        "region": (relations.ResearchDetailPageResearchRegionRelation, "research_region"),
+    }
+
+
+def get_facet_option_querysets():
+    return {
+        "author": profile_models.Profile.objects.filter_research_authors(),
+        "topic": taxonomies.ResearchTopic.objects.all(),
+        "region": taxonomies.ResearchRegion.objects.all(),
+    }
+
+
+class ResearchFacetIndex:
+    """
+    Facets of all live research detail pages in one locale.
+
+    `options` maps every facet to its localized options, as
+    `(id, label, translation key)` tuples, `option_keys` maps every facet
+    to the translation key of every object id that can be filtered for, and
+    `author_names` maps the ids of all author profiles to their names.
+    """
+
+    def __init__(self, options, option_keys, author_names=None):
+        self.options = options
+        self.option_keys = option_keys
+        self.author_slugs = {profile_id: text_utils.slugify(name) for profile_id, name in (author_names or {}).items()}
+        self.page_dates = {}
+        self.page_keys = {}
+        self.members = {facet: defaultdict(set) for facet in FACETS}
+
+    def __len__(self):
+        return len(self.page_dates)
+
+    def add_page(self, page_id, publication_date, keys):
+        """
+        Add or replace a page, with `keys` mapping every
+        facet to the translation keys the page has for it.
+        """
+        self.remove_page(page_id)
+        self.page_dates[page_id] = publication_date
+        self.page_keys[page_id] = {facet: set(keys.get(facet, ())) for facet in FACETS}
+        for facet in FACETS:
+            for key in self.page_keys[page_id][facet]:
+                self.members[facet][key].add(page_id)
+
+    def remove_page(self, page_id):
+        self.page_dates.pop(page_id, None)
+        keys = self.page_keys.pop(page_id, {})
+        for facet in FACETS:
+            for key in keys.get(facet, ()):
+                page_ids = self.members[facet].get(key)
+                if page_ids is not None:
+                    page_ids.discard(page_id)
+                    if not page_ids:
+                        del self.members[facet][key]
+
+    def filter(self, selected, year=None):
+        """
+        Return the ids of the pages that have all options in `selected`,
+        which maps facets to object ids, and were published in `year`.
+
+        Returns None if nothing is filtered for, as object ids
+        that cannot be filtered for are ignored.
+        """
+        page_ids = None
+        for facet, object_ids in selected.items():
+            for object_id in object_ids:
+                key = self.option_keys[facet].get(object_id)
+                if key is None:
+                    continue
+                members = self.members[facet].get(key, set())
+                page_ids = set(members) if page_ids is None else page_ids & members
+
+        if year:
+            year_page_ids = {page_id for page_id, date in self.page_dates.items() if date and date.year == year}
+            page_ids = year_page_ids if page_ids is None else page_ids & year_page_ids
+
+        return page_ids
+
+    def get_options(self, facet, page_ids=None):
+        """
+        Return the options of a facet, with the number of
+        pages out of `page_ids` (or all pages) that have them.
+        """
+        members = self.members[facet]
+        options = []
+        for object_id, label, key in self.options[facet]:
+            option_page_ids = members.get(key, set())
+            options.append(
+                {
+                    "id": object_id,
+                    "value": object_id,
+                    "label": label,
+                    "count": len(option_page_ids if page_ids is None else option_page_ids & page_ids),
+                }
+            )
+        return options
+
+    def get_year_options(self, page_ids=None):
+        """
+        Return an "any" option and an option for every year a page
+        was published in, with the number of pages out of `page_ids`
+        (or all pages) published in that year, newest first.
+        """
+        counts = defaultdict(int)
+        for page_id, date in self.page_dates.items():
+            if date is not None:
+                counts[date.year] += page_ids is None or page_id in page_ids
+
+        year_options = [
+            {
+                "id": year,
+                "value": year,
+                "label": year,
+                "count": counts[year],
+            }
+            for year in sorted(counts, reverse=True)
+        ]
+        empty_option = {
+            "id": "any",
+            "value": "",
+            "label": pgettext_lazy("Option in a list of years", "Any"),
+            "count": len(self if page_ids is None else page_ids),
+        }
+        return [empty_option] + year_options
+
+    def get_author_stats(self, profile_id):
+        """
+        Return the number of pages by an author, the ids of their latest
+        pages, newest first, and the slug of their name, or None if
+        `profile_id` is not the id of a research author.
+
+        Any version of an author's profile gives the same pages.
+        """
+        key = self.option_keys["author"].get(profile_id)
+        if key is None:
+            return None
+
+        page_ids = self.members["author"].get(key, set())
+        latest_research_ids = heapq.nlargest(
+            LATEST_RESEARCH_COUNT,
+            page_ids,
+            key=lambda page_id: (self.page_dates[page_id] or datetime.date.min, page_id),
+        )
+        return {
+            "research_count": len(page_ids),
+            "latest_research_ids": latest_research_ids,
+            "slug": self.author_slugs.get(profile_id),
+        }
+
+
+def get_page_facets(page_ids):
+    """
+    Return a mapping of page id to a mapping of facet to translation
+    keys for the given pages, with one query per facet.
+    """
+    page_facets = defaultdict(lambda: defaultdict(set))
+    for facet, (model, field_name) in get_facet_relations().items():
+        rows = model.objects.filter(research_detail_page_id__in=page_ids).values_list(
+            "research_detail_page_id", f"{field_name}__translation_key"
+        )
+        for page_id, key in rows:
+            page_facets[page_id][facet].add(key)
+    return page_facets
+
+
+def build_research_facet_index(locale):
+    """
+    Return the facet index for all live research detail pages in `locale`,
+    with the options of `locale`, or the default locale's if there is no
+    localized version. Objects of all locales can be filtered for.
+    """
+    default_locale = locale_registry.get_default()
+
+    options = {}
+    option_keys = {}
+    option_names = {}
+    for facet, queryset in get_facet_option_querysets().items():
+        localized = {}
+        option_keys[facet] = {}
+        option_names[facet] = {}
+        for object_id, name, key, locale_id in queryset.values_list("id", "name", "translation_key", "locale_id"):
+            option_keys[facet][object_id] = key
+            option_names[facet][object_id] = name
+            if locale_id == locale.id or (locale_id == default_locale.id and key not in localized):
+                localized[key] = (object_id, name, key)
+        options[facet] = sorted(localized.values(), key=lambda option: (option[1], option[0]))
+
+    index = ResearchFacetIndex(options, option_keys, author_names=option_names["author"])
+
+    pages = detail_page.ResearchDetailPage.objects.live().filter(locale=locale)
+    page_facets = get_page_facets(pages.values("id"))
+    for page_id, publication_date in pages.values_list("id", "original_publication_date"):
+        index.add_page(page_id, publication_date, page_facets[page_id])
+
+    return index
+
+
+def get_research_facet_index_version():
+    return get_cache_version(RESEARCH_FACET_INDEX_VERSION_KEY)
+
+
+def get_research_facet_index_cache_key(locale_id, version):
+    return f"research_facet_index_{locale_id}_{version}"
+
+
+def get_research_facet_index(locale):
+    cache_key = get_research_facet_index_cache_key(locale.id, get_research_facet_index_version())
+    index = cache.get(cache_key)
+
+    if index is None:
+        index = build_research_facet_index(locale)
+        cache.set(cache_key, index, settings.INDEX_PAGE_CACHE_TIMEOUT)
+
+    return index
+
+
+def get_changed_page_ids():
+    if not hasattr(_changed, "page_ids"):
+        _changed.page_ids = set()
+    return _changed.page_ids
+
+
+def mark_research_facets_changed(page_id):
+    """
+    Update a research detail page in all cached facet indexes
+    when the current transaction commits.
+    """
+    get_changed_page_ids().add(page_id)
+    transaction.on_commit(update_changed_research_facets)
+
+
+def update_changed_research_facets():
+    page_ids = get_changed_page_ids()
+    if page_ids:
+        changed = set(page_ids)
+        page_ids.clear()
+        update_research_facet_index(changed)
+
+
+def update_research_facet_index(page_ids):
+    """
+    Update research detail pages in all cached facet indexes.
+    """
+    if not cache.add(RESEARCH_FACET_INDEX_LOCK_KEY, True, RESEARCH_FACET_INDEX_LOCK_TIMEOUT):
+        # The indexes can't be updated atomically, and another
+        # process's update would overwrite this one or the other way round.
+        invalidate_research_facet_index()
+        return
+
+    try:
+        version = get_research_facet_index_version()
+        cache_keys = {
+            get_research_facet_index_cache_key(locale.id, version): locale.id
+            for locale in locale_registry.locales.values()
+        }
+        indexes = cache.get_many(cache_keys.keys())
+        if not indexes:
+            return
+
+        pages = {
+            page_id: (locale_id, publication_date)
+            for page_id, locale_id, publication_date in detail_page.ResearchDetailPage.objects.filter(
+                pk__in=page_ids, live=True
+            ).values_list("id", "locale_id", "original_publication_date")
+        }
+        page_facets = get_page_facets(list(pages))
+        for cache_key, index in indexes.items():
+            for page_id in page_ids:
+                index.remove_page(page_id)
+                locale_id, publication_date = pages.get(page_id, (None, None))
+                if locale_id == cache_keys[cache_key]:
+                    index.add_page(page_id, publication_date, page_facets[page_id])
+
+        cache.set_many(indexes, settings.INDEX_PAGE_CACHE_TIMEOUT)
+    finally:
+        cache.delete(RESEARCH_FACET_INDEX_LOCK_KEY)
+
+
+def invalidate_research_facet_index():
+    bump_cache_version(RESEARCH_FACET_INDEX_VERSION_KEY)
@@ -1,20 +1,17 @@
 import collections
 from typing import Optional
 
-from django.core import paginator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from django.utils.translation import pgettext_lazy
 from wagtail import images as wagtail_images
 from wagtail.admin import edit_handlers as panels
-from wagtail.core import models as wagtail_models
 from wagtail.images import edit_handlers as image_panels
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
-from networkapi.wagtailpages import utils
-from networkapi.wagtailpages.pagemodels import profiles as profile_models
+from networkapi.utility.search import SearchResultsPaginator
+from networkapi.wagtailpages.locale_registry import locale_registry
 from networkapi.wagtailpages.pagemodels.research_hub import base as research_base
-from networkapi.wagtailpages.pagemodels.research_hub import detail_page, taxonomies
+from networkapi.wagtailpages.pagemodels.research_hub import detail_page, facets
 
 # We don't want to expose the actual database column value that we use for sorting.
 # Therefore, we need a separate value that is used in the form and url.
@@ -99,6 +96,10 @@ class ResearchLibraryPage(research_base.ResearchHubBasePage):
             filtered_year = ""
         page = request.GET.get("page")
 
+        facet_index = facets.get_research_facet_index(locale_registry.get_active())
+        selected = {"author": filtered_author_ids, "topic": filtered_topic_ids, "region": filtered_region_ids}
+        filtered_page_ids = facet_index.filter(selected, year=filtered_year)
+
         searched_and_filtered_research_detail_pages = self._get_research_detail_pages(
             search=search_query,
             sort=sort,
@@ -106,8 +107,9 @@ class ResearchLibraryPage(research_base.ResearchHubBasePage):
             topic_ids=filtered_topic_ids,
             region_ids=filtered_region_ids,
             year=filtered_year,
+            facet_index=facet_index,
         )
-        research_detail_pages_paginator = paginator.Paginator(
+        research_detail_pages_paginator = SearchResultsPaginator(
             object_list=searched_and_filtered_research_detail_pages,
             per_page=self.results_count,
             allow_empty_first_page=True,
@@ -118,74 +120,31 @@ class ResearchLibraryPage(research_base.ResearchHubBasePage):
         context["breadcrumbs"] = self.get_breadcrumbs()
         context["search_query"] = search_query
         context["sort"] = sort
-        context["author_options"] = self._get_author_options()
+        context["author_options"] = self._get_author_options(facet_index, filtered_page_ids)
         context["filtered_author_ids"] = filtered_author_ids
-        context["topic_options"] = self._get_topic_options()
+        context["topic_options"] = self._get_topic_options(facet_index, filtered_page_ids)
         context["filtered_topic_ids"] = filtered_topic_ids
-        context["region_options"] = self._get_region_options()
+        context["region_options"] = self._get_region_options(facet_index, filtered_page_ids)
         context["filtered_region_ids"] = filtered_region_ids
-        context["year_options"] = self._get_year_options()
+        # Picking a year replaces the selected year, so the year
+        # options count the pages for all other filters instead.
+        context["year_options"] = self._get_year_options(facet_index, facet_index.filter(selected))
         context["filtered_year"] = filtered_year
         context["research_detail_pages_count"] = research_detail_pages_paginator.count
         context["research_detail_pages"] = research_detail_pages_page
         return context
 
-    def _get_author_options(self):
-        author_profiles = profile_models.Profile.objects.filter_research_authors()
-        author_profiles = utils.localize_queryset(author_profiles)
-        return [
-            {
-                "id": author_profile.id,
-                "value": author_profile.id,
-                "label": author_profile.name,
-            }
-            for author_profile in author_profiles
-        ]
-
-    def _get_topic_options(self):
-        topics = taxonomies.ResearchTopic.objects.all()
-        topics = utils.localize_queryset(topics)
-        return [
-            {
-                "id": topic.id,
-                "value": topic.id,
-                "label": topic.name,
-            }
-            for topic in topics
-        ]
-
-    def _get_region_options(self):
-        regions = taxonomies.ResearchRegion.objects.all()
-        regions = utils.localize_queryset(regions)
-        return [
-            {
-                "id": region.id,
-                "value": region.id,
-                "label": region.name,
-            }
-            for region in regions
-        ]
-
-    def _get_year_options(self):
-        dates = detail_page.ResearchDetailPage.objects.dates(
-            "original_publication_date",
-            "year",
-            order="DESC",
-        )
-        year_options = [
-            {
-                "id": date.year,
-                "value": date.year,
-                "label": date.year,
-            }
-            for date in dates
-        ]
-        empty_option = {
-            "id": "any",
-            "value": "",
-            "label": pgettext_lazy("Option in a list of years", "Any"),
-        }
-        return [empty_option] + year_options
+    def _get_author_options(self, facet_index, page_ids=None):
+        return facet_index.get_options("author", page_ids)
+
+    def _get_topic_options(self, facet_index, page_ids=None):
+        return facet_index.get_options("topic", page_ids)
+
+    def _get_region_options(self, facet_index, page_ids=None):
+        return facet_index.get_options("region", page_ids)
+
+    def _get_year_options(self, facet_index, page_ids=None):
+        return facet_index.get_year_options(page_ids)
 
     def _get_research_detail_pages(
         self,
@@ -196,40 +155,29 @@ class ResearchLibraryPage(research_base.ResearchHubBasePage):
         topic_ids: Optional[list[int]] = None,
         region_ids: Optional[list[int]] = None,
         year: Optional[int] = None,
+        facet_index: Optional[facets.ResearchFacetIndex] = None,
     ):
         sort = sort or self.SORT_NEWEST_FIRST
-        author_profile_ids = author_profile_ids or []
-        topic_ids = topic_ids or []
-        region_ids = region_ids or []
+        locale = locale_registry.get_active()
+        # An index without any pages is falsy, as it has a length.
+        if facet_index is None:
+            facet_index = facets.get_research_facet_index(locale)
 
         research_detail_pages = detail_page.ResearchDetailPage.objects.live()
-        research_detail_pages = research_detail_pages.filter(locale=wagtail_models.Locale.get_active())
-
-        author_profiles = profile_models.Profile.objects.filter_research_authors()
-        author_profiles = author_profiles.filter(id__in=author_profile_ids)
-        for author_profile in author_profiles:
-            # Synced but not translated pages are still associated with the default
-            # locale's author profile. But, we want to show them when we are filtering
-            # for the localized author profile. We use the fact that the localized and
-            # default locale's author profile have the same `translation_key`.
-            research_detail_pages = research_detail_pages.filter(
-                research_authors__author_profile__translation_key=(author_profile.translation_key)
-            )
-
-        topics = taxonomies.ResearchTopic.objects.filter(id__in=topic_ids)
-        for topic in topics:
-            research_detail_pages = research_detail_pages.filter(
-                related_topics__research_topic__translation_key=topic.translation_key
-            )
-
-        regions = taxonomies.ResearchRegion.objects.filter(id__in=region_ids)
-        for region in regions:
-            research_detail_pages = research_detail_pages.filter(
-                related_regions__research_region__translation_key=region.translation_key
-            )
-
-        if year:
-            research_detail_pages = research_detail_pages.filter(original_publication_date__year=year)
+        research_detail_pages = research_detail_pages.filter(locale=locale)
+
+        # Synced but not translated pages are still associated with the default
+        # locale's author profiles, topics and regions. But, we want to show them
+        # when we are filtering for the localized ones. The facet index matches
+        # them by `translation_key`, which is the same for all of their versions.
+        selected = {
+            "author": author_profile_ids or [],
+            "topic": topic_ids or [],
+            "region": region_ids or [],
+        }
+        page_ids = facet_index.filter(selected, year=year)
+        if page_ids is not None:
+            research_detail_pages = research_detail_pages.filter(id__in=page_ids)
 
         research_detail_pages = research_detail_pages.order_by(sort.order_by_value)
 
@@ -0,0 +1,32 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+
+
+class SearchIndexUpdate(models.Model):
+    """
+    When an indexed object last changed, and when it was last indexed. The
+    object's index entry is out of date while `indexed_at` is not set.
+
+    See `networkapi.search_index` for how they are queued and processed.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name="+")
+    object_id = models.CharField(max_length=255)
+    changed_at = models.DateTimeField(default=timezone.now)
+    indexed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["content_type", "object_id"], name="unique_search_index_update"),
+        ]
+        indexes = [
+            models.Index(
+                fields=["changed_at"],
+                name="search_index_update_pending",
+                condition=models.Q(indexed_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id}"
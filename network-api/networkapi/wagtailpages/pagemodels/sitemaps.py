@@ -0,0 +1,55 @@
+from django.db import models
+from django.utils import timezone
+
+
+class SitemapChunk(models.Model):
+    """
+    A pre-generated sitemap for one section of a locale's site, with the
+    URLs of up to 50,000 of its pages and routes.
+
+    See `networkapi.sitemaps` for how they are generated and served.
+    """
+
+    locale = models.ForeignKey("wagtailcore.Locale", on_delete=models.CASCADE, related_name="+")
+    section = models.CharField(max_length=255)
+    number = models.PositiveIntegerField()
+    content = models.TextField()
+    url_count = models.PositiveIntegerField(default=0)
+    lastmod = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["locale", "section", "number"]
+        constraints = [
+            models.UniqueConstraint(fields=["locale", "section", "number"], name="unique_sitemap_chunk"),
+        ]
+
+    def __str__(self):
+        return f"{self.locale}: {self.filename}"
+
+    @property
+    def filename(self):
+        if not self.section:
+            # The homepage's own section, which has no slug.
+            return f"sitemap-{self.number}.xml"
+        return f"sitemap-{self.section}-{self.number}.xml"
+
+
+class SitemapUpdate(models.Model):
+    """
+    A page whose section of a locale's sitemap is out of date since
+    `marked_at`, or the whole sitemap of the locale if `path` is empty.
+
+    See `networkapi.sitemaps` for how they are queued and processed.
+    """
+
+    locale = models.ForeignKey("wagtailcore.Locale", on_delete=models.CASCADE, related_name="+")
+    path = models.CharField(max_length=255, blank=True)
+    marked_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["locale", "path"], name="unique_sitemap_update"),
+        ]
+
+    def __str__(self):
+        return f"{self.locale}: {self.path or '*'}"
@@ -0,0 +1,167 @@
+"""
+Client for the Pulse API.
+
+Profile blocks list Pulse profiles, which used to be fetched with a plain
+`urlopen()` while rendering, without a timeout. The client below reuses
+connections, bounds every request with `PULSE_API_TIMEOUT`, and caches
+responses by their query args. Responses older than `PULSE_API_CACHE_TIMEOUT`
+are still served, and refreshed in a background thread, until they expire
+after `PULSE_API_STALE_TIMEOUT`. Pages with several profile blocks fetch all
+of their profiles in parallel up front, with `prefetch_pulse_profiles()`.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from wagtail.core import blocks
+
+logger = logging.getLogger(__name__)
+
+PULSE_PROFILES_PATH = "/api/pulse/v2/profiles/"
+
+
+class PulseAPIClient:
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._local = threading.local()
+        self._executor = None
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        # Sessions keep connections alive, but are not safe to share between
+        # threads, so every thread gets its own.
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pulse-api")
+            return self._executor
+
+    def get_url(self):
+        return f"{settings.FRONTEND['PULSE_API_DOMAIN']}{PULSE_PROFILES_PATH}"
+
+    def get_cache_key(self, query_args):
+        query = json.dumps([self.get_url(), sorted(query_args.items())], default=str)
+        return f"pulse_api_{hashlib.md5(query.encode()).hexdigest()}"
+
+    def fetch(self, query_args):
+        """
+        Return the profiles for `query_args` straight from
+        the API, or None if the API could not be reached.
+        """
+        try:
+            response = self.session.get(self.get_url(), params=query_args, timeout=settings.PULSE_API_TIMEOUT)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as exception:
+            logger.warning("Could not fetch Pulse profiles for %s: %s", query_args, exception)
+            return None
+
+    def refresh(self, query_args):
+        """
+        Fetch the profiles for `query_args` and cache them. If the API cannot
+        be reached, keep serving any cached profiles instead.
+        """
+        cache_key = self.get_cache_key(query_args)
+        data = self.fetch(query_args)
+
+        if data is not None:
+            cache.set(cache_key, (time.time(), data), settings.PULSE_API_STALE_TIMEOUT)
+            return data
+
+        # Remember the failure, so that other renders do not wait on the API as well.
+        # The entry is stale straight away, so the next render retries in the background.
+        cache.add(cache_key, (0, []), settings.PULSE_API_CACHE_TIMEOUT)
+        return []
+
+    def _refresh_in_background(self, query_args, cache_key):
+        try:
+            self.refresh(query_args)
+        finally:
+            with self._lock:
+                self._refreshing.discard(cache_key)
+
+    def schedule_refresh(self, query_args):
+        cache_key = self.get_cache_key(query_args)
+        with self._lock:
+            if cache_key in self._refreshing:
+                return None
+            self._refreshing.add(cache_key)
+        return self.executor.submit(self._refresh_in_background, query_args, cache_key)
+
+    def is_stale(self, entry):
+        fetched_at, _ = entry
+        return time.time() - fetched_at > settings.PULSE_API_CACHE_TIMEOUT
+
+    def get_profiles(self, query_args):
+        """
+        Return the profiles for `query_args`, from the cache if possible.
+        """
+        entry = cache.get(self.get_cache_key(query_args))
+        if entry is None:
+            return self.refresh(query_args)
+
+        if self.is_stale(entry):
+            self.schedule_refresh(query_args)
+        return entry[1]
+
+    def prefetch(self, queries):
+        """
+        Fetch the profiles for all `queries` that are not cached yet in
+        parallel, and schedule refreshes for the ones that are stale.
+        """
+        queries = {self.get_cache_key(query_args): query_args for query_args in queries}
+        entries = cache.get_many(queries.keys())
+
+        futures = []
+        for cache_key, query_args in queries.items():
+            entry = entries.get(cache_key)
+            if entry is None:
+                futures.append(self.executor.submit(self.refresh, query_args))
+            elif self.is_stale(entry):
+                self.schedule_refresh(query_args)
+
+        wait(futures)
+
+
+pulse_client = PulseAPIClient()
+
+
+def get_pulse_queries(block, value):
+    """
+    Yield the query args of every block that gets its profiles from Pulse in a
+    block value, including those nested in stream, struct and list blocks.
+    """
+    if hasattr(block, "get_pulse_query"):
+        yield block.get_pulse_query(value)
+    elif isinstance(block, blocks.StreamBlock):
+        for child in value:
+            yield from get_pulse_queries(child.block, child.value)
+    elif isinstance(block, blocks.StructBlock):
+        for name, child_block in block.child_blocks.items():
+            yield from get_pulse_queries(child_block, value.get(name))
+    elif isinstance(block, blocks.ListBlock):
+        for child_value in value:
+            yield from get_pulse_queries(block.child_block, child_value)
+
+
+def prefetch_pulse_profiles(stream_value):
+    """
+    Prefetch the profiles for every block in a StreamField value that gets them from Pulse.
+    """
+    queries = list(get_pulse_queries(stream_value.stream_block, stream_value))
+    if queries:
+        pulse_client.prefetch(queries)
@@ -1,18 +1,48 @@
+import hashlib
+import time
+
 from django.conf import settings
 from django.contrib.syndication.views import Feed
 from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
 from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, parse_http_date_safe
 
 from networkapi.wagtailpages.utils import get_locale_from_request
 
 from .models import IndexPage
 
+FEED_NAMES = ["rss", "atom"]
+
+
+def get_feed_cache_key(feed_name, language_code):
+    return f"blog_feed_{feed_name}_{language_code}"
+
+
+def invalidate_feed_cache():
+    """
+    Drop the rendered feeds for every feed type and language.
+    """
+    cache.delete_many(
+        [
+            get_feed_cache_key(feed_name, language_code)
+            for feed_name in FEED_NAMES
+            for language_code, _ in settings.LANGUAGES
+        ]
+    )
+
 
 class RSSFeed(Feed):
     """
-    Blog page RSS feed, using the content:encoded serializer above
+    Blog page RSS feed, using the content:encoded serializer above.
+
+    The rendered feed is cached per locale, together with its ETag and
+    Last-Modified values, so that cached feeds are served without touching
+    the database and feed readers can poll with conditional GETs.
     """
 
+    feed_name = "rss"
     title = "Mozilla Foundation Blog"
     link = "https://foundation.mozilla.org/blog/"
     feed_url = "https://foundation.mozilla.org/blog/rss/"
@@ -21,41 +51,51 @@ class RSSFeed(Feed):
     def __call__(self, request, *args, **kwargs):
         # get locale from request header, or fall back to the default EN locale.
         request_locale = get_locale_from_request(request)
-        setattr(self, "request_locale", request_locale)
-        return super().__call__(request, *args, **kwargs)
-
-    def items(self):
-        # Get locale from request in __call__ above, defaults to EN.
-        request_locale = getattr(self, "request_locale")
-
-        # Try to get the RSS items from cache first
-        feed_set = cache.get("rss_feed_set")
-
-        if feed_set is None:
-            # If we don't have an active cache, we build one: pull the index page
-            # specifically using the English page title, as an IndexPage rather than
-            # as a BlogIndexPage, to make sure we're not filtering out all the
-            # "featured" posts (which we need to do for site content purposes).
-            try:
-                index = IndexPage.objects.get(title__iexact="Blog", locale=request_locale)
-
-            except IndexPage.DoesNotExist:
-                # If that doesn't yield the blog page, pull using the universal title
-                try:
-                    index = IndexPage.objects.get(title__iexact="Blog", locale=request_locale)
-
-                except IndexPage.DoesNotExist:
-                    # At this point there's not much we can do other than to pretend
-                    # there are no posts to serialize to RSS/Atom format.
-                    return []
-
-            # Then sort the collection and only yield the top FEED_LIMIT posts
-            blog_pages = index.get_all_entries(request_locale).order_by("-first_published_at")
-            feed_set = blog_pages[: settings.FEED_LIMIT]
-
-            cache.set("rss_feed_set", feed_set, settings.FEED_CACHE_TIMEOUT)
-
-        return feed_set
+        cache_key = get_feed_cache_key(self.feed_name, request_locale.language_code)
+        rendered = cache.get(cache_key)
+
+        if rendered is None:
+            rendered = self.render(request, request_locale, *args, **kwargs)
+            cache.set(cache_key, rendered, settings.FEED_CACHE_TIMEOUT)
+
+        content, content_type, etag, last_modified = rendered
+        response = HttpResponse(content, content_type=content_type)
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+        # Answers with a 304 if the client's copy is still current.
+        return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+
+    def render(self, request, locale, *args, **kwargs):
+        """
+        Render the feed for a locale, returning a tuple of
+        (content, content type, ETag, Last-Modified timestamp).
+        """
+        kwargs["locale"] = locale
+        response = super().__call__(request, *args, **kwargs)
+        content = response.content
+        etag = quote_etag(hashlib.md5(content).hexdigest())
+        # Feeds without any dated items have no Last-Modified header.
+        last_modified = parse_http_date_safe(response.headers.get("Last-Modified", "")) or int(time.time())
+        return content, response.headers["Content-Type"], etag, last_modified
+
+    def get_object(self, request, locale=None, *args, **kwargs):
+        return locale
+
+    def items(self, locale):
+        # Pull the index page specifically using the English page title, as an
+        # IndexPage rather than as a BlogIndexPage, to make sure we're not filtering
+        # out all the "featured" posts (which we need to do for site content purposes).
+        try:
+            index = IndexPage.objects.get(title__iexact="Blog", locale=locale)
+        except IndexPage.DoesNotExist:
+            # At this point there's not much we can do other than to pretend
+            # there are no posts to serialize to RSS/Atom format.
+            return []
+
+        # Only yield the top FEED_LIMIT posts, fetching the specific pages
+        # in bulk rather than one at a time.
+        return list(index.get_entries_queryset().specific()[: settings.FEED_LIMIT])
 
     def item_title(self, item):
         return item.title
@@ -64,13 +104,14 @@ class RSSFeed(Feed):
         return item.full_url
 
     def item_description(self, item):
-        return item.specific.get_meta_description()
+        return item.get_meta_description()
 
     def item_pubdate(self, item):
         return item.first_published_at
 
 
 class AtomFeed(RSSFeed):
+    feed_name = "atom"
     feed_type = Atom1Feed
     link = RSSFeed.link
     feed_url = "https://foundation.mozilla.org/blog/atom/"
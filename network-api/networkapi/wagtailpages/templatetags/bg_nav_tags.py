@@ -38,8 +38,7 @@ def bg_active_nav(current, target):
 
 
 @register.simple_tag(name="product_in_category")
-def product_in_category(productpage, categorySlug):
+def product_in_category(product_card, categorySlug):
     if categorySlug == "":
         return True
-    categories = productpage.product_categories.all()
-    return categorySlug in [cat.category.slug for cat in categories]
+    return categorySlug in product_card.category_slugs
@@ -1,14 +1,13 @@
-from bs4 import BeautifulSoup
 from django import template
 from wagtail.images.models import Image
 
+from networkapi.wagtailpages.utils import is_rich_text
+
 register = template.Library()
 
 
 @register.inclusion_tag("wagtailpages/tags/card.html")
 def card(image, title, description, link_url, link_label):
-    parsedDescription = BeautifulSoup(description, "html.parser")
-
     image_url = image
     if isinstance(image, Image):
         # Check to see if the incoming image is a Wagtail image. We use this
@@ -19,7 +18,7 @@ def card(image, title, description, link_url, link_label):
         "image": image_url,
         "title": title,
         "description": description,
-        "description_is_rich_text": len(parsedDescription.find_all(True)) > 0,
+        "description_is_rich_text": is_rich_text(description),
         "link_url": link_url,
         "link_label": link_label,
     }
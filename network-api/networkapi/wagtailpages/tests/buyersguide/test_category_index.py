@@ -0,0 +1,120 @@
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from networkapi.wagtailpages.factory import buyersguide as buyersguide_factories
+from networkapi.wagtailpages.pagemodels.buyersguide.category_index import (
+    build_category_index,
+    get_category_index,
+    get_category_index_cache_key,
+)
+from networkapi.wagtailpages.pagemodels.buyersguide.products import (
+    BuyersGuideProductCategory,
+    ProductPageCategory,
+)
+from networkapi.wagtailpages.tests.buyersguide.base import BuyersGuideTestCase
+from networkapi.wagtailpages.wagtail_hooks import manage_pni_cache
+
+
+class TestCategoryIndex(BuyersGuideTestCase):
+    def setUp(self):
+        super().setUp()
+        BuyersGuideProductCategory.objects.all().delete()
+        self.parent = BuyersGuideProductCategory.objects.create(name="Smart home", sort_order=1)
+        self.child = BuyersGuideProductCategory.objects.create(name="Smart speakers", parent=self.parent)
+        self.other = BuyersGuideProductCategory.objects.create(name="Toys", sort_order=2)
+        self.hidden = BuyersGuideProductCategory.objects.create(name="Hidden", hidden=True)
+
+        self.product_page.product_categories.create(category=self.parent)
+        self.product_page.product_categories.create(category=self.child)
+        self.product_page.save()
+        draft_product = buyersguide_factories.ProductPageFactory(parent=self.bg, live=False)
+        draft_product.product_categories.create(category=self.parent)
+        draft_product.save()
+
+    def translate(self, category, name):
+        translation = category.copy_for_translation(self.fr_locale)
+        translation.name = name
+        translation.save()
+        return translation
+
+    def test_default_language(self):
+        # The default locale, the categories and their product counts.
+        with self.assertNumQueries(3):
+            index = build_category_index("en")
+
+        self.assertEqual(index.categories, [self.parent, self.other, self.child])
+        self.assertEqual(
+            [category.original.published_product_page_count for category in index.categories],
+            [1, 0, 1],
+        )
+        self.assertEqual(index.get("smart-speakers"), self.child)
+        self.assertIsNone(index.get("hidden"))
+        self.assertEqual(index.get_children(self.parent), [self.child])
+        self.assertEqual(index.get("smart-speakers").localized_parent, self.parent)
+
+    def test_other_language(self):
+        fr_parent = self.translate(self.parent, "Maison connectée")
+
+        # The requested locale and its categories come on top.
+        with self.assertNumQueries(5):
+            index = build_category_index("fr")
+
+        self.assertEqual(index.categories, [fr_parent, self.other, self.child])
+        self.assertEqual(index.get("smart-home"), fr_parent)
+        self.assertEqual(fr_parent.original, self.parent)
+        self.assertEqual(index.get("smart-home").original.published_product_page_count, 1)
+        self.assertEqual(index.get("smart-speakers").localized_parent.name, "Maison connectée")
+        self.assertEqual(index.get_children(fr_parent), [self.child])
+
+    def test_language_without_locale(self):
+        index = build_category_index("de")
+
+        self.assertEqual(index.categories, [self.parent, self.other, self.child])
+
+    def test_category_page_uses_localized_category(self):
+        fr_parent = self.translate(self.parent, "Maison connectée")
+        self.synchronize_tree()
+        self.activate_locale(self.fr_locale)
+
+        response = self.client.get(
+            self.bg.localized.url + self.bg.reverse_subpage("category-view", args=("smart-home",))
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["current_category"], fr_parent)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestCategoryIndexCache(BuyersGuideTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.category = BuyersGuideProductCategory.objects.create(name="Smart home")
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_index_is_cached(self):
+        get_category_index("en")
+
+        with self.assertNumQueries(0):
+            get_category_index("en")
+
+    def test_saving_a_category_clears_the_index(self):
+        get_category_index("en")
+
+        self.category.name = "Smart homes"
+        self.category.save()
+
+        self.assertIsNone(cache.get(get_category_index_cache_key("en")))
+        self.assertEqual(get_category_index("en").get("smart-homes"), self.category)
+
+    def test_publishing_a_product_clears_the_index(self):
+        get_category_index("en")
+
+        self.product_page.product_categories.add(ProductPageCategory(category=self.category))
+        self.product_page.save_revision().publish()
+        manage_pni_cache(None, self.product_page)
+
+        self.assertEqual(get_category_index("en").get("smart-home").original.published_product_page_count, 1)
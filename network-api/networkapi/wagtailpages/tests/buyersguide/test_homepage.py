@@ -3,6 +3,7 @@ from django.test import RequestFactory, TestCase
 from django.test.utils import override_settings
 from wagtail.core.models import Locale, Page, Site
 
+from networkapi.sitemaps import generate_sitemaps
 from networkapi.utility.faker.helpers import reseed
 from networkapi.wagtailpages.factory import buyersguide as buyersguide_factories
 from networkapi.wagtailpages.factory.homepage import WagtailHomepageFactory
@@ -163,7 +164,7 @@ class TestBuyersGuidePage(BuyersGuideTestCase):
         products = ProductPage.objects.descendant_of(self.bg)
         products.delete()
         self.assertEqual(products.count(), 0)
-        query_number = 156
+        query_number = 52
 
         with self.assertNumQueries(query_number):
             response = self.client.get(self.bg.url)
@@ -173,7 +174,7 @@ class TestBuyersGuidePage(BuyersGuideTestCase):
     def test_serve_page_one_product(self):
         products = ProductPage.objects.descendant_of(self.bg)
         self.assertEqual(products.count(), 1)
-        query_number = 186
+        query_number = 71
 
         with self.assertNumQueries(query_number):
             response = self.client.get(self.bg.url)
@@ -187,7 +188,7 @@ class TestBuyersGuidePage(BuyersGuideTestCase):
             buyersguide_factories.ProductPageFactory(parent=self.bg)
         products = ProductPage.objects.descendant_of(self.bg)
         self.assertEqual(products.count(), additional_products_count + 1)
-        query_number = 955
+        query_number = 152
 
         with self.assertNumQueries(query_number):
             response = self.client.get(self.bg.url)
@@ -201,7 +202,7 @@ class TestBuyersGuidePage(BuyersGuideTestCase):
             buyersguide_factories.ProductPageFactory(parent=self.bg)
         products = ProductPage.objects.descendant_of(self.bg)
         self.assertEqual(products.count(), additional_products_count + 1)
-        query_number = 966
+        query_number = 163
         self.client.force_login(user=self.create_test_user())
 
         with self.assertNumQueries(query_number):
@@ -216,7 +217,7 @@ class TestBuyersGuidePage(BuyersGuideTestCase):
         request = self.request_factory.get(self.bg.url)
         request.user = AnonymousUser()
         request.LANGUAGE_CODE = "en"
-        query_number = 4
+        query_number = 7
 
         with self.assertNumQueries(query_number):
             self.bg.get_context(request=request)
@@ -227,7 +228,8 @@ class TestBuyersGuidePage(BuyersGuideTestCase):
         request = self.request_factory.get(self.bg.url)
         request.user = AnonymousUser()
         request.LANGUAGE_CODE = "en"
-        query_number = 9
+        # Building the product cards looks up the product URLs and image renditions.
+        query_number = 26
 
         with self.assertNumQueries(query_number):
             self.bg.get_context(request=request)
@@ -242,7 +244,7 @@ class TestBuyersGuidePage(BuyersGuideTestCase):
         request = self.request_factory.get(self.bg.url)
         request.user = AnonymousUser()
         request.LANGUAGE_CODE = "en"
-        query_number = 209
+        query_number = 107
 
         with self.assertNumQueries(query_number):
             self.bg.get_context(request=request)
@@ -303,10 +305,12 @@ class TestBuyersGuidePage(BuyersGuideTestCase):
         self.assertEqual(response.redirect_chain[0][0], product.url)
 
     def test_sitemap_entries(self):
+        generate_sitemaps()
+
         response = self.client.get("/en/sitemap.xml")
-        context = response.context
+        self.assertContains(response, f"/en/sitemap-{self.bg.slug}-1.xml")
 
-        self.assertEqual(context.template_name, "sitemap.xml")
+        response = self.client.get(f"/en/sitemap-{self.bg.slug}-1.xml")
         self.assertContains(response, "about/")
         self.assertContains(response, "about/why/")
         self.assertContains(response, "about/press/")
@@ -0,0 +1,145 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from networkapi.wagtailpages.factory import buyersguide as buyersguide_factories
+from networkapi.wagtailpages.pagemodels.buyersguide.product_cache import (
+    PRODUCT_CARD_FORMAT_VERSION,
+    ProductCard,
+    deserialize_product_cards,
+    get_category_products_cache_key,
+    get_home_products_cache_key,
+    get_language_codes_for_locale,
+    get_product_cache_version,
+    invalidate_product_cache,
+    serialize_product_cards,
+    warm_product_cache,
+)
+from networkapi.wagtailpages.pagemodels.buyersguide.products import (
+    BuyersGuideProductCategory,
+)
+from networkapi.wagtailpages.tests.buyersguide.base import BuyersGuideTestCase
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestProductCache(BuyersGuideTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_version_is_stable(self):
+        version = get_product_cache_version("en")
+
+        self.assertEqual(get_product_cache_version("en"), version)
+        self.assertEqual(
+            get_home_products_cache_key("en", False, version),
+            f"home_product_dicts_live_en_{version}",
+        )
+        self.assertEqual(
+            get_category_products_cache_key("en", "smart-home", True, version),
+            f"en_cat_product_dicts_smart-home_auth_{version}",
+        )
+
+    def test_language_codes_for_default_locale(self):
+        language_codes = get_language_codes_for_locale(self.default_locale)
+
+        # Listings in every language can show default locale products.
+        self.assertEqual(language_codes, [language_code for language_code, _ in settings.LANGUAGES])
+        self.assertIn("fr", language_codes)
+
+    def test_language_codes_for_other_locale(self):
+        self.assertEqual(get_language_codes_for_locale(self.fr_locale), ["fr"])
+
+    def test_invalidate_product_cache_only_affects_pni_keys(self):
+        cache.set("unrelated_key", "value")
+        en_version = get_product_cache_version("en")
+        fr_version = get_product_cache_version("fr")
+
+        invalidate_product_cache(self.product_page)
+
+        # French listings fall back to the English product until it is translated.
+        self.assertNotEqual(get_product_cache_version("en"), en_version)
+        self.assertNotEqual(get_product_cache_version("fr"), fr_version)
+        self.assertEqual(cache.get("unrelated_key"), "value")
+
+    def test_invalidate_translated_product_cache(self):
+        self.synchronize_tree()
+        fr_product = self.product_page.get_translation(self.fr_locale)
+        en_version = get_product_cache_version("en")
+        fr_version = get_product_cache_version("fr")
+
+        invalidate_product_cache(fr_product)
+
+        self.assertEqual(get_product_cache_version("en"), en_version)
+        self.assertNotEqual(get_product_cache_version("fr"), fr_version)
+
+    def test_get_context_uses_cached_products(self):
+        request = RequestFactory().get(self.bg.url)
+        request.user = AnonymousUser()
+        request.LANGUAGE_CODE = "en"
+
+        products = self.bg.get_context(request=request)["products"]
+        self.assertEqual([card.id for card in products], [self.product_page.id])
+
+        new_product = buyersguide_factories.ProductPageFactory(parent=self.bg)
+        new_product.review_date = self.product_page.review_date
+        new_product.save()
+        self.assertEqual(self.bg.get_context(request=request)["products"], products)
+
+        invalidate_product_cache(new_product)
+        self.assertIn(new_product.id, [card.id for card in self.bg.get_context(request=request)["products"]])
+
+    def test_warm_product_cache(self):
+        category = BuyersGuideProductCategory.objects.create(name="Smart home")
+        version = get_product_cache_version("en")
+
+        warm_product_cache(self.bg, "en")
+
+        payload = cache.get(get_home_products_cache_key("en", False, version))
+        self.assertEqual([card.id for card in deserialize_product_cards(payload)], [self.product_page.id])
+        self.assertEqual(cache.get(get_category_products_cache_key("en", category.slug, False, version)), payload)
+        self.assertIsNone(cache.get(get_home_products_cache_key("en", True, version)))
+
+
+class TestProductCards(BuyersGuideTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = BuyersGuideProductCategory.objects.create(name="Smart home")
+        self.product_page.product_categories.create(category=self.category)
+        self.product_page.save()
+
+    def test_card_from_product(self):
+        card = ProductCard.from_product(self.product_page, {self.category.translation_key: "Maison connectée"})
+
+        self.assertEqual(card.id, self.product_page.id)
+        self.assertEqual(card.title, self.product_page.title)
+        self.assertEqual(card.company, self.product_page.company)
+        self.assertEqual(card.url, self.product_page.url)
+        self.assertEqual(card.creepiness, self.product_page.average_creepiness)
+        self.assertEqual(card.image_url, self.product_page.image.get_rendition("fill-600x600").url)
+        self.assertEqual(card.category_slugs, (self.category.slug,))
+        self.assertEqual(card.category_names, ("Maison connectée",))
+
+    def test_card_serialization(self):
+        card = ProductCard.from_product(self.product_page, {})
+        payload = serialize_product_cards([card])
+
+        self.assertEqual(payload[0], PRODUCT_CARD_FORMAT_VERSION)
+        self.assertEqual(deserialize_product_cards(payload), [card])
+
+    def test_other_card_formats_are_ignored(self):
+        card = ProductCard.from_product(self.product_page, {})
+
+        self.assertIsNone(deserialize_product_cards((PRODUCT_CARD_FORMAT_VERSION + 1, [card.to_tuple()])))
+        self.assertIsNone(deserialize_product_cards([self.product_page]))
+        self.assertIsNone(deserialize_product_cards(None))
+
+    def test_benchmark_command(self):
+        call_command("benchmark_product_cache", iterations=1)
@@ -0,0 +1,69 @@
+import json
+
+from django.core.cache import cache
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+from wagtail.core.views import serve
+
+from networkapi.wagtailcustomization.csrf.middleware import CustomCsrfViewMiddleware
+from networkapi.wagtailpages.factory import buyersguide as buyersguide_factories
+from networkapi.wagtailpages.pagemodels.buyersguide.product_slugs import is_product_slug
+from networkapi.wagtailpages.tests.buyersguide.base import BuyersGuideTestCase
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestProductSlugs(BuyersGuideTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_is_product_slug(self):
+        self.assertTrue(is_product_slug(self.product_page.slug))
+        self.assertFalse(is_product_slug(self.bg.slug))
+
+    def test_slugs_are_kept_in_memory(self):
+        is_product_slug(self.product_page.slug)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(is_product_slug("contact"))
+
+    def test_new_products_are_picked_up(self):
+        is_product_slug(self.product_page.slug)
+
+        new_product = buyersguide_factories.ProductPageFactory(parent=self.bg, slug="new-product")
+
+        self.assertTrue(is_product_slug(new_product.slug))
+
+    def test_middleware_skips_csrf_for_product_pages_only(self):
+        middleware = CustomCsrfViewMiddleware(lambda request: None)
+        request_factory = RequestFactory()
+
+        request = request_factory.post(self.product_page.url)
+        self.assertIsNone(middleware.process_view(request, serve, (), {}))
+
+        request = request_factory.post(self.bg.url)
+        self.assertEqual(middleware.process_view(request, serve, (), {}).status_code, 403)
+
+    def test_vote_without_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+
+        response = client.post(self.product_page.url, json.dumps({"value": 25}), content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+
+        response = client.post(self.bg.url, json.dumps({"value": 25}), content_type="application/json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_vote_on_translated_product_without_csrf_token(self):
+        self.synchronize_tree()
+        client = Client(enforce_csrf_checks=True)
+
+        response = client.post(
+            self.product_page.get_translation(self.fr_locale).url,
+            json.dumps({"value": 25}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
@@ -12,6 +12,7 @@ from networkapi.wagtailpages.pagemodels.buyersguide.products import (
     ProductPageCategory,
     ProductPageVotes,
 )
+from networkapi.wagtailpages.pagemodels.buyersguide.voting import vote_rate_limiter
 from networkapi.wagtailpages.tests.buyersguide.base import BuyersGuideTestCase
 
 
@@ -74,6 +75,33 @@ class TestProductPage(BuyersGuideTestCase):
         creepiness = product_page.creepiness
         self.assertEqual(creepiness, 50)
 
+    def test_set_votes_updates_stored_vote_totals(self):
+        product_page = self.product_page
+
+        product_page.creepiness_value = 100
+        product_page.save()
+        self.assertEqual(product_page.total_votes, 0)
+        self.assertEqual(product_page.average_creepiness, 50)
+
+        product_page.votes.set_votes([5, 5, 5, 5, 5])
+        product_page.refresh_from_db()
+        self.assertEqual(product_page.total_votes, 25)
+        self.assertEqual(product_page.average_creepiness, 4)
+
+        product_page.votes.set_votes([0, 0, 0, 0, 0])
+        product_page.refresh_from_db()
+        self.assertEqual(product_page.total_votes, 0)
+        self.assertEqual(product_page.average_creepiness, 50)
+
+    def test_meta_description_is_derived_from_blurb(self):
+        product_page = self.product_page
+        product_page.search_description = ""
+        product_page.blurb = "<h2>Heading</h2><p>First <b>paragraph</b></p><p>Second paragraph</p>"
+        product_page.save()
+
+        product_page.blurb = ""
+        self.assertEqual(product_page.get_meta_description(), "First paragraph")
+
     def test_get_voting_json(self):
         product_page = self.product_page
 
@@ -458,6 +486,11 @@ class TestProductPage(BuyersGuideTestCase):
 
 @override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage")
 class WagtailBuyersGuideVoteTest(APITestCase, BuyersGuideTestCase):
+    def setUp(self):
+        super().setUp()
+        vote_rate_limiter.clear()
+        self.addCleanup(vote_rate_limiter.clear)
+
     def test_successful_vote(self):
         product_page = self.product_page
 
@@ -496,6 +529,28 @@ class WagtailBuyersGuideVoteTest(APITestCase, BuyersGuideTestCase):
         self.assertListEqual(votes, [0, 1, 0, 0, 1])
         self.assertEqual(product_page.total_vote_count, 2)
         self.assertEqual(product_page.creepiness_value, 125)
+        self.assertEqual(product_page.total_votes, 2)
+        self.assertEqual(product_page.average_creepiness, 62.5)
+
+    @override_settings(BUYERS_GUIDE_VOTE_RATE_LIMIT="2/hour")
+    def test_votes_are_rate_limited(self):
+        product_page = self.product_page
+        product_page.get_or_create_votes()
+        product_page.votes.set_votes([0, 0, 0, 0, 0])
+
+        for _ in range(2):
+            response = self.client.post(product_page.url, {"value": 50}, format="json")
+            self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(product_page.url, {"value": 50}, format="json")
+        self.assertEqual(response.status_code, 429)
+
+        product_page.refresh_from_db()
+        self.assertEqual(product_page.total_vote_count, 2)
+
+        # Votes from other clients are counted separately.
+        response = self.client.post(product_page.url, {"value": 50}, format="json", REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(response.status_code, 200)
 
     def test_bad_vote_value(self):
         # vote = 500
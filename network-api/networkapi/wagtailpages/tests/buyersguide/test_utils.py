@@ -1,6 +1,8 @@
 from networkapi.wagtailpages.factory import buyersguide as buyersguide_factories
+from networkapi.wagtailpages.pagemodels.buyersguide.products import ProductPage
 from networkapi.wagtailpages.pagemodels.buyersguide.utils import (
     get_buyersguide_featured_cta,
+    sort_average,
 )
 from networkapi.wagtailpages.tests import base as test_base
 
@@ -63,3 +65,40 @@ class TestGetFeaturedCallToActionFunction(test_base.WagtailpagesTestCase):
 
         featured_cta = get_buyersguide_featured_cta(self.pni_homepage)
         self.assertIsNone(featured_cta)
+
+
+class TestSortAverageFunction(test_base.WagtailpagesTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.pni_homepage = buyersguide_factories.BuyersGuidePageFactory(
+            parent=cls.homepage,
+        )
+        cls.products = []
+        for creepiness_value in [90, 10, 50]:
+            product = buyersguide_factories.ProductPageFactory(parent=cls.pni_homepage)
+            product.votes.set_votes([1, 0, 0, 0, 0])
+            product.creepiness_value = creepiness_value
+            product.save()
+            cls.products.append(product)
+
+    def test_sorts_on_stored_creepiness(self):
+        products = ProductPage.objects.descendant_of(self.pni_homepage)
+
+        # The default locale comes from the locale registry.
+        with self.assertNumQueries(1):
+            result = list(sort_average(products))
+
+        self.assertEqual(result, [self.products[1], self.products[2], self.products[0]])
+        self.assertEqual([p.creepiness for p in result], [10, 50, 90])
+
+    def test_localized_products_sort_on_original_creepiness(self):
+        self.synchronize_tree()
+        products = ProductPage.objects.filter(locale=self.fr_locale)
+
+        result = list(sort_average(products))
+
+        self.assertEqual(
+            [p.translation_key for p in result],
+            [self.products[1].translation_key, self.products[2].translation_key, self.products[0].translation_key],
+        )
@@ -0,0 +1,194 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from unittest import mock
+
+from django.apps import apps
+from django.db import DatabaseError, connection
+from django.test import TransactionTestCase
+from wagtail.core.models import Page
+
+from networkapi.wagtailpages.factory import buyersguide as buyersguide_factories
+from networkapi.wagtailpages.pagemodels.buyersguide.voting import (
+    VoteBuffer,
+    get_vote_bin,
+    record_vote,
+)
+from networkapi.wagtailpages.tests.buyersguide.base import BuyersGuideTestCase
+
+
+class TestGetVoteBin(BuyersGuideTestCase):
+    def test_vote_bins(self):
+        self.assertEqual(get_vote_bin(0), 0)
+        self.assertEqual(get_vote_bin(1), 0)
+        self.assertEqual(get_vote_bin(20), 0)
+        self.assertEqual(get_vote_bin(21), 1)
+        self.assertEqual(get_vote_bin(60), 2)
+        self.assertEqual(get_vote_bin(80), 3)
+        self.assertEqual(get_vote_bin(81), 4)
+        self.assertEqual(get_vote_bin(100), 4)
+
+
+class TestRecordVote(BuyersGuideTestCase):
+    def setUp(self):
+        super().setUp()
+        self.product_page.creepiness_value = 0
+        self.product_page.save()
+        self.product_page.votes.set_votes([0, 0, 0, 0, 0])
+
+    def test_record_vote(self):
+        record_vote(self.product_page, 25)
+        record_vote(self.product_page, 100)
+
+        self.product_page.refresh_from_db()
+        self.product_page.votes.refresh_from_db()
+        self.assertEqual(self.product_page.votes.get_votes(), [0, 1, 0, 0, 1])
+        self.assertEqual(self.product_page.creepiness_value, 125)
+        self.assertEqual(self.product_page.total_votes, 2)
+        self.assertEqual(self.product_page.average_creepiness, 62.5)
+
+    def test_record_vote_does_not_save_page(self):
+        revision_count = self.product_page.revisions.count()
+
+        # One UPDATE for the vote bins and one for the product totals,
+        # wrapped in a savepoint because the test runs inside a transaction.
+        with self.assertNumQueries(4):
+            record_vote(self.product_page, 50)
+
+        self.assertEqual(self.product_page.revisions.count(), revision_count)
+
+    def test_publishing_keeps_recorded_votes(self):
+        revision = self.product_page.save_revision()
+        record_vote(self.product_page, 50)
+
+        revision.publish()
+
+        self.product_page.refresh_from_db()
+        self.assertEqual(self.product_page.creepiness_value, 50)
+        self.assertEqual(self.product_page.total_votes, 1)
+
+
+class TestVoteBuffer(BuyersGuideTestCase):
+    def setUp(self):
+        super().setUp()
+        self.product_page.creepiness_value = 0
+        self.product_page.save()
+        self.product_page.votes.set_votes([0, 0, 0, 0, 0])
+
+    def test_votes_are_buffered_until_flush(self):
+        buffer = VoteBuffer(max_size=10, max_age=60)
+
+        with self.assertNumQueries(0):
+            buffer.add(self.product_page.pk, self.product_page.votes_id, 10)
+            buffer.add(self.product_page.pk, self.product_page.votes_id, 90)
+        self.assertEqual(len(buffer), 2)
+
+        buffer.flush()
+
+        self.assertEqual(len(buffer), 0)
+        self.product_page.refresh_from_db()
+        self.product_page.votes.refresh_from_db()
+        self.assertEqual(self.product_page.votes.get_votes(), [1, 0, 0, 0, 1])
+        self.assertEqual(self.product_page.creepiness_value, 100)
+        self.assertEqual(self.product_page.total_votes, 2)
+        self.assertEqual(self.product_page.average_creepiness, 50)
+
+    def test_buffer_flushes_when_full(self):
+        buffer = VoteBuffer(max_size=3, max_age=60)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for value in [10, 20, 30]:
+                buffer.add(self.product_page.pk, self.product_page.votes_id, value)
+
+            # The flush waits for the current transaction to commit.
+            self.assertEqual(len(buffer), 3)
+
+        self.assertEqual(len(buffer), 0)
+        self.product_page.refresh_from_db()
+        self.assertEqual(self.product_page.creepiness_value, 60)
+        self.assertEqual(self.product_page.total_votes, 3)
+
+    def test_full_buffer_is_not_flushed_on_rollback(self):
+        buffer = VoteBuffer(max_size=1, max_age=60)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            buffer.add(self.product_page.pk, self.product_page.votes_id, 10)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(len(buffer), 1)
+        buffer.flush()
+
+    def test_failed_flush_keeps_votes(self):
+        buffer = VoteBuffer(max_size=10, max_age=60)
+        buffer.add(self.product_page.pk, self.product_page.votes_id, 10)
+
+        with mock.patch(
+            "networkapi.wagtailpages.pagemodels.buyersguide.voting.apply_votes",
+            side_effect=DatabaseError,
+        ):
+            buffer.flush()
+
+        self.assertEqual(len(buffer), 1)
+        buffer.add(self.product_page.pk, self.product_page.votes_id, 90)
+        buffer.flush()
+
+        self.assertEqual(len(buffer), 0)
+        self.product_page.refresh_from_db()
+        self.assertEqual(self.product_page.creepiness_value, 100)
+        self.assertEqual(self.product_page.total_votes, 2)
+
+    def test_buffer_flushes_after_max_age(self):
+        buffer = VoteBuffer(max_size=10, max_age=0.01)
+        flushed = threading.Event()
+
+        with mock.patch(
+            "networkapi.wagtailpages.pagemodels.buyersguide.voting.apply_votes",
+            side_effect=lambda pending: flushed.set(),
+        ):
+            buffer.add(self.product_page.pk, self.product_page.votes_id, 10)
+            self.assertTrue(flushed.wait(timeout=5))
+
+        self.assertEqual(len(buffer), 0)
+
+
+class TestConcurrentVotes(TransactionTestCase):
+    """
+    Votes are cast from many threads, each with its own database connection,
+    so this needs real transactions rather than a wrapping test transaction.
+    """
+
+    serialized_rollback = True
+    # Setting `available_apps` makes the database flush after the test use
+    # TRUNCATE ... CASCADE, which is needed because of the leftover
+    # `wagtailsearch_editorspick` table that still references pages.
+    available_apps = [app_config.name for app_config in apps.get_app_configs()]
+
+    def test_parallel_votes_are_all_recorded(self):
+        pni_homepage = buyersguide_factories.BuyersGuidePageFactory(parent=Page.get_first_root_node())
+        product_page = buyersguide_factories.ProductPageFactory(parent=pni_homepage)
+        product_page.creepiness_value = 0
+        product_page.save()
+        product_page.votes.set_votes([0, 0, 0, 0, 0])
+
+        random = Random(12345)
+        values = [random.randint(1, 100) for _ in range(500)]
+
+        def vote(value):
+            try:
+                record_vote(product_page, value)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            list(executor.map(vote, values))
+
+        expected_bins = [0, 0, 0, 0, 0]
+        for value in values:
+            expected_bins[get_vote_bin(value)] += 1
+
+        product_page.refresh_from_db()
+        product_page.votes.refresh_from_db()
+        self.assertEqual(product_page.votes.get_votes(), expected_bins)
+        self.assertEqual(product_page.creepiness_value, sum(values))
+        self.assertEqual(product_page.total_votes, len(values))
+        self.assertAlmostEqual(product_page.average_creepiness, sum(values) / len(values))
@@ -1,3 +1,5 @@
+from django.core.cache import cache
+
 from networkapi.wagtailpages.factory import research_hub as research_factory
 from networkapi.wagtailpages.tests import base as test_base
 
@@ -22,4 +24,7 @@ class ResearchHubTestCase(test_base.WagtailpagesTestCase):
         )
 
     def setUp(self):
+        # The research library's facet index is cached, and would
+        # otherwise outlive the pages of earlier tests.
+        cache.clear()
         self.synchronize_tree()
@@ -1,11 +1,15 @@
 import http
+from unittest import mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import text as text_utils
 from django.utils import translation
 from wagtail_localize import synctree
 
 from networkapi.wagtailpages.factory import profiles as profiles_factory
 from networkapi.wagtailpages.factory import research_hub as research_factory
+from networkapi.wagtailpages.pagemodels.research_hub import facets
 from networkapi.wagtailpages.tests.research_hub import base as research_test_base
 from networkapi.wagtailpages.tests.research_hub import utils as research_test_utils
 
@@ -79,6 +83,18 @@ class TestResearchAuthorIndexPage(research_test_base.ResearchHubTestCase):
             status_code=http.HTTPStatus.OK,
         )
 
+    def test_profile_route_loads_facet_index_once(self):
+        profile_slug = text_utils.slugify(self.research_profile.name)
+        url = f"{ self.author_index.url }" f"{ self.research_profile.id }/{ profile_slug }/"
+
+        with mock.patch.object(
+            facets, "get_research_facet_index", wraps=facets.get_research_facet_index
+        ) as get_research_facet_index:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, http.HTTPStatus.OK)
+        get_research_facet_index.assert_called_once()
+
     def test_profile_route_wrong_id(self):
         profile_slug = text_utils.slugify(self.research_profile.name)
         url = f"{ self.author_index.url }" f"{ self.research_profile.id + 1 }/{ profile_slug }/"
@@ -230,14 +246,33 @@ class TestResearchAuthorIndexPage(research_test_base.ResearchHubTestCase):
         self.assertIn(detail_page_3, latest_research)
         self.assertNotIn(self.detail_page, latest_research)
 
-    def test_get_author_research(self):
-        # Locale and detail pages.
-        with self.assertNumQueries(2):
-            author_research = self.author_index.get_author_research(
-                author_profile=self.research_profile,
-            )
+    def test_get_author_stats(self):
+        author_stats = self.author_index.get_author_stats(self.research_profile.id, self.default_locale)
+
+        self.assertEqual(author_stats["research_count"], 1)
+        self.assertEqual(author_stats["latest_research_ids"], [self.detail_page.id])
+        self.assertEqual(author_stats["slug"], text_utils.slugify(self.research_profile.name))
+        self.assertIsNone(self.author_index.get_author_stats(self.non_research_profile.id, self.default_locale))
+
+    def test_author_stats_are_cached(self):
+        self.author_index.get_author_stats(self.research_profile.id, self.default_locale)
+
+        with CaptureQueriesContext(connection) as queries:
+            context = self.author_index.get_author_detail_context(profile_id=self.research_profile.id)
+
+        self.assertEqual(context["author_research_count"], 1)
+        # Neither the research count nor the latest research join on the authors.
+        self.assertFalse(any("wagtailpages_researchauthorrelation" in query["sql"] for query in queries))
+
+    def test_author_stats_update_on_unpublish(self):
+        self.author_index.get_author_stats(self.research_profile.id, self.default_locale)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.detail_page.unpublish()
 
-            self.assertIn(self.detail_page, author_research)
+        author_stats = self.author_index.get_author_stats(self.research_profile.id, self.default_locale)
+        self.assertEqual(author_stats["research_count"], 0)
+        self.assertEqual(author_stats["latest_research_ids"], [])
 
     def test_author_index_breadcrumbs(self):
         breadcrumbs = self.author_index.get_breadcrumbs()
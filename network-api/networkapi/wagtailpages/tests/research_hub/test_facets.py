@@ -0,0 +1,129 @@
+import datetime
+
+from django.core.cache import cache
+
+from networkapi.wagtailpages.factory import profiles as profiles_factory
+from networkapi.wagtailpages.factory import research_hub as research_factory
+from networkapi.wagtailpages.locale_registry import locale_registry
+from networkapi.wagtailpages.pagemodels.research_hub import facets
+from networkapi.wagtailpages.pagemodels.research_hub.detail_page import (
+    ResearchDetailPage,
+)
+from networkapi.wagtailpages.tests.research_hub import base as research_test_base
+
+
+class TestResearchFacetIndex(research_test_base.ResearchHubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.profile = profiles_factory.ProfileFactory()
+        self.topic = research_factory.ResearchTopicFactory()
+        self.page_1 = research_factory.ResearchDetailPageFactory(
+            parent=self.library_page,
+            original_publication_date=datetime.date(2020, 1, 1),
+            research_authors__author_profile=self.profile,
+            related_topics__research_topic=self.topic,
+        )
+        self.page_2 = research_factory.ResearchDetailPageFactory(
+            parent=self.library_page,
+            original_publication_date=datetime.date(2021, 1, 1),
+            research_authors__author_profile=self.profile,
+        )
+        self.page_3 = research_factory.ResearchDetailPageFactory(
+            parent=self.library_page,
+            original_publication_date=datetime.date(2021, 6, 1),
+        )
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def get_option(self, options, value):
+        return next(option for option in options if option["value"] == value)
+
+    def test_build_index(self):
+        # Every process keeps the locales in memory.
+        locale_registry.get_default()
+
+        with self.assertNumQueries(7):
+            # The options and pages of every facet, and the live pages.
+            index = facets.build_research_facet_index(self.default_locale)
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.filter({"author": [], "topic": [], "region": []}), None)
+        self.assertEqual(index.filter({"author": [self.profile.id]}), {self.page_1.id, self.page_2.id})
+        self.assertEqual(index.filter({"author": [self.profile.id], "topic": [self.topic.id]}), {self.page_1.id})
+        self.assertEqual(index.filter({"author": [self.profile.id]}, year=2021), {self.page_2.id})
+        # Unknown options are ignored.
+        self.assertEqual(index.filter({"topic": [0]}), None)
+
+    def test_option_counts(self):
+        index = facets.build_research_facet_index(self.default_locale)
+
+        author_options = index.get_options("author")
+        self.assertEqual(self.get_option(author_options, self.profile.id)["count"], 2)
+
+        page_ids = index.filter({"topic": [self.topic.id]})
+        author_options = index.get_options("author", page_ids)
+        self.assertEqual(self.get_option(author_options, self.profile.id)["count"], 1)
+
+        year_options = index.get_year_options()
+        self.assertEqual([option["value"] for option in year_options], ["", 2021, 2020])
+        self.assertEqual([option["count"] for option in year_options], [3, 2, 1])
+
+    def test_index_is_cached(self):
+        facets.get_research_facet_index(self.default_locale)
+
+        with self.assertNumQueries(0):
+            facets.get_research_facet_index(self.default_locale)
+
+    def test_unpublishing_updates_index(self):
+        facets.get_research_facet_index(self.default_locale)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ResearchDetailPage.objects.get(pk=self.page_2.pk).unpublish()
+
+        with self.assertNumQueries(0):
+            index = facets.get_research_facet_index(self.default_locale)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.filter({"author": [self.profile.id]}), {self.page_1.id})
+
+    def test_adding_a_relation_updates_index(self):
+        facets.get_research_facet_index(self.default_locale)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            research_factory.ResearchDetailPageResearchTopicRelationFactory(
+                research_detail_page=self.page_3,
+                research_topic=self.topic,
+            )
+
+        index = facets.get_research_facet_index(self.default_locale)
+        self.assertEqual(index.filter({"topic": [self.topic.id]}), {self.page_1.id, self.page_3.id})
+
+    def test_index_is_updated_after_commit(self):
+        facets.get_research_facet_index(self.default_locale)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            ResearchDetailPage.objects.get(pk=self.page_2.pk).unpublish()
+            self.assertEqual(len(facets.get_research_facet_index(self.default_locale)), 3)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(facets.get_research_facet_index(self.default_locale)), 2)
+
+    def test_concurrent_updates_rebuild_index(self):
+        index = facets.get_research_facet_index(self.default_locale)
+        cache.add(facets.RESEARCH_FACET_INDEX_LOCK_KEY, True)
+
+        facets.update_research_facet_index({self.page_2.pk})
+
+        with self.assertNumQueries(7):
+            self.assertEqual(len(facets.get_research_facet_index(self.default_locale)), len(index))
+
+    def test_library_page_options_have_counts(self):
+        response = self.client.get(self.library_page.url, data={"author": self.profile.id})
+
+        self.assertEqual(response.context["research_detail_pages_count"], 2)
+        topic_option = self.get_option(response.context["topic_options"], self.topic.id)
+        self.assertEqual(topic_option["count"], 1)
+        year_options = response.context["year_options"]
+        self.assertEqual([option["count"] for option in year_options], [2, 1, 1])
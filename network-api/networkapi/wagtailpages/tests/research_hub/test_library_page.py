@@ -1,11 +1,13 @@
 import datetime
 import os
+from unittest import mock
 
 from django.core import management
 from django.utils import timezone, translation
 
 from networkapi.wagtailpages.factory import profiles as profiles_factory
 from networkapi.wagtailpages.factory import research_hub as research_factory
+from networkapi.wagtailpages.pagemodels.research_hub import facets
 from networkapi.wagtailpages.tests.research_hub import base as research_test_base
 from networkapi.wagtailpages.tests.research_hub import utils as research_test_utils
 
@@ -30,6 +32,15 @@ class TestResearchLibraryPage(research_test_base.ResearchHubTestCase):
         self.assertIn(detail_page_1, research_detail_pages)
         self.assertIn(detail_page_2, research_detail_pages)
 
+    def test_empty_facet_index_is_loaded_once(self):
+        with mock.patch.object(
+            facets, "get_research_facet_index", wraps=facets.get_research_facet_index
+        ) as get_research_facet_index:
+            response = self.client.get(self.library_page.url)
+
+        self.assertEqual(len(response.context["research_detail_pages"]), 0)
+        get_research_facet_index.assert_called_once()
+
     def test_detail_pages_in_context_with_translation_aliases(self):
         detail_page_1 = research_factory.ResearchDetailPageFactory(
             parent=self.library_page,
@@ -67,6 +78,7 @@ class TestResearchLibraryPage(research_test_base.ResearchHubTestCase):
             overview="",
             collaborators="",
         )
+        self.update_index()
 
         response = self.client.get(self.library_page.url, data={"search": "Apple"})
 
@@ -90,6 +102,7 @@ class TestResearchLibraryPage(research_test_base.ResearchHubTestCase):
             overview="",
             collaborators="",
         )
+        self.update_index()
 
         response = self.client.get(self.library_page.url, data={"search": "Apple"})
 
@@ -113,6 +126,7 @@ class TestResearchLibraryPage(research_test_base.ResearchHubTestCase):
             overview="Banana",
             collaborators="",
         )
+        self.update_index()
 
         response = self.client.get(self.library_page.url, data={"search": "Apple"})
 
@@ -136,6 +150,7 @@ class TestResearchLibraryPage(research_test_base.ResearchHubTestCase):
             overview="",
             collaborators="Banana",
         )
+        self.update_index()
 
         response = self.client.get(self.library_page.url, data={"search": "Apple"})
 
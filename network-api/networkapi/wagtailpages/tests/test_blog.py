@@ -3,10 +3,13 @@ import os
 from http import HTTPStatus
 
 from django import http, test
-from django.core import management
+from django.core import exceptions, management
+from django.core.cache import cache
 from taggit import models as tag_models
 from wagtail.core import rich_text
+from wagtail.search.backends import get_search_backend
 
+from networkapi.utility.search import SearchResultsPaginator
 from networkapi.wagtailpages.factory import blog as blog_factories
 from networkapi.wagtailpages.factory import profiles as profile_factories
 from networkapi.wagtailpages.pagemodels.blog import blog as blog_models
@@ -245,6 +248,48 @@ class TestBlogIndexTopic(BlogIndexTestCase):
         self.assertNotIn(other_blog_page, response.context["entries"])
 
 
+@test.override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestBlogIndexTopicCache(test_base.WagtailpagesTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.blog_index = blog_factories.BlogIndexPageFactory(parent=self.homepage)
+        self.topic = blog_factories.BlogPageTopicFactory(name="Test topic")
+        self.topic_blog_page = blog_factories.BlogPageFactory(parent=self.blog_index, topics=[self.topic])
+
+    def get_topic_route(self, topic):
+        return self.blog_index.get_url() + self.blog_index.reverse_subpage("entries_by_topic", kwargs={"topic": topic})
+
+    def test_topics_are_cached(self):
+        self.blog_index.get_topic_object_for_slug("test-topic")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.blog_index.get_topic_object_for_slug("test-topic"), self.topic)
+            self.assertIsNone(self.blog_index.get_topic_object_for_slug("other-topic"))
+
+    def test_renamed_topic(self):
+        self.blog_index.get_topic_object_for_slug("test-topic")
+
+        self.topic.name = "Renamed topic"
+        self.topic.save()
+
+        self.assertIsNone(self.blog_index.get_topic_object_for_slug("test-topic"))
+        self.assertEqual(self.blog_index.get_topic_object_for_slug("renamed-topic"), self.topic)
+
+    def test_topic_entries_are_cached(self):
+        url = self.get_topic_route("test-topic")
+        self.client.get(url)
+
+        other_blog_page = blog_factories.BlogPageFactory(parent=self.blog_index, topics=[self.topic])
+        response = self.client.get(url)
+        self.assertEqual(list(response.context["entries"]), [self.topic_blog_page])
+
+        self.blog_index.clear_index_page_cache(self.default_locale)
+        response = self.client.get(url)
+        self.assertCountEqual(list(response.context["entries"]), [self.topic_blog_page, other_blog_page])
+
+
 class TestBlogIndexSearch(BlogIndexTestCase):
     @classmethod
     def setUpTestData(cls):
@@ -271,6 +316,8 @@ class TestBlogIndexSearch(BlogIndexTestCase):
             parent=self.blog_index,
             title=self.search_term,
         )
+        self.update_index()
+
         url = self.blog_index.get_url() + self.blog_index.reverse_subpage("search") + f"?q={ self.search_term }"
 
         response = self.client.get(path=url)
@@ -369,6 +416,7 @@ class TestBlogIndexSearch(BlogIndexTestCase):
     def test_get_search_entries_title_match(self):
         match_post = blog_factories.BlogPageFactory(parent=self.blog_index, title=self.search_term)
         other_post = blog_factories.BlogPageFactory(parent=self.blog_index)
+        self.update_index()
 
         results = self.blog_index.get_search_entries(query=self.search_term)
 
@@ -382,6 +430,7 @@ class TestBlogIndexSearch(BlogIndexTestCase):
         match_post.save()
         self.assertIn(topic, match_post.topics.all())
         other_post = blog_factories.BlogPageFactory(parent=self.blog_index)
+        self.update_index()
 
         results = self.blog_index.get_search_entries(query=self.search_term)
 
@@ -408,6 +457,7 @@ class TestBlogIndexSearch(BlogIndexTestCase):
         match_post.save()
         self.assertIn(tag, match_post.tags.all())
         other_post = blog_factories.BlogPageFactory(parent=self.blog_index)
+        self.update_index()
 
         results = self.blog_index.get_search_entries(query=self.search_term)
 
@@ -420,6 +470,7 @@ class TestBlogIndexSearch(BlogIndexTestCase):
             search_description=f"Something including the {self.search_term}",
         )
         other_post = blog_factories.BlogPageFactory(parent=self.blog_index)
+        self.update_index()
 
         results = self.blog_index.get_search_entries(query=self.search_term)
 
@@ -438,6 +489,7 @@ class TestBlogIndexSearch(BlogIndexTestCase):
         )
         match_post.save()
         other_post = blog_factories.BlogPageFactory(parent=self.blog_index)
+        self.update_index()
 
         results = self.blog_index.get_search_entries(query=self.search_term)
 
@@ -559,6 +611,35 @@ class TestBlogIndexSearch(BlogIndexTestCase):
         self.assertEqual(description_post, results[1])
         self.assertEqual(body_post, results[2])
 
+    def test_get_search_entries_prefix(self):
+        """The last term of a query also matches words it is the start of."""
+        post = blog_factories.BlogPageFactory(parent=self.blog_index, title=self.search_term)
+        self.update_index()
+
+        results = self.blog_index.get_search_entries(query=self.search_term[:-3])
+
+        self.assertEqual(list(results), [post])
+
+    def test_search_entries_are_counted_while_fetching_the_page(self):
+        for i in range(3):
+            blog_factories.BlogPageFactory(parent=self.blog_index, title=f"{self.search_term} {i}")
+        self.update_index()
+        entries = self.blog_index.get_search_entries(query=self.search_term)
+
+        # One query for the page and its count, and one for the specific blog pages.
+        with self.assertNumQueries(2):
+            entries_page = SearchResultsPaginator(object_list=entries, per_page=2).page(1)
+            self.assertEqual(entries_page.paginator.count, 3)
+            self.assertTrue(entries_page.has_next())
+        self.assertEqual(len(entries_page), 2)
+
+    def test_search_configs_by_language(self):
+        backend = get_search_backend()
+
+        self.assertEqual(backend.get_config_for_language("pt-br"), "portuguese")
+        self.assertEqual(backend.get_config_for_language("de"), "german")
+        self.assertEqual(backend.get_config_for_language("fy-NL"), "simple")
+
     def test_search_entries_route_without_page_parameter(self):
         url = self.blog_index.get_url() + self.blog_index.reverse_subpage("search_entries")
 
@@ -684,6 +765,8 @@ class TestBlogIndexSearch(BlogIndexTestCase):
         first_page_of_matches = match_blog_pages[0 : self.page_size]
         second_page_of_matches = match_blog_pages[self.page_size :]
         nonmatch_blog_pages = self.fill_index_pages_with_blog_pages(2, base_title="Othertitle")
+        self.update_index()
+
         url = (
             self.blog_index.get_url()
             + self.blog_index.reverse_subpage("search_entries")
@@ -712,6 +795,8 @@ class TestBlogIndexSearch(BlogIndexTestCase):
         first_page_of_matches = match_blog_pages[0 : self.page_size]
         second_page_of_matches = match_blog_pages[self.page_size :]
         nonmatch_blog_pages = self.fill_index_pages_with_blog_pages(2, base_title="Othertitle")
+        self.update_index()
+
         url = (
             self.blog_index.get_url()
             + self.blog_index.reverse_subpage("search_entries")
@@ -812,3 +897,55 @@ class TestBlogPageTopics(test.TestCase):
         topic_choices_from_method = test_topic.get_topics()
 
         self.assertEqual(list_of_sorted_topics, topic_choices_from_method)
+
+    def test_slug_is_stored(self):
+        topic = blog_factories.BlogPageTopicFactory(name="Privacy & Security")
+
+        self.assertEqual(blog_topic.BlogPageTopic.objects.get(pk=topic.pk).slug, "privacy-security")
+
+    def test_slug_is_kept_until_renamed(self):
+        topic = blog_factories.BlogPageTopicFactory(name="Privacy")
+        # A numbered slug, as topics with clashing names were given when slugs were added.
+        other = blog_factories.BlogPageTopicFactory(name="Privacy!", locale=topic.locale, slug="privacy-2")
+
+        other.intro = "<p>Changed</p>"
+        other.full_clean()
+        other.save()
+        self.assertEqual(blog_topic.BlogPageTopic.objects.get(pk=other.pk).slug, "privacy-2")
+
+        other.name = "Security"
+        other.save()
+        self.assertEqual(blog_topic.BlogPageTopic.objects.get(pk=other.pk).slug, "security")
+
+    def test_slug_gets_a_suffix_when_taken(self):
+        topic = blog_factories.BlogPageTopicFactory(name="Privacy")
+        blog_factories.BlogPageTopicFactory(name="Privacy 2", locale=topic.locale)
+
+        other = blog_topic.BlogPageTopic(name="Privacy!", locale=topic.locale)
+        other.save()
+
+        self.assertEqual(other.slug, "privacy-3")
+
+    def test_names_without_a_slug_get_a_fallback_slug(self):
+        locale = blog_factories.BlogPageTopicFactory(name="Privacy").locale
+        topic = blog_topic.BlogPageTopic(name="Конфиденциальность", locale=locale)
+        topic.full_clean()
+        topic.save()
+        other = blog_topic.BlogPageTopic(name="Безопасность", locale=topic.locale)
+        other.full_clean()
+        other.save()
+
+        self.assertEqual(topic.slug, "topic")
+        self.assertEqual(other.slug, "topic-2")
+        other.save()
+        self.assertEqual(blog_topic.BlogPageTopic.objects.get(pk=other.pk).slug, "topic-2")
+        self.assertEqual(blog_topic.get_blog_topic_for_slug("topic-2", topic.locale_id), other)
+
+        with self.assertRaises(exceptions.ValidationError):
+            blog_topic.BlogPageTopic(name="Безопасность", locale=topic.locale).full_clean()
+
+    def test_slug_is_unique_per_locale(self):
+        topic = blog_factories.BlogPageTopicFactory(name="Test topic")
+
+        with self.assertRaises(exceptions.ValidationError):
+            blog_topic.BlogPageTopic(name="Test Topic!", locale=topic.locale).full_clean()
@@ -0,0 +1,66 @@
+from django import test
+from django.core.cache import cache
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+
+from networkapi.wagtailpages.factory import primary_page as primary_page_factories
+from networkapi.wagtailpages.models import PrimaryPage
+from networkapi.wagtailpages.tests import base as test_base
+
+
+@test.override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestInheritedMetadata(test_base.WagtailpagesTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.image = Image.objects.create(title="Share image", file=get_test_image_file())
+        cls.section = primary_page_factories.PrimaryPageFactory(
+            parent=cls.homepage,
+            search_description="Section description",
+            search_image=cls.image,
+        )
+        cls.subsection = primary_page_factories.PrimaryPageFactory(parent=cls.section, search_description="")
+        cls.page = primary_page_factories.PrimaryPageFactory(parent=cls.subsection, search_description="")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def get_page(self):
+        return PrimaryPage.objects.get(pk=self.page.pk)
+
+    def test_nearest_ancestor_metadata(self):
+        page = self.get_page()
+
+        self.assertEqual(page.get_meta_description(), "Section description")
+        self.assertEqual(page.get_meta_image(), self.image)
+
+    def test_own_metadata(self):
+        page = self.get_page()
+        page.search_description = "Own description"
+
+        self.assertEqual(page.get_meta_description(), "Own description")
+
+    def test_inherited_metadata_is_cached(self):
+        self.get_page().get_meta_description()
+
+        page = self.get_page()
+        with self.assertNumQueries(0):
+            self.assertEqual(page.get_meta_description(), "Section description")
+            self.assertEqual(page.get_meta_image(), self.image)
+
+    def test_publishing_an_ancestor_rebuilds_metadata(self):
+        self.get_page().get_meta_description()
+
+        section = PrimaryPage.objects.get(pk=self.section.pk)
+        section.search_description = "New section description"
+        section.save_revision().publish()
+
+        self.assertEqual(self.get_page().get_meta_description(), "New section description")
+
+    def test_default_description(self):
+        self.assertEqual(self.homepage.get_meta_description(), self.homepage.default_description)
@@ -0,0 +1,133 @@
+import datetime
+
+from django import test
+from django.core import management
+from django.core.cache import cache
+
+from networkapi.wagtailpages.factory import blog as blog_factories
+from networkapi.wagtailpages.pagemodels.blog.blog import BlogPage
+from networkapi.wagtailpages.pagemodels.index import IndexEntries
+from networkapi.wagtailpages.pagemodels.publications.publication import PublicationPage
+from networkapi.wagtailpages.tests import base as test_base
+
+
+@test.override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestIndexEntries(test_base.WagtailpagesTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.blog_index = blog_factories.BlogIndexPageFactory(parent=cls.homepage, page_size=4)
+        tz = datetime.timezone.utc
+        cls.blog_pages = [
+            blog_factories.BlogPageFactory(
+                parent=cls.blog_index,
+                first_published_at=datetime.datetime(2020, 1, 1 + index, tzinfo=tz),
+            )
+            for index in range(6)
+        ]
+        cls.blog_pages.reverse()
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_entries_are_cached_as_ids(self):
+        entries = self.blog_index.get_all_entries(self.default_locale)
+        self.assertEqual(entries.ids, [page.id for page in self.blog_pages])
+
+        with self.assertNumQueries(0):
+            entries = self.blog_index.get_all_entries(self.default_locale)
+            self.assertEqual(len(entries), 6)
+            entries = entries.exclude_ids([self.blog_pages[0].id])
+            self.assertEqual(len(entries), 5)
+
+    def test_slicing_fetches_specific_pages_in_one_query(self):
+        entries = self.blog_index.get_all_entries(self.default_locale)
+
+        with self.assertNumQueries(2):
+            # One query for the base pages, and one for the specific pages.
+            pages = entries[1:3]
+
+        self.assertEqual(pages, self.blog_pages[1:3])
+        self.assertIsInstance(pages[0], BlogPage)
+
+    def test_slicing_skips_unpublished_pages(self):
+        entries = self.blog_index.get_all_entries(self.default_locale)
+        self.blog_pages[1].unpublish()
+
+        self.assertEqual(entries[0:3], [self.blog_pages[0], self.blog_pages[2]])
+
+    def test_filter_ids_keeps_order(self):
+        entries = IndexEntries([(3, 1), (1, 1), (2, 1)])
+
+        self.assertEqual(entries.filter_ids([2, 3]).ids, [3, 2])
+        self.assertEqual(entries.exclude_ids([3]).ids, [1, 2])
+
+    def test_not_type(self):
+        entries = self.blog_index.get_all_entries(self.default_locale)
+
+        self.assertEqual(len(entries.not_type(PublicationPage)), 6)
+        self.assertEqual(len(entries.not_type(BlogPage)), 0)
+
+    def test_entries_route_pagination(self):
+        url = self.blog_index.get_url() + self.blog_index.reverse_subpage("generate_entries_set_html")
+
+        response = self.client.get(url, {"page": 1, "page_size": 4})
+
+        self.assertEqual(response.context["entries"], self.blog_pages[4:6])
+        self.assertFalse(response.json()["has_next"])
+
+
+@test.override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+class TestIndexTagFilter(test_base.WagtailpagesTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.blog_index = blog_factories.BlogIndexPageFactory(parent=cls.homepage, page_size=4)
+        cls.tagged_pages = []
+        for tags in [["Mozilla", "Privacy"], ["Privacy"], ["Policy"], ["Privacy"], ["Policy"], ["Privacy"]]:
+            blog_page = blog_factories.BlogPageFactory(parent=cls.blog_index)
+            blog_page.tags.set(tags)
+            blog_page.save()
+            if "Privacy" in tags:
+                cls.tagged_pages.append(blog_page)
+
+    def get_tag_url(self, *tags):
+        return self.blog_index.get_url() + "tags/" + "/".join(tags) + "/"
+
+    def test_tag_route(self):
+        response = self.client.get(self.get_tag_url("privacy"))
+
+        self.assertEqual(response.context["total_entries"], 4)
+        self.assertEqual(response.context["terms"], ["Privacy"])
+        self.assertCountEqual(response.context["entries"], self.tagged_pages)
+
+    def test_tag_route_matches_any_tag(self):
+        response = self.client.get(self.get_tag_url("policy", "mozilla", "not-a-tag"))
+
+        self.assertEqual(response.context["total_entries"], 3)
+        self.assertEqual(response.context["terms"], ["Policy", "Mozilla"])
+
+    def test_tag_filter_only_fetches_one_page(self):
+        self.blog_index.extract_tag_information("privacy")
+        context = {"request": test.RequestFactory().get("/")}
+        entries = self.blog_index.get_entries(context)
+
+        # One query for the base pages, and one for the specific pages.
+        with self.assertNumQueries(2):
+            self.assertEqual(len(entries[0:2]), 2)
+
+    def test_tag_filter_keeps_earlier_filtering(self):
+        self.blog_index.filtered = {"type": "tags", "terms": ["privacy"]}
+        entries = self.blog_index.get_all_entries(self.default_locale).exclude_ids([self.tagged_pages[0].id])
+
+        entries = self.blog_index.filter_entries_for_tag(entries, {})
+
+        self.assertCountEqual(entries.ids, [page.id for page in self.tagged_pages[1:]])
+
+    def test_benchmark_command(self):
+        management.call_command("benchmark_index_tag_filter", posts=3)
@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from wagtail.core.models import Locale
+
+from networkapi.wagtailpages.locale_registry import locale_registry
+from networkapi.wagtailpages.tests import base as test_base
+from networkapi.wagtailpages.tests.buyersguide.base import BuyersGuideTestCase
+from networkapi.wagtailpages.utils import get_default_locale, get_locale_from_request
+
+
+def count_locale_queries(queries):
+    return len([query for query in queries if 'FROM "wagtailcore_locale"' in query["sql"]])
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestLocaleRegistry(test_base.WagtailpagesTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_locales_are_kept_in_memory(self):
+        self.assertEqual(locale_registry.get("fr"), self.fr_locale)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_default_locale(), (self.default_locale, self.default_locale.id))
+            self.assertEqual(locale_registry.get("fr"), self.fr_locale)
+
+    def test_unknown_language_falls_back_to_default(self):
+        self.assertEqual(locale_registry.get("xx"), self.default_locale)
+
+    def test_new_locales_are_picked_up(self):
+        locale_registry.get("fr")
+
+        german = Locale.objects.create(language_code="de")
+
+        self.assertEqual(locale_registry.get("de"), german)
+
+    def test_locale_is_remembered_per_request(self):
+        request = RequestFactory().get("/fr/")
+        self.assertEqual(get_locale_from_request(request), self.fr_locale)
+        cache.clear()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_locale_from_request(request), self.fr_locale)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+@override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage")
+class TestBuyersGuideLocaleQueries(BuyersGuideTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def serve_page(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.bg.url)
+        self.assertEqual(response.status_code, 200)
+        return queries
+
+    def test_serve_page_with_locale_registry(self):
+        self.serve_page()
+
+        # Serve with cold product caches, but with the locale registry loaded.
+        cache.clear()
+        locale_registry.get_default()
+        queries = self.serve_page()
+
+        # Without a shared version, the registry reloads on every lookup,
+        # which is what looking up every locale separately costs.
+        cache.clear()
+        with mock.patch.object(locale_registry, "get_version", return_value=None):
+            uncached_queries = self.serve_page()
+
+        self.assertEqual(len(uncached_queries) - len(queries), 3)
+        # Only Wagtail's own lookups of the active locale, for routing and
+        # localizing page links, are left.
+        self.assertEqual(count_locale_queries(queries), 5)
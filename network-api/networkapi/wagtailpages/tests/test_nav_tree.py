@@ -0,0 +1,122 @@
+from django import test
+from django.core.cache import cache
+from wagtail.core.models import PageViewRestriction
+
+from networkapi.wagtailpages.factory import primary_page as primary_page_factories
+from networkapi.wagtailpages.models import PrimaryPage
+from networkapi.wagtailpages.nav_tree import build_nav_tree, get_nav_tree
+from networkapi.wagtailpages.tests import base as test_base
+from networkapi.wagtailpages.wagtail_hooks import manage_nav_trees
+
+
+@test.override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestNavTree(test_base.WagtailpagesTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        PrimaryPageFactory = primary_page_factories.PrimaryPageFactory
+        cls.root = PrimaryPageFactory(parent=cls.homepage, title="Root")
+        cls.child = PrimaryPageFactory(parent=cls.root, title="Child", header="Child header", show_in_menus=True)
+        cls.grandchild = PrimaryPageFactory(parent=cls.child, title="Grandchild", header="", show_in_menus=True)
+        PrimaryPageFactory(parent=cls.grandchild, title="Too deep", show_in_menus=True)
+        cls.hidden = PrimaryPageFactory(parent=cls.root, title="Not in menu", show_in_menus=False)
+        PrimaryPageFactory(parent=cls.hidden, title="Below hidden", show_in_menus=True)
+        cls.draft = PrimaryPageFactory(parent=cls.root, title="Draft", show_in_menus=True, live=False)
+        cls.private = PrimaryPageFactory(parent=cls.root, title="Private", show_in_menus=True)
+        PageViewRestriction.objects.create(page=cls.private, restriction_type="password", password="secret")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def summarize(self, entries):
+        return [(entry["page"].title, entry["menu_title"], entry["depth"], entry["restriction"]) for entry in entries]
+
+    def test_public_tree(self):
+        with self.assertNumQueries(4):
+            # The restrictions, the subtree, the root's ancestors (as there are
+            # restrictions), and the headers of its primary pages.
+            entries = build_nav_tree(self.root)
+
+        self.assertEqual(
+            self.summarize(entries),
+            [
+                ("Root", "Overview", 0, None),
+                ("Child", "Child header", 1, None),
+                ("Grandchild", "Grandchild", 2, None),
+            ],
+        )
+
+    def test_authenticated_tree(self):
+        entries = build_nav_tree(self.root, authenticated=True)
+
+        self.assertEqual(
+            self.summarize(entries),
+            [
+                ("Root", "Overview", 0, None),
+                ("Child", "Child header", 1, None),
+                ("Grandchild", "Grandchild", 2, None),
+                ("Draft", self.draft.header, 1, None),
+                ("Private", self.private.header, 1, "password"),
+            ],
+        )
+
+    def test_restrictions_are_inherited(self):
+        PageViewRestriction.objects.create(page=self.root, restriction_type="login")
+
+        entries = build_nav_tree(self.root, authenticated=True)
+
+        # The first restriction that applies is used, like `get_view_restrictions().first()`.
+        self.assertEqual([entry["restriction"] for entry in entries], ["login"] * 4 + ["password"])
+
+    def test_tree_is_cached(self):
+        get_nav_tree(self.root)
+
+        with self.assertNumQueries(0):
+            entries = get_nav_tree(self.root)
+        self.assertEqual(len(entries), 3)
+
+        self.assertEqual(len(get_nav_tree(self.root, authenticated=True)), 5)
+
+    def test_publish_invalidates_tree(self):
+        get_nav_tree(self.root)
+        draft = PrimaryPage.objects.get(pk=self.draft.pk)
+        draft.save_revision().publish()
+
+        self.assertEqual(len(get_nav_tree(self.root)), 3)
+
+        manage_nav_trees(None, draft)
+        self.assertEqual(len(get_nav_tree(self.root)), 4)
+
+    def test_publish_only_invalidates_affected_trees(self):
+        other_root = primary_page_factories.PrimaryPageFactory(parent=self.homepage, title="Other root")
+        get_nav_tree(self.root)
+        get_nav_tree(self.child)
+        get_nav_tree(other_root)
+
+        manage_nav_trees(None, self.grandchild)
+
+        with self.assertNumQueries(0):
+            get_nav_tree(other_root)
+        with self.assertNumQueries(4):
+            get_nav_tree(self.root)
+        with self.assertNumQueries(4):
+            get_nav_tree(self.child)
+
+    def test_authenticated_tree_is_not_cached(self):
+        get_nav_tree(self.root, authenticated=True)
+        PrimaryPage.objects.filter(pk=self.draft.pk).update(title="Renamed draft")
+
+        entries = get_nav_tree(self.root, authenticated=True)
+
+        self.assertIn("Renamed draft", [entry["page"].title for entry in entries])
+
+    def test_mini_site_sidebar(self):
+        response = self.client.get(self.child.url)
+
+        self.assertContains(response, "Child header")
+        self.assertNotContains(response, "Not in menu")
@@ -0,0 +1,154 @@
+import json
+from unittest import mock
+
+from django import test
+from django.core.cache import cache
+
+from networkapi.wagtailpages.factory import publication as publication_factory
+from networkapi.wagtailpages.models import ArticlePage, PublicationPage
+from networkapi.wagtailpages.tests import base as test_base
+
+
+def create_publication_page(**kwargs):
+    # The factory's default file is only created once, when it is imported.
+    return publication_factory.PublicationPageFactory(publication_file=None, **kwargs)
+
+
+def create_article_page(**kwargs):
+    return publication_factory.ArticlePageFactory(article_file=None, **kwargs)
+
+
+@test.override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestPublicationStructure(test_base.WagtailpagesTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.publication = create_publication_page(parent=self.homepage, title="Publication")
+        self.chapter_1 = create_publication_page(parent=self.publication, title="Chapter 1")
+        self.article_1 = create_article_page(parent=self.chapter_1, title="Article 1")
+        self.article_2 = create_article_page(parent=self.chapter_1, title="Article 2")
+        self.draft_chapter = create_publication_page(parent=self.publication, title="Draft chapter", live=False)
+        self.draft_chapter_article = create_article_page(parent=self.draft_chapter, title="Draft chapter article")
+        self.chapter_3 = create_publication_page(parent=self.publication, title="Chapter 3")
+        self.article_3 = create_article_page(parent=self.chapter_3, title="Article 3")
+        self.draft_article = create_article_page(parent=self.chapter_3, title="Draft article", live=False)
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def get_article(self, page):
+        return ArticlePage.objects.get(pk=page.pk)
+
+    def get_publication(self, page):
+        return PublicationPage.objects.get(pk=page.pk)
+
+    def get_breadcrumb_ids(self, page):
+        return [breadcrumb.pk for breadcrumb in page.breadcrumb_list()]
+
+    def test_article_reading_order(self):
+        self.assertEqual(self.get_article(self.article_1).next_page.pk, self.article_2.pk)
+        self.assertEqual(self.get_article(self.article_2).next_page.pk, self.chapter_3.pk)
+        self.assertEqual(self.get_article(self.article_3).next_page.pk, self.publication.pk)
+
+        self.assertEqual(self.get_article(self.article_1).prev_page.pk, self.chapter_1.pk)
+        self.assertEqual(self.get_article(self.article_2).prev_page.pk, self.article_1.pk)
+        # Articles of a draft chapter go back to the previous live chapter.
+        self.assertEqual(self.get_article(self.draft_chapter_article).prev_page.pk, self.chapter_1.pk)
+        self.assertEqual(self.get_article(self.draft_chapter_article).next_page.pk, self.chapter_3.pk)
+
+    def test_chapter_reading_order(self):
+        self.assertFalse(self.get_publication(self.publication).is_chapter_page)
+        self.assertTrue(self.get_publication(self.chapter_1).is_chapter_page)
+        self.assertTrue(self.get_article(self.article_1).is_publication_article)
+
+        self.assertEqual(self.get_publication(self.chapter_1).next_page.pk, self.chapter_3.pk)
+        self.assertEqual(self.get_publication(self.chapter_1).prev_page.pk, self.publication.pk)
+        self.assertEqual(self.get_publication(self.chapter_3).next_page.pk, self.publication.pk)
+        self.assertEqual(self.get_publication(self.publication).next_page.pk, self.homepage.pk)
+
+    def test_breadcrumbs(self):
+        self.assertEqual(
+            self.get_breadcrumb_ids(self.get_article(self.article_1)), [self.publication.pk, self.chapter_1.pk]
+        )
+        self.assertEqual(self.get_breadcrumb_ids(self.get_article(self.draft_chapter_article)), [self.publication.pk])
+        self.assertEqual(self.get_breadcrumb_ids(self.get_publication(self.chapter_1)), [self.publication.pk])
+
+    def test_article_outside_publication(self):
+        article = ArticlePage.objects.get(pk=create_article_page(parent=self.homepage).pk)
+
+        self.assertFalse(article.is_publication_article)
+        self.assertIsNone(article.next_page)
+        self.assertEqual(article.breadcrumb_list(), [])
+
+    def test_structure_is_cached(self):
+        self.get_article(self.article_1).next_page
+
+        article = self.get_article(self.article_2)
+        chapter = self.get_publication(self.chapter_3)
+        with self.assertNumQueries(0):
+            article.next_page
+            article.prev_page
+            article.breadcrumb_list()
+            chapter.is_chapter_page
+
+    def test_unpublishing_updates_structure(self):
+        self.assertEqual(self.get_article(self.article_2).next_page.pk, self.chapter_3.pk)
+
+        self.get_publication(self.chapter_3).unpublish()
+
+        self.assertEqual(self.get_article(self.article_2).next_page.pk, self.publication.pk)
+
+    def test_table_of_contents(self):
+        response = self.client.get(self.publication.url)
+
+        child_pages = response.context["child_pages"]
+        self.assertEqual([entry["child"] for entry in child_pages], [self.chapter_1, self.chapter_3])
+        self.assertIsInstance(child_pages[0]["child"], PublicationPage)
+        self.assertEqual(child_pages[0]["grandchildren"], [self.article_1, self.article_2])
+        self.assertEqual(child_pages[1]["grandchildren"], [self.article_3])
+        self.assertContains(response, "Article 1")
+        self.assertNotContains(response, "Draft article")
+
+    def test_article_table_of_contents(self):
+        response = self.client.get(self.article_1.url)
+
+        # Articles in a chapter list the chapters of the publication the chapter is in.
+        table_of_contents = response.context["table_of_contents"]
+        self.assertEqual(table_of_contents["publication"].pk, self.publication.pk)
+        entries = table_of_contents["entries"]
+        self.assertEqual([entry["child"] for entry in entries], [self.chapter_1, self.chapter_3])
+        self.assertEqual(entries[0]["grandchildren"], [self.article_1, self.article_2])
+        self.assertContains(response, "Article 3")
+        self.assertNotContains(response, "Draft article")
+
+    def test_article_outside_publication_has_no_table_of_contents(self):
+        article = create_article_page(parent=self.homepage)
+
+        response = self.client.get(article.url)
+
+        self.assertNotIn("table_of_contents", response.context)
+
+
+class TestArticleHeadings(test_base.WagtailpagesTestCase):
+    def setUp(self):
+        super().setUp()
+        body = [
+            {"type": "content", "value": "<h2>First heading</h2><p>Text</p><h3>Subheading</h3>"},
+            {"type": "content", "value": "<p>Text</p><h2>Second <b>heading</b></h2>"},
+        ]
+        self.article = create_article_page(parent=self.homepage, body=json.dumps(body))
+
+    def test_headings_are_derived_on_save(self):
+        article = ArticlePage.objects.get(pk=self.article.pk)
+
+        self.assertEqual(
+            article.get_page_titles,
+            (("first-heading", "First heading"), ("second-heading", "Second heading")),
+        )
+
+    def test_render_does_not_parse_body(self):
+        with mock.patch("networkapi.wagtailpages.utils.BeautifulSoup", side_effect=AssertionError):
+            response = self.client.get(self.article.url)
+
+        self.assertEqual(response.context["get_titles"][0], ("first-heading", "First heading"))
@@ -0,0 +1,209 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse
+
+from django import test
+from django.conf import settings
+from django.core.cache import cache
+from wagtail.core import blocks
+
+from networkapi.wagtailpages.pagemodels.customblocks import (
+    LatestProfileList,
+    ProfileById,
+)
+from networkapi.wagtailpages.pulse import PulseAPIClient, get_pulse_queries
+
+PROFILES = [{"profile_id": profile_id, "name": f"Profile {profile_id}"} for profile_id in (1, 2, 3)]
+
+
+class StubPulseHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(parse.parse_qs(parse.urlparse(self.path).query))
+        time.sleep(server.delay)
+
+        body = json.dumps(server.profiles).encode()
+        self.send_response(server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubPulseServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubPulseHandler)
+        self.requests = []
+        self.profiles = PROFILES
+        self.status = 200
+        self.delay = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@test.override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestPulseAPIClient(test.SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = StubPulseServer()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.server.requests = []
+        self.server.profiles = PROFILES
+        self.server.status = 200
+        self.server.delay = 0
+        settings_override = test.override_settings(
+            FRONTEND={**settings.FRONTEND, "PULSE_API_DOMAIN": self.server.url},
+            PULSE_API_TIMEOUT=0.5,
+            PULSE_API_CACHE_TIMEOUT=60,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = PulseAPIClient()
+        cache.clear()
+
+    def tearDown(self):
+        # Wait for background refreshes, so they do not reach the stub server during other tests.
+        self.client.executor.shutdown(wait=True)
+        cache.clear()
+        super().tearDown()
+
+    def make_stale(self, query_args):
+        cache_key = self.client.get_cache_key(query_args)
+        _, data = cache.get(cache_key)
+        cache.set(cache_key, (0, data))
+
+    def test_profiles_are_cached_by_query_args(self):
+        self.assertEqual(self.client.get_profiles({"format": "json", "ids": "1,2"}), PROFILES)
+        self.assertEqual(self.client.get_profiles({"ids": "1,2", "format": "json"}), PROFILES)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.server.requests[0], {"format": ["json"], "ids": ["1,2"]})
+
+        self.client.get_profiles({"format": "json", "ids": "3"})
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_stale_profiles_are_refreshed_in_the_background(self):
+        query_args = {"format": "json"}
+        self.client.get_profiles(query_args)
+        self.make_stale(query_args)
+        self.server.profiles = PROFILES[:1]
+
+        self.assertEqual(self.client.get_profiles(query_args), PROFILES)
+        self.client.executor.shutdown(wait=True)
+
+        self.assertEqual(self.client.get_profiles(query_args), PROFILES[:1])
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_failed_refresh_keeps_stale_profiles(self):
+        query_args = {"format": "json"}
+        self.client.get_profiles(query_args)
+        self.make_stale(query_args)
+        self.server.status = 500
+
+        self.client.refresh(query_args)
+
+        self.assertEqual(self.client.get_profiles(query_args), PROFILES)
+
+    def test_requests_time_out(self):
+        self.server.delay = 1
+
+        started = time.monotonic()
+        self.assertEqual(self.client.get_profiles({"format": "json"}), [])
+        self.assertLess(time.monotonic() - started, 1)
+
+        # The failure is remembered, so the next render does not wait on the API.
+        started = time.monotonic()
+        self.assertEqual(self.client.get_profiles({"format": "json"}), [])
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_prefetch_fetches_in_parallel(self):
+        self.server.delay = 0.3
+        queries = [{"format": "json", "ids": str(profile_id)} for profile_id in range(4)]
+
+        started = time.monotonic()
+        self.client.prefetch(queries)
+        self.assertLess(time.monotonic() - started, 0.3 * len(queries))
+        self.assertEqual(len(self.server.requests), len(queries))
+
+        for query_args in queries:
+            self.client.get_profiles(query_args)
+        self.assertEqual(len(self.server.requests), len(queries))
+
+    def test_profile_by_id_block(self):
+        block = ProfileById()
+        value = block.to_python({"ids": "3, 1"})
+
+        context = block.get_context(value)
+
+        self.assertEqual([profile["profile_id"] for profile in context["profiles"]], [3, 1])
+
+    def test_latest_profile_list_block(self):
+        block = LatestProfileList()
+        value = block.to_python({"max_number_of_results": 2, "profile_type": "Fellow"})
+
+        context = block.get_context(value)
+
+        self.assertEqual(len(context["profiles"]), 3)
+        self.assertFalse(context["profiles"][0]["user_bio_long"])
+        self.assertEqual(
+            self.server.requests[0],
+            {
+                "limit": ["2"],
+                "profile_type": ["Fellow"],
+                "ordering": ["-id"],
+                "is_active": ["true"],
+                "format": ["json"],
+            },
+        )
+
+
+class TestGetPulseQueries(test.SimpleTestCase):
+    def test_nested_blocks_are_found(self):
+        stream_block = blocks.StreamBlock(
+            [
+                ("profiles", ProfileById()),
+                ("paragraph", blocks.CharBlock()),
+                (
+                    "section",
+                    blocks.StructBlock(
+                        [
+                            ("heading", blocks.CharBlock()),
+                            ("profile_lists", blocks.ListBlock(ProfileById())),
+                        ]
+                    ),
+                ),
+            ]
+        )
+        value = stream_block.to_python(
+            [
+                {"type": "profiles", "value": {"ids": "1"}},
+                {"type": "paragraph", "value": "Text"},
+                {
+                    "type": "section",
+                    "value": {"heading": "Fellows", "profile_lists": [{"ids": "2, 3"}, {"ids": "4"}]},
+                },
+            ]
+        )
+
+        self.assertEqual(
+            [query_args["ids"] for query_args in get_pulse_queries(stream_block, value)],
+            ["1", "2,3", "4"],
+        )
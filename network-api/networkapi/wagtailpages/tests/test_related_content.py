@@ -0,0 +1,114 @@
+import datetime
+
+from django import test
+from django.core import management
+from django.core.cache import cache
+
+from networkapi.wagtailpages.factory import blog as blog_factories
+from networkapi.wagtailpages.pagemodels.blog import blog as blog_models
+from networkapi.wagtailpages.pagemodels.blog.related_content import (
+    RelatedContentIndex,
+    get_related_content_index,
+)
+from networkapi.wagtailpages.tests import base as test_base
+from networkapi.wagtailpages.utils import get_content_related_by_tag
+from networkapi.wagtailpages.wagtail_hooks import manage_related_content_index
+
+
+class TestRelatedContentIndex(test.SimpleTestCase):
+    def test_ranks_on_common_tags_then_recency(self):
+        index = RelatedContentIndex(
+            [
+                (1, "a", 1.0),
+                (1, "b", 1.0),
+                (2, "a", 2.0),
+                (3, "a", 3.0),
+                (3, "b", 3.0),
+                (4, "c", 4.0),
+            ]
+        )
+
+        self.assertEqual(index.get_related_ids(["a", "b"], exclude=[1]), [3, 2])
+        self.assertEqual(index.get_related_ids(["a"], result_count=2), [3, 2])
+        self.assertEqual(index.get_related_ids(["d"]), [])
+        self.assertEqual(index.get_all_related_ids()[4], [])
+        self.assertEqual(index.get_all_related_ids()[1], [3, 2])
+
+
+@test.override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestContentRelatedByTag(test_base.WagtailpagesTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.blog_index = blog_factories.BlogIndexPageFactory(parent=cls.homepage)
+        tz = datetime.timezone.utc
+        cls.posts = {}
+        for day, (title, tags) in enumerate(
+            [
+                ("Privacy", ["privacy"]),
+                ("Policy", ["policy"]),
+                ("Privacy policy", ["privacy", "policy"]),
+                ("Newer privacy", ["privacy"]),
+                ("Unrelated", ["misc"]),
+            ]
+        ):
+            post = blog_factories.BlogPageFactory(
+                parent=cls.blog_index,
+                title=title,
+                last_published_at=datetime.datetime(2020, 1, 1 + day, tzinfo=tz),
+            )
+            post.tags.set(tags)
+            post.related_posts.clear()
+            post.save()
+            cls.posts[title] = post
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_related_by_tag(self):
+        related = get_content_related_by_tag(self.posts["Privacy policy"])
+
+        self.assertEqual(related, [self.posts["Newer privacy"], self.posts["Policy"], self.posts["Privacy"]])
+
+    def test_index_is_cached(self):
+        get_content_related_by_tag(self.posts["Privacy"])
+
+        with self.assertNumQueries(2):
+            # One query for the page's tags, and one for the related posts.
+            related = get_content_related_by_tag(self.posts["Policy"])
+
+        self.assertEqual(related, [self.posts["Privacy policy"]])
+
+    def test_missing_related_posts_skip_existing(self):
+        post = self.posts["Privacy policy"]
+        post.related_posts.add(blog_models.RelatedBlogPosts(page=post, related_post=self.posts["Policy"]))
+
+        self.assertEqual(post.get_missing_related_posts(), [self.posts["Newer privacy"], self.posts["Privacy"]])
+
+    def test_unpublished_posts_are_not_related(self):
+        get_content_related_by_tag(self.posts["Privacy"])
+        self.posts["Newer privacy"].unpublish()
+
+        # The stale index still contains the post, but it is no longer live.
+        self.assertNotIn(self.posts["Newer privacy"], get_content_related_by_tag(self.posts["Privacy"]))
+
+        manage_related_content_index(None, self.posts["Newer privacy"])
+        self.assertEqual(len(get_related_content_index(self.default_locale.id)), 4)
+
+    def test_ensure_related_posts_command(self):
+        management.call_command("ensure_related_posts")
+
+        post = self.posts["Privacy"]
+        post.refresh_from_db()
+        self.assertEqual(
+            [related.related_post for related in post.related_posts.all()],
+            [self.posts["Newer privacy"], self.posts["Privacy policy"]],
+        )
+
+    def test_benchmark_command(self):
+        management.call_command("benchmark_related_content", posts=10, tags=3)
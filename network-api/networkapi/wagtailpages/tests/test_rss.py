@@ -0,0 +1,80 @@
+from django import test
+from django.core.cache import cache
+
+from networkapi.wagtailpages.factory import blog as blog_factories
+from networkapi.wagtailpages.tests import base as test_base
+from networkapi.wagtailpages.wagtail_hooks import manage_index_pages_cache
+
+
+@test.override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestBlogFeeds(test_base.WagtailpagesTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.blog_index = blog_factories.BlogIndexPageFactory(parent=cls.homepage, title="Blog")
+        cls.blog_page = blog_factories.BlogPageFactory(parent=cls.blog_index, search_description="First post")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_rss_feed(self):
+        response = self.client.get("/en/blog/rss/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("application/rss+xml", response["Content-Type"])
+        self.assertContains(response, self.blog_page.title)
+        self.assertContains(response, "First post")
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+    def test_atom_feed(self):
+        response = self.client.get("/en/blog/atom/")
+
+        self.assertIn("application/atom+xml", response["Content-Type"])
+        self.assertContains(response, self.blog_page.title)
+
+    def test_feed_is_cached_per_locale(self):
+        self.synchronize_tree()
+        self.client.get("/en/blog/rss/")
+
+        with self.assertNumQueries(2):
+            # Only the request's savepoint; the locale comes from the locale registry.
+            response = self.client.get("/en/blog/rss/")
+        self.assertContains(response, self.blog_page.title)
+
+        fr_blog_page = self.blog_page.get_translation(self.fr_locale)
+        fr_blog_page.title = "Premier billet"
+        fr_blog_page.save()
+
+        response = self.client.get("/fr/blog/rss/")
+        self.assertContains(response, "Premier billet")
+        self.assertNotContains(response, self.blog_page.title)
+
+    def test_conditional_get(self):
+        response = self.client.get("/en/blog/rss/")
+
+        response = self.client.get("/en/blog/rss/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get("/en/blog/rss/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get("/en/blog/rss/", HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_publish_invalidates_feed(self):
+        self.client.get("/en/blog/rss/")
+        new_page = blog_factories.BlogPageFactory(parent=self.blog_index, title="A brand new post")
+
+        response = self.client.get("/en/blog/rss/")
+        self.assertNotContains(response, new_page.title)
+
+        manage_index_pages_cache(test.RequestFactory().get("/en/"), new_page)
+
+        response = self.client.get("/en/blog/rss/")
+        self.assertContains(response, new_page.title)
@@ -0,0 +1,79 @@
+import datetime
+
+from django.core import management
+from django.utils import timezone
+from wagtail.search.backends import get_search_backend
+
+from networkapi.search_index import (
+    process_index_updates,
+    queue_changes_since,
+    queue_index_update,
+)
+from networkapi.wagtailpages.factory import blog as blog_factories
+from networkapi.wagtailpages.models import BlogPage, SearchIndexUpdate
+from networkapi.wagtailpages.tests import base as test_base
+
+
+class TestSearchIndexUpdates(test_base.WagtailpagesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.blog_index = blog_factories.BlogIndexPageFactory(parent=self.homepage)
+        self.post = blog_factories.BlogPageFactory(parent=self.blog_index, title="Aweirdsearchquery")
+        self.backend = get_search_backend()
+
+    def search(self):
+        return list(self.backend.search("Aweirdsearchquery", BlogPage))
+
+    def get_update(self, page):
+        return SearchIndexUpdate.objects.get(content_type=page.content_type, object_id=str(page.pk))
+
+    def test_saving_queues_the_page(self):
+        self.post.save()
+        self.post.save()
+
+        update = self.get_update(self.post)
+        self.assertIsNone(update.indexed_at)
+        self.assertEqual(self.search(), [])
+
+    def test_queued_pages_are_indexed(self):
+        process_index_updates()
+
+        self.assertEqual(self.search(), [self.post])
+        self.assertIsNotNone(self.get_update(self.post).indexed_at)
+        self.assertEqual(SearchIndexUpdate.objects.filter(indexed_at__isnull=True).count(), 0)
+
+    def test_deleted_pages_are_removed(self):
+        process_index_updates()
+        self.post.delete()
+
+        process_index_updates()
+
+        self.assertEqual(self.search(), [])
+        self.assertFalse(SearchIndexUpdate.objects.filter(object_id=str(self.post.pk)).exists())
+
+    def test_pages_changed_while_indexing_stay_queued(self):
+        post = self.post
+
+        class SavingBackend:
+            def add_bulk(self, model, objects):
+                queue_index_update(post)
+
+        process_index_updates(backend=SavingBackend())
+
+        self.assertIsNone(self.get_update(post).indexed_at)
+
+    def test_changes_since(self):
+        process_index_updates()
+        SearchIndexUpdate.objects.update(changed_at=timezone.now() - datetime.timedelta(days=2))
+        self.post.save()
+
+        self.assertEqual(queue_changes_since(timezone.now() - datetime.timedelta(days=1)), 1)
+        self.assertEqual(
+            queue_changes_since(timezone.now() - datetime.timedelta(days=3)), SearchIndexUpdate.objects.count()
+        )
+
+    def test_command(self):
+        management.call_command("update_search_index", batch_size=1, since="2000-01-01")
+
+        self.assertEqual(self.search(), [self.post])
+        self.assertEqual(SearchIndexUpdate.objects.filter(indexed_at__isnull=True).count(), 0)
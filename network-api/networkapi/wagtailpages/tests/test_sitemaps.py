@@ -0,0 +1,143 @@
+import datetime
+from unittest import mock
+
+from django.db import transaction
+from wagtail.core.models import Locale
+
+from networkapi.sitemaps import (
+    HOME_SECTION,
+    generate_sitemaps,
+    regenerate_outdated_sitemaps,
+)
+from networkapi.wagtailpages.factory import primary_page as primary_page_factories
+from networkapi.wagtailpages.models import SitemapChunk, SitemapUpdate
+from networkapi.wagtailpages.tests import base as test_base
+
+
+class TestSitemaps(test_base.WagtailpagesTestCase):
+    def setUp(self):
+        super().setUp()
+        PrimaryPageFactory = primary_page_factories.PrimaryPageFactory
+        self.section = PrimaryPageFactory(parent=self.homepage, slug="section")
+        self.pages = [
+            PrimaryPageFactory(
+                parent=self.section,
+                slug=f"page-{index}",
+                last_published_at=datetime.datetime(2022, 1, index + 1, tzinfo=datetime.timezone.utc),
+            )
+            for index in range(3)
+        ]
+        self.other_section = PrimaryPageFactory(parent=self.homepage, slug="other-section")
+        self.draft = PrimaryPageFactory(parent=self.other_section, slug="draft", live=False)
+
+    def get_chunks(self, section):
+        return SitemapChunk.objects.filter(locale=self.default_locale, section=section)
+
+    def test_index_lists_chunks(self):
+        generate_sitemaps()
+
+        response = self.client.get("/sitemap.xml")
+
+        self.assertContains(response, "https://foundation.mozilla.org/en/sitemap-1.xml")
+        self.assertContains(response, "https://foundation.mozilla.org/en/sitemap-section-1.xml")
+        self.assertContains(response, "https://foundation.mozilla.org/en/sitemap-other-section-1.xml")
+
+    def test_chunk_lists_live_pages(self):
+        generate_sitemaps()
+
+        response = self.client.get("/en/sitemap-section-1.xml")
+        self.assertEqual(response["Content-Type"], "application/xml")
+        for page in [self.section, *self.pages]:
+            self.assertContains(response, f"<loc>{page.full_url}</loc>")
+
+        response = self.client.get("/en/sitemap-other-section-1.xml")
+        self.assertNotContains(response, self.draft.full_url)
+
+        response = self.client.get("/en/sitemap-section-2.xml")
+        self.assertEqual(response.status_code, 404)
+
+    def test_sections_are_split_into_chunks(self):
+        with mock.patch("networkapi.sitemaps.SITEMAP_CHUNK_SIZE", 3):
+            generate_sitemaps()
+
+        chunks = self.get_chunks("section")
+        self.assertEqual([chunk.url_count for chunk in chunks], [3, 1])
+        self.assertEqual(chunks[1].lastmod, self.pages[2].last_published_at)
+
+    def test_publishing_regenerates_section(self):
+        generate_sitemaps()
+        section_chunk = self.get_chunks("section").get()
+        other_section_chunk = self.get_chunks("other-section").get()
+
+        self.draft.save_revision().publish()
+        regenerate_outdated_sitemaps()
+
+        self.assertTrue(self.get_chunks("section").filter(pk=section_chunk.pk).exists())
+        self.assertFalse(self.get_chunks("other-section").filter(pk=other_section_chunk.pk).exists())
+        self.assertIn(self.draft.full_url, self.get_chunks("other-section").get().content)
+
+    def test_publishing_only_marks_section(self):
+        generate_sitemaps()
+        other_section_chunk = self.get_chunks("other-section").get()
+
+        self.draft.save_revision().publish()
+
+        self.assertTrue(self.get_chunks("other-section").filter(pk=other_section_chunk.pk).exists())
+        self.assertTrue(SitemapUpdate.objects.filter(path=self.draft.path).exists())
+
+        regenerate_outdated_sitemaps()
+
+        self.assertFalse(SitemapUpdate.objects.exists())
+
+    def test_rolled_back_changes_leave_no_marks(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                self.draft.save_revision().publish()
+                raise ValueError
+
+        self.assertFalse(SitemapUpdate.objects.exists())
+
+    def test_home_section_does_not_collide_with_home_slug(self):
+        primary_page_factories.PrimaryPageFactory(parent=self.homepage, slug="home")
+        generate_sitemaps()
+
+        home_chunk = self.get_chunks(HOME_SECTION).get()
+        self.assertIn(f"<loc>{self.homepage.full_url}</loc>", home_chunk.content)
+        self.assertTrue(self.get_chunks("home").exists())
+
+        response = self.client.get("/en/sitemap-1.xml")
+        self.assertEqual(response.content.decode(), home_chunk.content)
+
+    def test_serving_does_not_generate(self):
+        response = self.client.get("/sitemap.xml")
+
+        self.assertNotContains(response, "sitemap-section-1.xml")
+        self.assertFalse(SitemapChunk.objects.exists())
+
+    def test_sections_are_regenerated_once(self):
+        generate_sitemaps()
+
+        for page in self.pages:
+            page.unpublish()
+        with mock.patch("networkapi.sitemaps.generate_sitemap_section") as generate_sitemap_section:
+            regenerate_outdated_sitemaps()
+
+        generate_sitemap_section.assert_called_once()
+        self.assertEqual(generate_sitemap_section.call_args.args[2], "section")
+
+    def test_top_level_changes_regenerate_the_locale(self):
+        generate_sitemaps()
+
+        for page in [self.section, *self.pages]:
+            page.unpublish()
+        regenerate_outdated_sitemaps()
+
+        self.assertFalse(self.get_chunks("section").exists())
+        self.assertTrue(self.get_chunks("other-section").exists())
+
+    def test_new_locales_are_generated(self):
+        locale = Locale.objects.create(language_code="de")
+        with mock.patch("networkapi.sitemaps.generate_sitemaps") as generate_sitemaps:
+            regenerate_outdated_sitemaps()
+
+        generate_sitemaps.assert_called_once_with([locale])
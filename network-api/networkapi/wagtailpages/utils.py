@@ -1,7 +1,7 @@
+import functools
 import ntpath
 import re
 from io import BytesIO
-from itertools import chain
 from mimetypes import MimeTypes
 from typing import Optional
 
@@ -11,11 +11,10 @@ from django import forms
 from django.apps import apps
 from django.conf import settings
 from django.core.files.images import ImageFile
-from django.db.models import Case, Count, Q, When
+from django.db.models import Case, Q, When
 from django.urls import LocalePrefixPattern, URLResolver
 from django.utils.safestring import mark_safe
 from django.utils.text import slugify
-from django.utils.translation import gettext
 from django.utils.translation.trans_real import (
     check_for_language,
     get_language_from_path,
@@ -25,10 +24,15 @@ from django.utils.translation.trans_real import (
     parse_accept_lang_header,
 )
 from PIL import Image as PILImage
-from sentry_sdk import capture_exception
-from wagtail.core.models import Collection, Locale
+from wagtail.core.models import Collection
 from wagtail.images.models import Image
 
+from networkapi.wagtailpages.locale_registry import locale_registry
+from networkapi.wagtailpages.nav_tree import get_nav_tree
+from networkapi.wagtailpages.pagemodels.blog.related_content import (
+    get_related_content_index,
+)
+
 
 def titlecase(s):
     """
@@ -88,51 +92,12 @@ def get_page_tree_information(page, context):
     return context
 
 
-def get_descendants(node, list, authenticated=False, depth=0, max_depth=2):
-    """
-    helper function to get_menu_pages for performing a depth-first
-    discovery pass of all menu-listable children to some root node.
-    """
-    if depth <= max_depth:
-        title = node.title
-        header = getattr(node.specific, "header", None)
-        if header:
-            title = header
-        menu_title = title if depth > 0 else gettext("Overview")
-        restriction = node.get_view_restrictions().first()
-        try:
-            restriction_type = restriction.restriction_type
-        except AttributeError:
-            restriction_type = None
-
-        list.append(
-            {
-                "page": node,
-                "menu_title": menu_title,
-                "depth": depth,
-                "restriction": restriction_type,
-            }
-        )
-
-        nextset = node.get_children().in_menu()
-
-        # Do not show draft/private pages to users who are
-        # not logged into the CMS itself.
-        if authenticated is False:
-            nextset = nextset.live().public()
-
-        for child in nextset:
-            get_descendants(child, list, authenticated, depth + 1)
-
-
 def get_menu_pages(root, authenticated=False):
     """
     convenience function for getting all (menu listable) child
-    pages for some root node.
+    pages for some root node, from the cached navigation tree.
     """
-    menu_pages = list()
-    get_descendants(root, menu_pages, authenticated)
-    return menu_pages
+    return get_nav_tree(root, authenticated)
 
 
 def get_mini_side_nav_data(context, page, no_minimum_page_count=False):
@@ -153,72 +118,38 @@ def get_mini_side_nav_data(context, page, no_minimum_page_count=False):
     }
 
 
-def get_content_related_by_tag(page, result_count=3):
+def get_content_related_by_tag(page, result_count=3, exclude=()):
     """
     Get all posts that feel related to this page, based
     on its `.tags` content. If it has tags.
-    """
 
+    Posts are ranked on the number of tags they share with this page, with
+    the most recently published posts first for the same number of tags,
+    using the cached tag index for the page's locale. Posts with ids in
+    `exclude` are skipped.
+    """
     if hasattr(page.specific, "tags") is False:
         return list()
 
-    page_models_with_tags = (
-        apps.get_model("wagtailpages", "BlogPage"),
-        #
-        # Uncomment the following class(es) to add them to the
-        # set of classes to use for tag matching:
-        #
-        # apps.get_model('wagtailpages', 'BanneredCampaignPage'),
-        # apps.get_model('wagtailpages', 'CampaignPage'),
-        # apps.get_model('wagtailpages', 'OpportunityPage'),
-    )
-
-    results = False
-    own_tags = page.tags.all()
-    own_locale = page.locale
-
-    for page_type in page_models_with_tags:
-        # Get all pages that share tags with this page
-        related_pages = page_type.objects.filter(tags__in=own_tags).live()
-
-        # Filter related pages to be of same locale as reference page
-        if own_locale:
-            related_pages = related_pages.filter(locale=own_locale)
-
-        # Exlude "this page" from the result set for the page's own page type
-        # so that we don't end up with "this page is most similar to itself".
-        if page.__class__ is page_type:
-            related_pages = related_pages.exclude(pk=page.pk)
-
-        # Annotate the results by adding a column that, effectively, records
-        # a `countDistinct(result_table.tag)` for each related post.
-        annotated = related_pages.annotate(num_common_tags=Count("pk"))
+    # Only blog posts are matched against; the index would need to include
+    # other page types to add them to the set of classes to use for tag matching.
+    BlogPage = apps.get_model("wagtailpages", "BlogPage")
 
-        if results is False:
-            results = annotated
-        else:
-            results = chain(results, annotated)
-
-    # Finally, we sort on those tag count values, with publication
-    # date as secondary sorting, so that "the same number of matching
-    # tags" is further sorted such that the most recent post shows
-    # up first (note that this is done on the database side, not in python).
-
-    # FIXME: temporary try/except to figure out a bug in production:
-    # See https://github.com/mozilla/foundation.mozilla.org/issues/4046
+    # Read the tag ids off the tagged items, rather than loading every tag.
+    tag_ids = [item.tag_id for item in page.specific.tags.get_tagged_item_manager().all()]
+    if not tag_ids:
+        return list()
 
-    result_list = list(results)
+    # Exlude "this page" from the result set so that we don't
+    # end up with "this page is most similar to itself".
+    exclude = [page.pk, *exclude]
 
-    try:
-        result_list = sorted(
-            result_list,
-            key=lambda p: (p.num_common_tags, p.last_published_at),
-            reverse=True,
-        )
-    except TypeError as err:
-        capture_exception(err)
+    index = get_related_content_index(page.locale_id)
+    related_ids = index.get_related_ids(tag_ids, result_count, exclude=exclude)
 
-    return result_list[:result_count]
+    # The index may be slightly out of date, so only return posts that are still live.
+    related_pages = BlogPage.objects.live().in_bulk(related_ids)
+    return [related_pages[pk] for pk in related_ids if pk in related_pages]
 
 
 def insert_panels_after(panels, after_label, additional_panels):
@@ -270,12 +201,19 @@ def language_code_to_iso_3166(language):
 
 
 def get_locale_from_request(request, check_path=True):
-    language_code = get_language_from_request(request, check_path)
+    """
+    Get the Locale for the request's language, falling back to the default
+    locale. The result is remembered on the request, as it is often needed
+    several times while serving a single request.
+    """
+    attribute = "_locale_from_path" if check_path else "_locale"
+    locale = getattr(request, attribute, None)
 
-    try:
-        return Locale.objects.get(language_code=language_code)
-    except Locale.DoesNotExist:
-        return Locale.objects.get(language_code=settings.LANGUAGE_CODE)
+    if locale is None:
+        locale = locale_registry.get(get_language_from_request(request, check_path))
+        setattr(request, attribute, locale)
+
+    return locale
 
 
 def get_language_from_request(request, check_path=True):
@@ -333,8 +271,8 @@ def localize_queryset(queryset):
     `translation_key`.
 
     """
-    default_locale = Locale.get_default()
-    active_locale = Locale.get_active()
+    default_locale = locale_registry.get_default()
+    active_locale = locale_registry.get_active()
 
     queryset = queryset.filter(Q(locale=default_locale) | Q(locale=active_locale))
     queryset = queryset.annotate(
@@ -385,6 +323,26 @@ def get_plaintext_titles(request, stream_data, stream_block_name):
     return tuple(data.items())
 
 
+def get_first_paragraph_text(html):
+    """
+    Return the plain text of the first paragraph in an HTML string,
+    or an empty string if it has no paragraphs.
+    """
+    first_paragraph = BeautifulSoup(html, "html.parser").find("p")
+    return first_paragraph.text if first_paragraph else ""
+
+
+@functools.lru_cache(maxsize=1024)
+def is_rich_text(text):
+    """
+    Return whether a string contains any HTML tags.
+
+    This is memoized, as it is used for strings that are rendered
+    over and over again, such as the descriptions of cards.
+    """
+    return len(BeautifulSoup(text, "html.parser").find_all(True)) > 0
+
+
 def create_wagtail_image(img_src: str, image_name: str = None, collection_name: str = None) -> Optional[Image]:
     """
     Create a Wagtail Image from a given source. It takes an optional file name
@@ -456,7 +414,7 @@ def get_default_locale():
     We defer this logic to a function so that we can call it on demand without
     running into "the db is not ready for queries yet" problems.
     """
-    DEFAULT_LOCALE = Locale.objects.get(language_code=settings.LANGUAGE_CODE)
+    DEFAULT_LOCALE = locale_registry.get_default()
     DEFAULT_LOCALE_ID = DEFAULT_LOCALE.id
     return (
         DEFAULT_LOCALE,
@@ -2,12 +2,11 @@
 #   See https://docs.wagtail.io/en/v2.7/advanced_topics/customisation/extending_draftail.html
 #   And https://medium.com/@timlwhite/custom-in-line-styles-with-draftail-939201c2bbda
 
-from django.core.cache import cache
-
 # The real code runs "instance.sync_trees()" here, but we want this to do nothing instead,
 # so that locale creation creates the locale entry but does not try to sync 1300+ pages as
 # part of the same web request.
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.templatetags.static import static
 from django.urls import reverse
 from django.utils.html import escape
@@ -17,20 +16,84 @@ from wagtail.admin.rich_text.converters.html_to_contentstate import (
 )
 from wagtail.admin.rich_text.editors.draftail import features as draftail_features
 from wagtail.core import hooks
+from wagtail.core.models import Locale, PageViewRestriction
 from wagtail.core.rich_text import LinkHandler
+from wagtail.core.signals import page_published, page_unpublished, post_page_move
 from wagtail.core.utils import find_available_slug
+from wagtail.search import signal_handlers as search_signal_handlers
+from wagtail.search.index import get_indexed_models
 from wagtail_localize.models import (
     LocaleSynchronization,
     sync_trees_on_locale_sync_save,
 )
 
+from networkapi.search_index import queue_index_update
+from networkapi.sitemaps import mark_sitemap_outdated
+from networkapi.wagtailpages.locale_registry import invalidate_locale_registry
+from networkapi.wagtailpages.nav_tree import invalidate_nav_trees
+from networkapi.wagtailpages.pagemodels.blog.blog import BlogPage
+from networkapi.wagtailpages.pagemodels.blog.blog_topic import (
+    BlogPageTopic,
+    invalidate_blog_topics,
+)
+from networkapi.wagtailpages.pagemodels.blog.related_content import (
+    invalidate_related_content_index,
+)
+from networkapi.wagtailpages.pagemodels.buyersguide.category_index import (
+    invalidate_category_index,
+)
 from networkapi.wagtailpages.pagemodels.buyersguide.homepage import BuyersGuidePage
-from networkapi.wagtailpages.pagemodels.buyersguide.products import ProductPage
+from networkapi.wagtailpages.pagemodels.buyersguide.product_cache import (
+    invalidate_product_cache,
+)
+from networkapi.wagtailpages.pagemodels.buyersguide.product_slugs import (
+    invalidate_product_slugs,
+)
+from networkapi.wagtailpages.pagemodels.buyersguide.products import (
+    BuyersGuideProductCategory,
+    ProductPage,
+)
+from networkapi.wagtailpages.pagemodels.mixin.foundation_metadata import (
+    invalidate_inherited_metadata,
+)
+from networkapi.wagtailpages.pagemodels.profiles import Profile
+from networkapi.wagtailpages.pagemodels.publications.article import ArticlePage
+from networkapi.wagtailpages.pagemodels.publications.publication import PublicationPage
+from networkapi.wagtailpages.pagemodels.publications.structure import (
+    invalidate_publication_structure,
+)
+from networkapi.wagtailpages.pagemodels.research_hub import (
+    relations as research_relations,
+)
+from networkapi.wagtailpages.pagemodels.research_hub.detail_page import (
+    ResearchDetailPage,
+)
+from networkapi.wagtailpages.pagemodels.research_hub.facets import (
+    invalidate_research_facet_index,
+    mark_research_facets_changed,
+)
+from networkapi.wagtailpages.pagemodels.research_hub.taxonomies import (
+    ResearchRegion,
+    ResearchTopic,
+)
+from networkapi.wagtailpages.rss import invalidate_feed_cache
 from networkapi.wagtailpages.utils import get_locale_from_request
 
 post_save.disconnect(sync_trees_on_locale_sync_save, sender=LocaleSynchronization)
 
 
+def manage_locale_registry(sender, **kwargs):
+    """
+    Every process keeps all locales in memory, and reloads them
+    when a locale is added, changed or removed.
+    """
+    invalidate_locale_registry()
+
+
+post_save.connect(manage_locale_registry, sender=Locale)
+post_delete.connect(manage_locale_registry, sender=Locale)
+
+
 # Extended rich text features for our site
 @hooks.register("register_rich_text_features")
 def register_large_feature(features):
@@ -116,10 +179,41 @@ def before_delete_page(request, page):
 @hooks.register("after_unpublish_page")
 def manage_pni_cache(request, page):
     if isinstance(page, ProductPage) or isinstance(page, BuyersGuidePage):
-        # Clear all of our Django-based cache.
-        # This is easier than looping through every Category x Language Code available
-        # To specifically clear PNI-based cache.
-        cache.clear()
+        # Only invalidate the product listings of the affected language codes,
+        # rather than clearing the entire cache.
+        invalidate_product_cache(page)
+
+    if isinstance(page, ProductPage):
+        # The category index includes the number of live products per category.
+        invalidate_category_index()
+
+
+def manage_pni_category_index(sender, **kwargs):
+    # Categories are snippets, which are also saved directly when synchronizing
+    # translations, so this listens to model signals rather than admin hooks.
+    invalidate_category_index()
+
+
+post_save.connect(manage_pni_category_index, sender=BuyersGuideProductCategory)
+post_delete.connect(manage_pni_category_index, sender=BuyersGuideProductCategory)
+
+
+def manage_product_slugs(sender, **kwargs):
+    # The CSRF middleware keeps the slugs of all product pages in memory.
+    invalidate_product_slugs()
+
+
+post_save.connect(manage_product_slugs, sender=ProductPage)
+post_delete.connect(manage_product_slugs, sender=ProductPage)
+
+
+def manage_blog_topics(sender, **kwargs):
+    # Blog topic routes are resolved from the cached topics of each locale.
+    invalidate_blog_topics()
+
+
+post_save.connect(manage_blog_topics, sender=BlogPageTopic)
+post_delete.connect(manage_blog_topics, sender=BlogPageTopic)
 
 
 @hooks.register("after_publish_page")
@@ -152,6 +246,158 @@ def manage_index_pages_cache(request, page):
 
     if hasattr(parent, "clear_index_page_cache"):
         parent.clear_index_page_cache(locale)
+        # The blog feeds are rendered from the blog index entries.
+        invalidate_feed_cache()
+
+
+@hooks.register("after_delete_page")
+@hooks.register("after_publish_page")
+@hooks.register("after_unpublish_page")
+def manage_related_content_index(request, page):
+    """
+    Blog posts are related to each other through the tags of all live
+    blog posts in their locale, which change with every (un)publication.
+    """
+    if issubclass(page.specific_class, BlogPage):
+        invalidate_related_content_index(page.locale_id)
+
+
+@hooks.register("after_delete_page")
+@hooks.register("after_publish_page")
+@hooks.register("after_unpublish_page")
+def manage_nav_trees(request, page):
+    """
+    Mini-site and primary page menus are cached as navigation trees, which
+    change when a page in them changes visibility. Publishing a page also
+    updates its aliases, which are in the trees of other locales.
+    """
+    invalidate_nav_trees(page, *page.aliases.only("path"))
+
+
+@hooks.register("after_move_page")
+def manage_moved_nav_trees(request, page):
+    # The trees the page was in are not known any more.
+    invalidate_nav_trees()
+
+
+def manage_nav_tree_restrictions(sender, **kwargs):
+    # Restrictions apply to all descendants, and to trees rooted below them.
+    invalidate_nav_trees()
+
+
+post_save.connect(manage_nav_tree_restrictions, sender=PageViewRestriction)
+post_delete.connect(manage_nav_tree_restrictions, sender=PageViewRestriction)
+
+
+def manage_inherited_metadata(sender, instance, **kwargs):
+    """
+    Pages inherit their search description and share image from their
+    ancestors, so only publishing a page with children can change them.
+    """
+    if not instance.is_leaf():
+        invalidate_inherited_metadata()
+
+
+def manage_moved_inherited_metadata(sender, instance, **kwargs):
+    invalidate_inherited_metadata()
+
+
+page_published.connect(manage_inherited_metadata)
+post_page_move.connect(manage_moved_inherited_metadata)
+
+
+def manage_sitemap_section(sender, instance, **kwargs):
+    """
+    Publishing or unpublishing a page only changes the sitemap of its section.
+    """
+    mark_sitemap_outdated(instance.locale, instance)
+
+
+@hooks.register("after_delete_page")
+@hooks.register("after_move_page")
+def manage_sitemaps(request, page):
+    mark_sitemap_outdated(page.locale)
+
+
+def manage_sitemap_categories(sender, **kwargs):
+    # The Buyer's Guide lists its categories in its sitemap section.
+    for buyersguide_page in BuyersGuidePage.objects.select_related("locale"):
+        mark_sitemap_outdated(buyersguide_page.locale, buyersguide_page)
+
+
+def manage_locale_sitemap(sender, instance, created, **kwargs):
+    if created:
+        mark_sitemap_outdated(instance)
+
+
+page_published.connect(manage_sitemap_section)
+page_unpublished.connect(manage_sitemap_section)
+post_save.connect(manage_sitemap_categories, sender=BuyersGuideProductCategory)
+post_delete.connect(manage_sitemap_categories, sender=BuyersGuideProductCategory)
+post_save.connect(manage_locale_sitemap, sender=Locale)
+
+
+def manage_publication_structure(sender, **kwargs):
+    """
+    Publications are cached with the titles, order and live state of all their
+    pages, which change whenever one of their pages is saved, including when
+    it is published or unpublished, or deleted. Moving any page can move a
+    whole publication.
+    """
+    invalidate_publication_structure()
+
+
+for publication_model in (PublicationPage, ArticlePage):
+    post_save.connect(manage_publication_structure, sender=publication_model)
+    post_delete.connect(manage_publication_structure, sender=publication_model)
+post_page_move.connect(manage_publication_structure)
+
+
+def manage_research_facet_index(sender, instance, **kwargs):
+    """
+    Pages are updated in the research library's facet indexes after they are
+    saved (including when they are published or unpublished) or deleted, once
+    per transaction however many of their relations were saved with them.
+    """
+    mark_research_facets_changed(instance.pk)
+
+
+def manage_research_facet_relations(sender, instance, **kwargs):
+    mark_research_facets_changed(instance.research_detail_page_id)
+
+
+def manage_research_facet_options(sender, **kwargs):
+    transaction.on_commit(invalidate_research_facet_index)
+
+
+post_save.connect(manage_research_facet_index, sender=ResearchDetailPage)
+post_delete.connect(manage_research_facet_index, sender=ResearchDetailPage)
+for relation_model in (
+    research_relations.ResearchAuthorRelation,
+    research_relations.ResearchDetailPageResearchTopicRelation,
+    research_relations.ResearchDetailPageResearchRegionRelation,
+):
+    post_save.connect(manage_research_facet_relations, sender=relation_model)
+    post_delete.connect(manage_research_facet_relations, sender=relation_model)
+for option_model in (Profile, ResearchTopic, ResearchRegion):
+    post_save.connect(manage_research_facet_options, sender=option_model)
+    post_delete.connect(manage_research_facet_options, sender=option_model)
+
+
+def manage_search_index(sender, instance, **kwargs):
+    # Objects are indexed by the update_search_index command, rather than by
+    # Wagtail while saving them, as search AUTO_UPDATE is turned off.
+    queue_index_update(instance)
+
+
+for indexed_model in get_indexed_models():
+    if getattr(indexed_model, "search_auto_update", True):
+        # Wagtail's handlers would still look up every saved object, only
+        # to find that there is no search backend to update.
+        post_save.disconnect(search_signal_handlers.post_save_signal_handler, sender=indexed_model)
+        post_delete.disconnect(search_signal_handlers.post_delete_signal_handler, sender=indexed_model)
+        post_save.connect(manage_search_index, sender=indexed_model)
+        post_delete.connect(manage_search_index, sender=indexed_model)
 
 
 @hooks.register("insert_global_admin_js", order=100)
@@ -8,3 +8,6 @@ python ./manage.py migrate --no-input
 
 # Clear cache for BuyersGuide
 python ./manage.py clear_cache
+
+# Regenerate sitemaps
+python ./manage.py generate_sitemaps